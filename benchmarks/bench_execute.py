@@ -0,0 +1,76 @@
+"""
+Measures end-to-end query throughput through PyCacheDB.execute.
+
+Run from the repository root:
+    python -m benchmarks.bench_execute [operations]
+"""
+import sys
+import time
+
+from pycachedb import PyCacheDB
+
+
+def measure(label: str, operations: int, function) -> None:
+    """Calls function operations times and prints ops/s"""
+    start = time.perf_counter()
+    for _ in range(operations):
+        function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {operations / elapsed:>12,.0f} ops/s")
+
+
+def main() -> None:
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    cached = PyCacheDB()
+    uncached = PyCacheDB(parse_cache_size=0)
+    for db in (cached, uncached):
+        db.execute("SET k 'some value'")
+
+    get = cached.registry.get_command("GET")
+    prepared_get = cached.prepare("GET ?")
+
+    print(f"{operations:,} operations")
+    measure("execute('GET k'), parse cache", operations, lambda: cached.execute("GET k"))
+    measure("execute('GET k'), no parse cache", operations, lambda: uncached.execute("GET k"))
+    measure("prepare('GET ?').run('k')", operations, lambda: prepared_get.run("k"))
+    measure("GetCommand.execute(['k'])", operations, lambda: get.execute(["k"]))
+    measure("db.get('k')", operations, lambda: cached.get("k"))
+
+    # Bulk load of distinct keys, the parse cache cannot help here
+    sets = [f"SET key:{i} value:{i}" for i in range(operations)]
+    gets = [f"GET key:{i}" for i in range(operations)]
+
+    bulk = PyCacheDB()
+    start = time.perf_counter()
+    for query in sets:
+        bulk.execute(query)
+    for query in gets:
+        bulk.execute(query)
+    looped = time.perf_counter() - start
+
+    bulk = PyCacheDB()
+    start = time.perf_counter()
+    bulk.execute_many(sets)
+    bulk.execute_many(gets)
+    pipelined = time.perf_counter() - start
+
+    print(f"  {'bulk SET+GET, execute loop':<34} {2 * operations / looped:>12,.0f} ops/s")
+    print(f"  {'bulk SET+GET, execute_many':<34} {2 * operations / pipelined:>12,.0f} ops/s")
+
+    # Same bulk load through prepared commands, no per-query parsing at all
+    bulk = PyCacheDB()
+    prepared_set = bulk.prepare("SET key:? value:?")
+    prepared_get = bulk.prepare("GET key:?")
+    start = time.perf_counter()
+    for i in range(operations):
+        prepared_set.run(i, i)
+    for i in range(operations):
+        prepared_get.run(i)
+    prepared = time.perf_counter() - start
+
+    print(f"  {'bulk SET+GET, prepared run':<34} {2 * operations / prepared:>12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Measures lexer throughput in tokens per second against naive tokenizers.
+
+Run from the repository root:
+    python -m benchmarks.bench_lexer [iterations]
+"""
+import re
+import shlex
+import sys
+import time
+
+from pycachedb.query.lexer import Lexer
+
+QUERIES = [
+    "GET user:1",
+    "SET session:8f3a2c 'John Doe' EX 3600",
+    "ZADD leaderboard 1500 alice 1320 bob 990 carol",
+    "HSET user:profile name 'John' age 30 city \"New York\"",
+    "ZRANGEBYSCORE events (1700000000 +inf WITHSCORES LIMIT 0 10",
+    "SET quote \"she said \\\"hi\\\"\" NX",
+]
+
+# Regex tokenizer of the kind the lexer replaces, it handles quotes but not escapes
+NAIVE_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|\S+")
+
+
+def measure(label: str, iterations: int, tokenize) -> None:
+    """Tokenizes every query iterations times and prints tokens/s"""
+    tokens = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in QUERIES:
+            tokens += len(tokenize(query))
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {tokens / elapsed:>14,.0f} tokens/s")
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    lexer = Lexer()
+    encoded = {query: memoryview(query.encode("utf-8")) for query in QUERIES}
+
+    print(f"{iterations:,} iterations over {len(QUERIES)} queries")
+    measure("str.split (no quotes)", iterations, str.split)
+    measure("regex findall", iterations, NAIVE_PATTERN.findall)
+    measure("shlex.split", iterations // 10, shlex.split)
+    measure("Lexer.tokenize", iterations, lexer.tokenize)
+    measure("Lexer.tokenize_buffer", iterations, lambda query: lexer.tokenize_buffer(encoded[query]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares the ordered index engines on insert, lookup and range throughput.
+
+Run from the repository root:
+    python -m benchmarks.bench_ordered_index [number_of_keys]
+"""
+import random
+import sys
+import time
+
+from pycachedb.data_structures.binary_tree import BinaryTree
+from pycachedb.data_structures.sorted_list import SortedList
+
+
+def timed(label: str, operations: int, function) -> float:
+    """Runs function once and prints its throughput"""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {operations / elapsed:>14,.0f} ops/s  ({elapsed:.2f}s)")
+    return elapsed
+
+
+def bench(index_class, keys, lookups, ranges) -> None:
+    index = index_class()
+    print(index_class.__name__)
+
+    def insert_all():
+        insert = index.insert
+        for key in keys:
+            insert(key, key)
+
+    def search_all():
+        search = index.search
+        for key in lookups:
+            search(key)
+
+    def scan_all():
+        scanned = 0
+        for lo in ranges:
+            for _ in index.range(lo, lo + 1000):
+                scanned += 1
+
+    timed("insert", len(keys), insert_all)
+    timed("search", len(lookups), search_all)
+    timed("range", len(ranges) * 1000, scan_all)
+
+    if hasattr(index, "bulk_range"):
+        timed("bulk", len(ranges) * 1000, lambda: [index.bulk_range(lo, lo + 1000) for lo in ranges])
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+
+    keys = list(range(count))
+    rng.shuffle(keys)
+    lookups = [rng.randrange(count) for _ in range(count)]
+    ranges = [rng.randrange(count) for _ in range(max(1, count // 1000))]
+
+    print(f"{count:,} keys, random insertion order")
+    bench(BinaryTree, keys, lookups, ranges)
+    bench(SortedList, keys, lookups, ranges)
+
+
+if __name__ == "__main__":
+    main()
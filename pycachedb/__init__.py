@@ -0,0 +1 @@
+from pycachedb.database import PyCacheDB
@@ -1,5 +1,8 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Union, Any
+from typing import Union, Any, Optional
+
+from pycachedb.data_structures.timing_wheel import TimingWheel
 
 class Cache(ABC):
 
@@ -12,6 +15,11 @@ class Cache(ABC):
         """
         self.capacity = capacity
         self.current_size = 0
+        # Expiry deadlines of the items put with a TTL, on the monotonic clock
+        self.expiry = TimingWheel()
+
+    def __len__(self) -> int:
+        return self.current_size
 
     @abstractmethod
     def get(self, key: Union[int,str]) -> Any:
@@ -27,13 +35,14 @@ class Cache(ABC):
         pass
 
     @abstractmethod
-    def put(self, key: Union[int, str], value: Any) -> None:
+    def put(self, key: Union[int, str], value: Any, ttl: Optional[float] = None) -> None:
         """
         Adds an item to the cache.
         
         Args:
             key: The key for the item
             value: The value to be cached
+            ttl: Seconds until the item expires, None keeps it until it is evicted
         """
         pass
 
@@ -50,9 +59,72 @@ class Cache(ABC):
         """
         pass
 
+    @abstractmethod
+    def evict(self) -> Optional[Union[int, str]]:
+        """
+        Removes the item the policy would discard next.
+
+        Returns:
+            The key of the evicted item, or None if the cache is empty
+        """
+        pass
+
     @abstractmethod
     def clear(self) -> None:
         """
         Clears all items from the cache.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """
+        Removes the items whose TTL has passed.
+
+        Runs before an item would be evicted to make room, and can be called
+        periodically to reclaim expired items sooner.
+
+        Args:
+            now: Current time on the monotonic clock, time.monotonic() by default
+
+        Returns:
+            The number of items removed
+        """
+        if not self.expiry.deadlines:
+            return 0
+
+        expired = self.expiry.advance(time.monotonic() if now is None else now)
+        for key in expired:
+            self.delete(key)
+
+        return len(expired)
+
+    def _set_ttl(self, key: Union[int, str], ttl: Optional[float]) -> None:
+        """
+        Schedules the expiry of an item, or makes it persistent when ttl is None.
+
+        Args:
+            key: The key of the item
+            ttl: Seconds until the item expires
+
+        Raises:
+            ValueError: If ttl is not positive
+        """
+        if ttl is None:
+            if self.expiry.deadlines:
+                self.expiry.cancel(key)
+            return
+
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self.expiry.schedule(key, time.monotonic() + ttl)
+
+    def _is_expired(self, key: Union[int, str]) -> bool:
+        """Checks whether the TTL of an item has passed, the item is then removed"""
+        deadline = self.expiry.deadlines.get(key)
+
+        if deadline is None or deadline > time.monotonic():
+            return False
+
+        self.delete(key)
+        return True
@@ -1,8 +1,6 @@
-from abc import ABC, abstractmethod
-from typing import Union, Any, Dict
+from typing import Union, Any, Dict, Optional
 
 from pycachedb.cache.base import Cache
-from pycachedb.data_structures.hash_table import HashTable
 from pycachedb.data_structures.linked_list import Node, DoublyLinkedList
 
 class LRUCache(Cache):
@@ -10,86 +8,73 @@ class LRUCache(Cache):
     def __init__(self, capacity: int = 128) -> None:
         """
         Initializes the LRU cache.
-        
+
         Args:
             capacity: Maximum number of items the cache can hold
         """
         super().__init__(capacity)
-        # Intializing the DoublyLinkedList object
+        # Intializing the DoublyLinkedList object, the most recently used node sits right after the head
         self.dll = DoublyLinkedList()
-        # Creating a hash map that maps key value to the next node by initializing the Hash Table class
-        self.cache_map = HashTable(size=1024)
+        # Mapping every key to its node, so a hit costs a single hash lookup and the node is moved in place
+        self.cache_map: Dict[Union[int, str], Node] = {}
+
+    def __contains__(self, key: Union[int, str]) -> bool:
+        return key in self.cache_map
 
     def get(self, key: Union[int, str]) -> Any:
         """
         Retrieves an item from the cache and update its position to be the most recently used.
-        
+
         Args:
             key: The key to retrieve
-            
+
         Returns:
             The value associated with the key, or None if not found
         """
-        try:
-            # Trying to retrieve the node from the hash map
-            node = self.cache_map.get(key)
-            value = node.value
+        node = self.cache_map.get(key)
 
-            self._remove_node(node)
+        if node is None:
+            return None
 
-            # Adding it back to the head position in the list
-            self.dll.insert_to_head(key,value)
+        # Items with a TTL are checked lazily, tick() reclaims the ones nobody reads
+        if self.expiry.deadlines and self._is_expired(key):
+            return None
 
-            # Updating the reference in the hash table
-            self.cache_map.set(key,self.dll.head.next)
+        self._move_to_head(node)
+        return node.value
 
-            return value
-        
-        except KeyError:
-            return None
-    
-    def put(self, key: Union[int, str], value: Any) -> None:
+    def put(self, key: Union[int, str], value: Any, ttl: Optional[float] = None) -> None:
         """
         Adds or updates an item in the cache.
-        
+
         Args:
             key: The key for the item
             value: The value to be cached
+            ttl: Seconds until the item expires, None keeps it until it is evicted
         """
+        node = self.cache_map.get(key)
+
+        if node is not None:
+            # If the key exists, we update its value and move it to the front
+            self._set_ttl(key, ttl)
+            node.value = value
+            self._move_to_head(node)
+            return
 
-        # Adding an early return if capacity is zero and it's a new key
-        if self.capacity == 0:
-            try:
-                node = self.cache_map.get(key)
-                # If this key exists we must remove it
-                self._remove_node(node)
-                return
-            except KeyError:
-                # If the key doesn't exist, we shouldn't add it since capacity is zero
-                return
-
-        try:        
-            # If the key exists, we need to update its value and move it to the front
-            node = self.cache_map.get(key)
-            self._remove_node(node)
-            self.dll.insert_to_head(key,value)
-            self.cache_map.set(key, self.dll.head.next)
+        # If the capacity is zero we never add anything
+        if self.capacity <= 0:
             return
 
-        except KeyError:
-            # If the key doesn't exist, we continue with the insertion process
-            pass
+        if ttl is not None:
+            self._set_ttl(key, ttl)
 
-        # Checking the capacity and evicting the oldest node
-        if self.current_size >= self.capacity:
-            lru_node = self.dll.delete_at_end()
-            if lru_node and lru_node.key is not None:
-                self.cache_map.delete(lru_node.key)
-                self.current_size = self.current_size - 1
+        # Checking the capacity, expired items are reclaimed before the oldest node is evicted
+        if self.current_size >= self.capacity and not self.tick():
+            self.evict()
 
         # Adding the new item to the head (most recently used)
-        self.dll.insert_to_head(key,value)
-        self.cache_map.set(key,self.dll.head.next)
+        self.dll.insert_to_head(key, value)
+        self.cache_map[key] = self.dll.head.next
         self.current_size = self.current_size + 1
 
     def delete(self, key: Union[int, str]) -> bool:
@@ -102,36 +87,78 @@ class LRUCache(Cache):
         Returns:
             True if the key was found and retrieved, False otherwise
         """
-        try:
-            node = self.cache_map.get(key)
-            self._remove_node(node)
-            self.cache_map.delete(key)
-            self.current_size = self.current_size - 1
-            return True
-
-        except KeyError:
+        node = self.cache_map.pop(key, None)
+
+        if node is None:
             return False
-    
+
+        if self.expiry.deadlines:
+            self.expiry.cancel(key)
+
+        self._remove_node(node)
+        self.current_size = self.current_size - 1
+        return True
+
+    def evict(self) -> Optional[Union[int, str]]:
+        """
+        Removes the least recently used item.
+
+        Returns:
+            The key of the evicted item, or None if the cache is empty
+        """
+        lru_node = self.dll.delete_at_end()
+
+        if lru_node is None:
+            return None
+
+        del self.cache_map[lru_node.key]
+        if self.expiry.deadlines:
+            self.expiry.cancel(lru_node.key)
+        self.current_size = self.current_size - 1
+        return lru_node.key
+
     def clear(self) -> None:
         """Clears all items from the cache"""
         self.dll = DoublyLinkedList()
-        self.cache_map = HashTable(size=1024)
+        self.cache_map = {}
+        self.expiry.clear()
         self.current_size = 0
 
+    def _move_to_head(self, node: Node) -> None:
+        """
+        Helper method to relink a node right after the head without reallocating it.
+
+        Args:
+            node: The node to mark as most recently used
+        """
+        head = self.dll.head
+        if head.next is node:
+            return
+
+        # Unlinking the node from its current position
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+        # Linking it back in after the head
+        node.next = head.next
+        node.prev = head
+        head.next.prev = node
+        head.next = node
+
     def _remove_node(self, node: Node) -> None:
         """
         Helper method to remove a node from the linked list.
-        
+
         Args:
             node: The node to remove
         """
         # Updating the next and prev pointers to remove the node
         node.prev.next = node.next
         node.next.prev = node.prev
-        
+
         # Disconnecting the node
         node.next = None
         node.prev = None
-        
+
         # Updating the size of the linked list
         self.dll.size = self.dll.size - 1
@@ -1,4 +1,4 @@
-from typing import Union, Any, Optional
+from typing import Union, Any, Optional, List, Tuple, Iterator, Iterable
 
 class TreeNode:
 
@@ -11,7 +11,7 @@ class TreeNode:
     ) -> None:
         """
         Initialize a tree node with key, value, and optional left and right children.
-        
+
         Args:
             key: The key used for ordering and lookup
             value: The value associated with the key
@@ -22,12 +22,30 @@ class TreeNode:
         self.value = value
         self.left = left
         self.right = right
+        # Height of the subtree rooted at this node, a leaf has height 1
+        self.height = 1 + max(
+            left.height if left else 0,
+            right.height if right else 0
+        )
+        # Number of nodes in the subtree rooted at this node, used for rank and select
+        self.count = 1 + (left.count if left else 0) + (right.count if right else 0)
 
     def __str__(self) -> str:
         return f"TreeNode(key={self.key}, value={self.value})"
-    
+
 
 class BinaryTree:
+    """
+    Self-balancing (AVL) binary search tree.
+
+    Every node keeps the height of its subtree and the tree is rebalanced with
+    rotations after each insert and delete, so the height stays within ~1.44 log2(n)
+    even for monotonically increasing keys. All operations are iterative, which keeps
+    deep trees clear of Python's recursion limit.
+
+    Nodes are also augmented with their subtree size, giving O(log n) rank and select
+    on top of the ordered range, floor and ceiling queries.
+    """
 
     def __init__(
         self,
@@ -36,6 +54,65 @@ class BinaryTree:
         self.root = root
         self.size = 0
 
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, key: Any) -> bool:
+        return self._find_node(key) is not None
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[Tuple[Any, Any]]) -> "BinaryTree":
+        """
+        Builds a perfectly balanced tree from key-value pairs in linear time.
+
+        Nodes are linked straight into place without any key comparisons, so the
+        pairs must already be in strictly ascending key order.
+
+        Args:
+            items: (key, value) tuples sorted by key with no duplicates
+
+        Returns:
+            A new BinaryTree holding the pairs
+        """
+        tree = cls()
+        tree._build(list(items))
+        return tree
+
+    def _build(self, items: List[Tuple[Any, Any]]) -> None:
+        """
+        Replaces the contents of the tree with a balanced tree over sorted pairs.
+
+        Args:
+            items: (key, value) tuples sorted by key with no duplicates
+        """
+        def build(lo: int, hi: int) -> Optional[TreeNode]:
+            # The recursion depth is log2(n), far below the recursion limit
+            if lo >= hi:
+                return None
+            mid = (lo + hi) >> 1
+            key, value = items[mid]
+            return TreeNode(key, value, build(lo, mid), build(mid + 1, hi))
+
+        self.root = build(0, len(items))
+        self.size = len(items)
+
+    def merge(self, other: "BinaryTree") -> None:
+        """
+        Merges another tree into this one in O(n + m).
+
+        Both trees are walked in order, the two sorted streams are merged and the
+        result is rebuilt as a balanced tree. Values from other win on equal keys.
+
+        Args:
+            other: The tree to merge in, left unchanged
+        """
+        self._build(merge_sorted(self.range(), other.range()))
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the keys in ascending order"""
+        for key, _ in self.range():
+            yield key
+
 
     def insert(
         self,
@@ -44,7 +121,7 @@ class BinaryTree:
     ) -> None:
         """
         Inserting a key-value pair into the tree.
-        
+
         Args:
             key: The key to insert
             value: The value to associate with the key
@@ -53,39 +130,32 @@ class BinaryTree:
             self.root = TreeNode(key, value)
             self.size = 1
             return
-        
-        self._insert_recursive(self.root, key, value)
-    
 
-    def _insert_recursive(
-        self,
-        node: TreeNode,
-        key: Union[str, Any],
-        value: Any
-    ) -> None:
-        """
-        Recursively inserts a node into the tree.
-        
-        Args:
-            node: The current node in the recursion
-            key: The key to insert
-            value: The value to associate with the key
-            
-        Returns:
-            The subtree root after insertion
-        """
-        
-        if key < node.key:
-            node.left = self._insert_recursive(node.left, key, value)
+        # Walking down to the insertion point while remembering the path
+        path: List[TreeNode] = []
+        node = self.root
 
-        elif key > node.key:
-            node.right = self._insert_recursive(node.right, key, value)
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                # Key already exists, only the value is updated
+                node.value = value
+                return
 
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = TreeNode(key, value)
         else:
-            node.value = value
-        
-        return node
-    
+            parent.right = TreeNode(key, value)
+
+        self.size += 1
+        self._rebalance_path(path)
+
 
     def search(
         self,
@@ -93,116 +163,410 @@ class BinaryTree:
     ) -> Optional[Any]:
         """
         Searches for a value by its key.
-        
+
         Args:
             key: The key to search for
-            
+
         Returns:
             The value associated with the key, or None if not found
         """
-        node = self._search_recursive(self.root, key)
-        
-        if node:
+        node = self._find_node(key)
+
+        if node is not None:
             return node.value
-        
-        else:
-            None
 
-    
-    def _search_recursive(
+        return None
+
+
+    def _find_node(
         self,
-        node: Optional[TreeNode],
         key: Union[int,str]
     ) -> Optional[TreeNode]:
         """
-        Recursively searches the tree for a key.
-        
+        Iteratively searches the tree for a key.
+
         Args:
-            node: The current node in the recursion
             key: The key to search for
-            
+
         Returns:
             The node containing the key, or None if not found
         """
-        if node is None:
-            return None
+        node = self.root
+
+        while node is not None:
+            node_key = node.key
+            if key < node_key:
+                node = node.left
+            elif key > node_key:
+                node = node.right
+            else:
+                return node
+
+        return None
+
 
-        if key == node.key:
-            return node
-        
-        elif key < node.key:
-            return self._search_recursive(node.left, key)
-        
-        else:
-            return self._search_recursive(node.right, key)
-        
-    
     def delete(self, key: Any) -> bool:
         """
         Deletes a node with the given key from the tree.
-        
+
         Args:
             key: The key to delete
-            
+
         Returns:
             True if the key was found and deleted, False otherwise
         """
-        if not self._search_recursive(self.root, key):
+        # Walking down to the node while remembering the path
+        path: List[TreeNode] = []
+        node = self.root
+
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+
+        if node is None:
             return False
-        
-        self.root = self._delete_recursive(self.root, key)
+
+        if node.left is not None and node.right is not None:
+            # Node with two children, the inorder successor takes its place
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+
+            # Copy successor key and value to this node
+            node.key = successor.key
+            node.value = successor.value
+
+            # The successor has no left child so it can be unlinked directly
+            node = successor
+
+        # Node with no children or one child
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+
         self.size -= 1
+        self._rebalance_path(path)
         return True
-    
-    def _delete_recursive(
-        self, 
-        node: Optional[TreeNode], 
-        key: Any
-    ) -> Optional[TreeNode]:
+
+
+    def _replace_child(
+        self,
+        parent: Optional[TreeNode],
+        old: TreeNode,
+        new: Optional[TreeNode]
+    ) -> None:
         """
-        Recursively deletes a node from the tree.
-        
+        Points the link that used to reference old at new instead.
+
         Args:
-            node: The current node in the recursion
-            key: The key to delete
-            
+            parent: Parent of old, None when old is the root
+            old: The child being replaced
+            new: The replacement subtree
+        """
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+
+    def _rebalance_path(self, path: List[TreeNode]) -> None:
+        """
+        Restores the AVL invariant bottom-up along a root-to-leaf path.
+
+        Args:
+            path: Nodes visited from the root down to the changed position
+        """
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index]
+            balanced = self._rebalance(node)
+
+            if balanced is not node:
+                self._replace_child(path[index - 1] if index > 0 else None, node, balanced)
+
+
+    def _rebalance(self, node: TreeNode) -> TreeNode:
+        """
+        Updates the height of node and rotates if its subtrees differ by more than one.
+
+        Args:
+            node: The subtree root to rebalance
+
+        Returns:
+            The new root of the subtree
+        """
+        balance = self._height(node.left) - self._height(node.right)
+
+        if balance > 1:
+            # Left heavy, a left-right case needs a rotation of the child first
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+
+        if balance < -1:
+            # Right heavy, a right-left case needs a rotation of the child first
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+
+        self._update(node)
+        return node
+
+
+    def _rotate_left(self, node: TreeNode) -> TreeNode:
+        """
+        Rotates the subtree left, promoting the right child.
+
+        Args:
+            node: The subtree root
+
+        Returns:
+            The new subtree root
+        """
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+
+    def _rotate_right(self, node: TreeNode) -> TreeNode:
+        """
+        Rotates the subtree right, promoting the left child.
+
+        Args:
+            node: The subtree root
+
+        Returns:
+            The new subtree root
+        """
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+
+    @staticmethod
+    def _height(node: Optional[TreeNode]) -> int:
+        """Height of a subtree, zero for an empty one"""
+        return node.height if node is not None else 0
+
+
+    @staticmethod
+    def _update(node: TreeNode) -> None:
+        """Recomputes the cached height and subtree size of node from its children"""
+        left, right = node.left, node.right
+        left_height = left.height if left is not None else 0
+        right_height = right.height if right is not None else 0
+        node.height = 1 + (left_height if left_height > right_height else right_height)
+        node.count = 1 + (left.count if left is not None else 0) + (right.count if right is not None else 0)
+
+
+    def range(
+        self,
+        lo: Optional[Any] = None,
+        hi: Optional[Any] = None,
+        reverse: bool = False
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        Lazily yields the key-value pairs with lo <= key <= hi in key order.
+
+        Only the O(log n) nodes on the current root-to-leaf path are held on the
+        explicit stack, so scanning a narrow range never materializes the tree.
+
+        Args:
+            lo: Inclusive lower bound, None for unbounded
+            hi: Inclusive upper bound, None for unbounded
+            reverse: Yield in descending order when True
+
         Returns:
-            The subtree root after deletion
+            Generator of (key, value) tuples
         """
+        if reverse:
+            # Mirror image of the ascending walk, starting bound is hi
+            start, stop = hi, lo
+            near, far = "right", "left"
+            before = lambda key, bound: key > bound
+        else:
+            start, stop = lo, hi
+            near, far = "left", "right"
+            before = lambda key, bound: key < bound
+
+        stack: List[TreeNode] = []
+        node = self.root
+
+        # Pushing the spine of nodes that are not before the starting bound
+        while node is not None:
+            if start is not None and before(node.key, start):
+                node = getattr(node, far)
+            else:
+                stack.append(node)
+                node = getattr(node, near)
+
+        while stack:
+            node = stack.pop()
+
+            if stop is not None and before(stop, node.key):
+                return
+
+            yield node.key, node.value
+
+            # Everything in the far subtree lies between this node and the next on the stack
+            node = getattr(node, far)
+            while node is not None:
+                stack.append(node)
+                node = getattr(node, near)
+
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        """Yields all key-value pairs in ascending key order"""
+        return self.range()
+
+
+    def min(self) -> Optional[Tuple[Any, Any]]:
+        """
+        Returns the smallest key-value pair, or None if the tree is empty
+        """
+        if self.root is None:
+            return None
+
+        node = self._find_min(self.root)
+        return node.key, node.value
+
+
+    def max(self) -> Optional[Tuple[Any, Any]]:
+        """
+        Returns the largest key-value pair, or None if the tree is empty
+        """
+        node = self.root
         if node is None:
             return None
-        
-        if key < node.key:
-            node.left = self._delete_recursive(node.left, key)
-        elif key > node.key:
-            node.right = self._delete_recursive(node.right, key)
-        else:          
-            # Case 1: Node with no children or one child
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-            
-            # Case 2: Node with two children
-            # Find the inorder successor (smallest node in right subtree)
-            successor = self._find_min(node.right)
-            
-            # Copy successor key and value to this node
-            node.key = successor.key
-            node.value = successor.value
-            
-            # Delete the successor
-            node.right = self._delete_recursive(node.right, successor.key)
-        
-        return node
-    
+
+        while node.right is not None:
+            node = node.right
+        return node.key, node.value
+
+
+    def floor(self, key: Any) -> Optional[Tuple[Any, Any]]:
+        """
+        Finds the largest key less than or equal to key.
+
+        Args:
+            key: The key to search for
+
+        Returns:
+            The matching (key, value) tuple, or None if every key is greater
+        """
+        best = None
+        node = self.root
+
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                best = node
+                node = node.right
+            else:
+                return node.key, node.value
+
+        return (best.key, best.value) if best is not None else None
+
+
+    def ceiling(self, key: Any) -> Optional[Tuple[Any, Any]]:
+        """
+        Finds the smallest key greater than or equal to key.
+
+        Args:
+            key: The key to search for
+
+        Returns:
+            The matching (key, value) tuple, or None if every key is smaller
+        """
+        best = None
+        node = self.root
+
+        while node is not None:
+            if key < node.key:
+                best = node
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node.key, node.value
+
+        return (best.key, best.value) if best is not None else None
+
+
+    def rank(self, key: Any) -> int:
+        """
+        Counts the keys strictly smaller than key in O(log n).
+
+        Args:
+            key: The key to rank, it does not need to be present
+
+        Returns:
+            The number of keys smaller than key, which is the index key has or would have
+        """
+        rank = 0
+        node = self.root
+
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                left_count = node.left.count if node.left is not None else 0
+                if key > node.key:
+                    rank += left_count + 1
+                    node = node.right
+                else:
+                    return rank + left_count
+
+        return rank
+
+
+    def select(self, index: int) -> Tuple[Any, Any]:
+        """
+        Finds the key-value pair at the given position in key order in O(log n).
+
+        Args:
+            index: Zero based position, negative values count from the end
+
+        Returns:
+            The (key, value) tuple at that position
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        if index < 0:
+            index += self.size
+
+        if index < 0 or index >= self.size:
+            raise IndexError("BinaryTree index out of range")
+
+        node = self.root
+        while True:
+            left_count = node.left.count if node.left is not None else 0
+            if index < left_count:
+                node = node.left
+            elif index > left_count:
+                index -= left_count + 1
+                node = node.right
+            else:
+                return node.key, node.value
+
+
     def _find_min(self, node: TreeNode) -> TreeNode:
         """
         Find the node with the minimum key in the subtree.
-        
+
         Args:
             node: The root of the subtree
-            
+
         Returns:
             The node with the minimum key
         """
@@ -216,4 +580,46 @@ class BinaryTree:
         Clear the tree.
         """
         self.root = None
-        self.size = 0
\ No newline at end of file
+        self.size = 0
+
+
+def merge_sorted(
+    left: Iterable[Tuple[Any, Any]],
+    right: Iterable[Tuple[Any, Any]]
+) -> List[Tuple[Any, Any]]:
+    """
+    Merges two ascending streams of key-value pairs into one sorted list.
+
+    Args:
+        left: (key, value) tuples sorted by key
+        right: (key, value) tuples sorted by key, these win on equal keys
+
+    Returns:
+        The merged (key, value) tuples without duplicate keys
+    """
+    merged: List[Tuple[Any, Any]] = []
+    left = iter(left)
+    right = iter(right)
+    left_item = next(left, None)
+    right_item = next(right, None)
+
+    while left_item is not None and right_item is not None:
+        if left_item[0] < right_item[0]:
+            merged.append(left_item)
+            left_item = next(left, None)
+        elif right_item[0] < left_item[0]:
+            merged.append(right_item)
+            right_item = next(right, None)
+        else:
+            merged.append(right_item)
+            left_item = next(left, None)
+            right_item = next(right, None)
+
+    if left_item is not None:
+        merged.append(left_item)
+        merged.extend(left)
+    if right_item is not None:
+        merged.append(right_item)
+        merged.extend(right)
+
+    return merged
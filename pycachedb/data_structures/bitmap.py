@@ -0,0 +1,202 @@
+import operator
+import sys
+from functools import reduce
+from typing import List
+
+# Bytes handled by one big integer operation, large bitmaps are processed in chunks of this size
+CHUNK_SIZE = 1 << 20
+
+# Largest bit offset SETBIT accepts, bitmaps are limited to 512 MB
+MAX_BIT_OFFSET = (1 << 32) - 1
+
+BITOP_OPERATIONS = {
+    "AND": operator.and_,
+    "OR": operator.or_,
+    "XOR": operator.xor,
+}
+
+
+class Bitmap:
+    """
+    String of bits stored in a growable bytearray, the most significant bit of each byte first.
+
+    Strings are bitmaps of their UTF-8 bytes, so bits can be set on any string
+    and a bitmap reads back as a string. Counting, searching and combining
+    bitmaps work on chunks of CHUNK_SIZE bytes at a time, as big integers or
+    with bytes methods, so a multi-megabyte bitmap is a few C level operations
+    rather than a Python loop over its bits.
+    """
+
+    def __init__(self, data: bytes = b"") -> None:
+        """
+        Initializes a bitmap.
+
+        Args:
+            data: The initial bytes, empty by default
+        """
+        self.data = bytearray(data)
+
+    @classmethod
+    def from_string(cls, value: str) -> "Bitmap":
+        """Builds the bitmap of the bytes of a string"""
+        return cls(value.encode("utf-8", "surrogateescape"))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __str__(self) -> str:
+        # Bytes that are not valid UTF-8 round trip through surrogates
+        return self.data.decode("utf-8", "surrogateescape")
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used"""
+        return sys.getsizeof(self) + sys.getsizeof(self.data)
+
+    def get_bit(self, offset: int) -> int:
+        """
+        Fetches a bit, bits past the end are 0.
+
+        Args:
+            offset: Position of the bit
+
+        Returns:
+            The bit, 0 or 1
+        """
+        byte = offset >> 3
+        if byte >= len(self.data):
+            return 0
+
+        return (self.data[byte] >> (7 - (offset & 7))) & 1
+
+    def set_bit(self, offset: int, bit: int) -> int:
+        """
+        Sets or clears a bit, growing the bitmap with zero bytes as needed.
+
+        Args:
+            offset: Position of the bit
+            bit: The new value, 0 or 1
+
+        Returns:
+            The previous value of the bit
+        """
+        data = self.data
+        byte = offset >> 3
+        if byte >= len(data):
+            data.extend(bytes(byte + 1 - len(data)))
+
+        mask = 0x80 >> (offset & 7)
+        old = 1 if data[byte] & mask else 0
+
+        if bit:
+            data[byte] |= mask
+        else:
+            data[byte] &= ~mask & 0xFF
+
+        return old
+
+    def count(self, start: int, end: int) -> int:
+        """
+        Counts the set bits between two bit offsets, both inclusive.
+
+        Args:
+            start: First bit to count, within the bitmap
+            end: Last bit to count, within the bitmap
+
+        Returns:
+            The number of set bits
+        """
+        data = self.data
+        first, last = start >> 3, end >> 3
+        total = self._count_bytes(first, last + 1)
+
+        # The edge bytes were counted whole, their bits outside the range are taken back out
+        total -= (data[first] & ~(0xFF >> (start & 7)) & 0xFF).bit_count()
+        total -= (data[last] & (0xFF >> ((end & 7) + 1))).bit_count()
+        return total
+
+    def position(self, bit: int, start: int, end: int) -> int:
+        """
+        Finds the first bit with a value between two bit offsets, both inclusive.
+
+        Args:
+            bit: The value to look for, 0 or 1
+            start: First bit to check, within the bitmap
+            end: Last bit to check, within the bitmap
+
+        Returns:
+            The offset of the bit, -1 if there is none in the range
+        """
+        first, last = start >> 3, end >> 3
+        if first == last:
+            return self._scan_bits(bit, start, end)
+
+        # The edge bytes may be partial so they are checked bit by bit, the bytes in between in bulk
+        found = self._scan_bits(bit, start, (first << 3) + 7)
+        if found < 0:
+            found = self._scan_bytes(bit, first + 1, last)
+        if found < 0:
+            found = self._scan_bits(bit, last << 3, end)
+
+        return found
+
+    def _count_bytes(self, start: int, stop: int) -> int:
+        """Counts the set bits of the bytes in [start, stop)"""
+        total = 0
+        with memoryview(self.data) as view:
+            for chunk_start in range(start, stop, CHUNK_SIZE):
+                chunk = view[chunk_start:min(chunk_start + CHUNK_SIZE, stop)]
+                total += int.from_bytes(chunk, "big").bit_count()
+        return total
+
+    def _scan_bits(self, bit: int, start: int, end: int) -> int:
+        """Checks the bits of a range one at a time, for ranges within a single byte"""
+        data = self.data
+        for offset in range(start, end + 1):
+            if (data[offset >> 3] >> (7 - (offset & 7))) & 1 == bit:
+                return offset
+        return -1
+
+    def _scan_bytes(self, bit: int, start: int, stop: int) -> int:
+        """Finds the first bit with a value in the bytes in [start, stop)"""
+        # Bytes without the bit are all zeros when looking for a 1 and all ones when looking for a 0
+        skip = b"\x00" if bit else b"\xff"
+        data = self.data
+
+        for chunk_start in range(start, stop, CHUNK_SIZE):
+            chunk = data[chunk_start:min(chunk_start + CHUNK_SIZE, stop)]
+            rest = chunk.lstrip(skip)
+            if rest:
+                byte = rest[0] if bit else rest[0] ^ 0xFF
+                index = chunk_start + len(chunk) - len(rest)
+                return (index << 3) + 8 - byte.bit_length()
+
+        return -1
+
+
+def bitop(operation: str, sources: List[bytes]) -> bytearray:
+    """
+    Combines bitmaps bitwise, shorter ones are padded with zero bytes.
+
+    Args:
+        operation: "AND", "OR", "XOR" or "NOT", NOT takes a single source
+        sources: The bytes of the bitmaps to combine
+
+    Returns:
+        The bytes of the result, as long as the longest source
+    """
+    length = max(map(len, sources), default=0)
+    result = bytearray(length)
+
+    for start in range(0, length, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, length)
+        size = stop - start
+        values = [int.from_bytes(source[start:stop].ljust(size, b"\x00"), "big") for source in sources]
+
+        if operation == "NOT":
+            value = ~values[0] & ((1 << (size * 8)) - 1)
+        else:
+            value = reduce(BITOP_OPERATIONS[operation], values)
+
+        result[start:stop] = value.to_bytes(size, "big")
+
+    return result
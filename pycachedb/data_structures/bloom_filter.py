@@ -0,0 +1,193 @@
+import math
+import sys
+from hashlib import blake2b
+from typing import List, Tuple
+
+DEFAULT_ERROR_RATE = 0.01
+DEFAULT_CAPACITY = 100
+DEFAULT_EXPANSION = 2
+
+# Each new layer gets this fraction of the error rate of the previous one, so the
+# error rates of all the layers add up to at most twice the requested rate
+TIGHTENING_RATIO = 0.5
+
+LN2_SQUARED = math.log(2) ** 2
+
+# Largest capacity a filter is created with and largest expansion between layers
+MAX_CAPACITY = 1 << 30
+MAX_EXPANSION = 32768
+
+# Largest bit array of a layer, the 512 MB a string is limited to
+MAX_LAYER_BITS = 1 << 32
+
+
+def _hash(element: str) -> Tuple[int, int]:
+    """Hashes an element into the two 64 bit hashes its probes are derived from"""
+    digest = blake2b(element.encode(), digest_size=16).digest()
+    # A zero second hash would put every probe on the same bit
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+def layer_bits(capacity: int, error_rate: float) -> int:
+    """Returns the number of bits a layer needs to hold capacity elements at an error rate"""
+    return max(math.ceil(-capacity * math.log(error_rate) / LN2_SQUARED), 8)
+
+
+def check_parameters(error_rate: float, capacity: int, expansion: int) -> int:
+    """
+    Checks the parameters of a new filter without allocating it.
+
+    Args:
+        error_rate: Target false positive probability
+        capacity: Number of elements the first layer holds
+        expansion: Capacity ratio between a new layer and the previous one
+
+    Returns:
+        The bytes of the bit array of the first layer
+
+    Raises:
+        ValueError: If the error rate, capacity or expansion is out of range
+    """
+    if not 0 < error_rate < 1:
+        raise ValueError("error rate must be between 0 and 1")
+    if not 1 <= capacity <= MAX_CAPACITY:
+        raise ValueError(f"capacity must be between 1 and {MAX_CAPACITY}")
+    if not 1 <= expansion <= MAX_EXPANSION:
+        raise ValueError(f"expansion must be between 1 and {MAX_EXPANSION}")
+
+    bits = layer_bits(capacity, error_rate * TIGHTENING_RATIO)
+    if bits > MAX_LAYER_BITS:
+        raise ValueError("error rate too small for the capacity, the filter would exceed 512 MB")
+
+    return (bits + 7) // 8
+
+
+class BloomLayer:
+
+    __slots__ = ("bits", "size", "hashes", "capacity", "count")
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """
+        Initializes an empty layer sized for a capacity and an error rate.
+
+        Args:
+            capacity: Number of elements the layer holds at the error rate
+            error_rate: False positive probability once the layer is full
+        """
+        self.size = layer_bits(capacity, error_rate)
+        self.hashes = max(math.ceil(-math.log2(error_rate)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.capacity = capacity
+        self.count = 0
+
+    def __contains__(self, hashes: Tuple[int, int]) -> bool:
+        bits, size = self.bits, self.size
+        first, second = hashes
+        for i in range(self.hashes):
+            position = (first + i * second) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, hashes: Tuple[int, int]) -> None:
+        """Sets the bits probed by the hashes of an element"""
+        bits, size = self.bits, self.size
+        first, second = hashes
+        for i in range(self.hashes):
+            position = (first + i * second) % size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+class BloomFilter:
+    """
+    Probabilistic set answering "definitely absent" or "probably present" in a few bits per element.
+
+    An element sets k bits of a bit array, at positions derived from two hashes
+    by double hashing: h1 + i * h2 for i below k. A lookup that finds any of its
+    k bits clear proves the element was never added.
+
+    A filter is created for a capacity. Once the newest layer holds that many
+    elements, a layer expansion times larger is added with a tighter error rate,
+    so the filter keeps its false positive rate as it grows instead of filling
+    up. A lookup checks every layer, and the layers grow geometrically so there
+    are only a few of them. Non scaling filters refuse new elements instead.
+    """
+
+    def __init__(
+        self,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        capacity: int = DEFAULT_CAPACITY,
+        expansion: int = DEFAULT_EXPANSION,
+        scaling: bool = True
+    ) -> None:
+        """
+        Initializes an empty filter with a single layer.
+
+        Args:
+            error_rate: Target false positive probability, between 0 and 1
+            capacity: Number of elements the first layer holds
+            expansion: Capacity ratio between a new layer and the previous one
+            scaling: Add layers as the filter fills, otherwise adding to a full filter fails
+
+        Raises:
+            ValueError: If the error rate, capacity or expansion is out of range
+        """
+        check_parameters(error_rate, capacity, expansion)
+
+        self.error_rate = error_rate
+        self.expansion = expansion
+        self.scaling = scaling
+        self.layers: List[BloomLayer] = [BloomLayer(capacity, error_rate * TIGHTENING_RATIO)]
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, element: str) -> bool:
+        hashes = _hash(element)
+        return any(hashes in layer for layer in self.layers)
+
+    @property
+    def capacity(self) -> int:
+        """Number of elements the filter holds before it adds a layer"""
+        return sum(layer.capacity for layer in self.layers)
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used"""
+        layers = sum(sys.getsizeof(layer) + sys.getsizeof(layer.bits) for layer in self.layers)
+        return sys.getsizeof(self) + sys.getsizeof(self.layers) + layers
+
+    def add(self, element: str) -> bool:
+        """
+        Adds an element.
+
+        Args:
+            element: The element to add
+
+        Returns:
+            True if the element was added, False if it may already be present
+
+        Raises:
+            ValueError: If the filter is full and does not scale, or its next layer would be too large
+        """
+        hashes = _hash(element)
+        if any(hashes in layer for layer in self.layers):
+            return False
+
+        layer = self.layers[-1]
+        if layer.count >= layer.capacity:
+            if not self.scaling:
+                raise ValueError("non scaling filter is full")
+
+            capacity = layer.capacity * self.expansion
+            error_rate = self.error_rate * TIGHTENING_RATIO ** (len(self.layers) + 1)
+            if layer_bits(capacity, error_rate) > MAX_LAYER_BITS:
+                raise ValueError("filter is full, its next layer would exceed 512 MB")
+
+            layer = BloomLayer(capacity, error_rate)
+            self.layers.append(layer)
+
+        layer.add(hashes)
+        self.count += 1
+        return True
@@ -0,0 +1,178 @@
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Limits of the compact encoding, a hash past either one is converted to a dict
+DEFAULT_MAX_COMPACT_ENTRIES = 128
+DEFAULT_MAX_COMPACT_VALUE = 64
+
+
+class CompactHash:
+    """
+    Field-value map stored as a flat list of alternating fields and values while small.
+
+    Small hashes cost one list slot per field and value instead of a hash table
+    with its spare capacity, and a lookup is a C level scan of the list, which
+    is as fast as hashing at a few dozen entries. Once the hash holds more than
+    max_entries fields, or a field or value longer than max_value, it is
+    converted to a dict for good, so large hashes keep O(1) operations.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_COMPACT_ENTRIES,
+        max_value: int = DEFAULT_MAX_COMPACT_VALUE
+    ) -> None:
+        """
+        Initializes an empty hash in the compact encoding.
+
+        Args:
+            max_entries: Number of fields kept in the compact encoding
+            max_value: Length of the longest field or value kept in the compact encoding
+        """
+        self.max_entries = max_entries
+        self.max_value = max_value
+        # Alternating fields and values while compact, None once converted
+        self.entries: Optional[List[Any]] = []
+        self.table: Optional[Dict[Any, Any]] = None
+        # Bytes of the fields and values, maintained on every change
+        self.element_bytes = 0
+
+    @property
+    def encoding(self) -> str:
+        """Name of the current encoding"""
+        return "listpack" if self.table is None else "hashtable"
+
+    def __len__(self) -> int:
+        if self.table is None:
+            return len(self.entries) // 2
+
+        return len(self.table)
+
+    def __contains__(self, field: Any) -> bool:
+        if self.table is None:
+            return self._find(field) >= 0
+
+        return field in self.table
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.table is None:
+            return iter(self.entries[0::2])
+
+        return iter(self.table)
+
+    def items(self) -> List[Tuple[Any, Any]]:
+        """Returns the (field, value) pairs, in insertion order"""
+        if self.table is None:
+            return list(zip(self.entries[0::2], self.entries[1::2]))
+
+        return list(self.table.items())
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used, maintained on every change so it is O(1)"""
+        container = self.entries if self.table is None else self.table
+        return sys.getsizeof(self) + sys.getsizeof(container) + self.element_bytes
+
+    def get(self, field: Any) -> Optional[Any]:
+        """
+        Fetches the value of a field.
+
+        Args:
+            field: The field to look up
+
+        Returns:
+            The value, or None if the field does not exist
+        """
+        if self.table is not None:
+            return self.table.get(field)
+
+        position = self._find(field)
+        return self.entries[position + 1] if position >= 0 else None
+
+    def set(self, field: Any, value: Any) -> bool:
+        """
+        Stores the value of a field.
+
+        Args:
+            field: The field to set
+            value: The value to store
+
+        Returns:
+            True if the field is new, False if its value was replaced
+        """
+        if self.table is None and (len(field) > self.max_value or len(value) > self.max_value):
+            self._convert()
+
+        if self.table is not None:
+            old = self.table.get(field)
+            self.table[field] = value
+            return self._account(field, old, value)
+
+        entries = self.entries
+        position = self._find(field)
+        if position >= 0:
+            old = entries[position + 1]
+            entries[position + 1] = value
+            return self._account(field, old, value)
+
+        entries.append(field)
+        entries.append(value)
+        self._account(field, None, value)
+
+        if len(entries) > self.max_entries * 2:
+            self._convert()
+
+        return True
+
+    def delete(self, field: Any) -> bool:
+        """
+        Removes a field.
+
+        Args:
+            field: The field to remove
+
+        Returns:
+            True if the field existed, False otherwise
+        """
+        if self.table is not None:
+            if field not in self.table:
+                return False
+            value = self.table.pop(field)
+        else:
+            position = self._find(field)
+            if position < 0:
+                return False
+            value = self.entries[position + 1]
+            del self.entries[position:position + 2]
+
+        self.element_bytes -= sys.getsizeof(field) + sys.getsizeof(value)
+        return True
+
+    def _find(self, field: Any) -> int:
+        """Finds the position of a field in the compact entries, -1 if it is missing"""
+        entries = self.entries
+        start = 0
+
+        while True:
+            try:
+                position = entries.index(field, start)
+            except ValueError:
+                return -1
+            # A value equal to the field is skipped, fields sit at even positions
+            if position % 2 == 0:
+                return position
+            start = position + 1
+
+    def _account(self, field: Any, old: Optional[Any], value: Any) -> bool:
+        """Updates element_bytes for a value stored at field, returns whether the field is new"""
+        if old is None:
+            self.element_bytes += sys.getsizeof(field) + sys.getsizeof(value)
+            return True
+
+        self.element_bytes += sys.getsizeof(value) - sys.getsizeof(old)
+        return False
+
+    def _convert(self) -> None:
+        """Moves the compact entries into a dict"""
+        entries = self.entries
+        self.table = dict(zip(entries[0::2], entries[1::2]))
+        self.entries = None
@@ -0,0 +1,230 @@
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterator, List, Optional, Set
+
+from pycachedb.integers import parse_int
+
+# Number of members kept in the integer encoding before converting to a hash set
+DEFAULT_MAX_INTSET_ENTRIES = 512
+
+# Candidates are looked up by binary search while there are this many times fewer
+# of them than members, otherwise the members are hashed once in C
+BINARY_SEARCH_RATIO = 16
+
+
+class CompactSet:
+    """
+    Set of strings stored as a sorted array of 64 bit integers while every member is one.
+
+    The integer encoding costs 8 bytes per member, membership is a binary search
+    and the members come out sorted, which lets set algebra between integer sets
+    run on the arrays. Adding a member that is not an integer, or growing past
+    max_intset_entries, converts the set to a Python set of strings for good.
+    """
+
+    def __init__(self, max_intset_entries: int = DEFAULT_MAX_INTSET_ENTRIES) -> None:
+        """
+        Initializes an empty set in the integer encoding.
+
+        Args:
+            max_intset_entries: Number of members kept in the integer encoding
+        """
+        self.max_intset_entries = max_intset_entries
+        # Sorted members while they are all integers, None once converted
+        self.values: Optional[array] = array("q")
+        self.table: Optional[Set[str]] = None
+        # Bytes of the member strings of the hash encoding
+        self.element_bytes = 0
+
+    @property
+    def encoding(self) -> str:
+        """Name of the current encoding"""
+        return "intset" if self.table is None else "hashtable"
+
+    def __len__(self) -> int:
+        if self.table is None:
+            return len(self.values)
+
+        return len(self.table)
+
+    def __contains__(self, member: str) -> bool:
+        if self.table is not None:
+            return member in self.table
+
+        value = parse_int(member)
+        return value is not None and self._position(value) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        if self.table is None:
+            return map(str, self.values)
+
+        return iter(self.table)
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used, maintained on every change so it is O(1)"""
+        if self.table is None:
+            return sys.getsizeof(self) + sys.getsizeof(self.values)
+
+        return sys.getsizeof(self) + sys.getsizeof(self.table) + self.element_bytes
+
+    def add(self, member: str) -> bool:
+        """
+        Adds a member.
+
+        Args:
+            member: The member to add
+
+        Returns:
+            True if the member is new, False if it was already present
+        """
+        if self.table is None:
+            value = parse_int(member)
+            if value is not None:
+                values = self.values
+                position = bisect_left(values, value)
+                if position < len(values) and values[position] == value:
+                    return False
+                if len(values) < self.max_intset_entries:
+                    values.insert(position, value)
+                    return True
+            self._convert()
+
+        table = self.table
+        if member in table:
+            return False
+
+        table.add(member)
+        self.element_bytes += sys.getsizeof(member)
+        return True
+
+    def remove(self, member: str) -> bool:
+        """
+        Removes a member.
+
+        Args:
+            member: The member to remove
+
+        Returns:
+            True if the member was present, False otherwise
+        """
+        if self.table is not None:
+            if member not in self.table:
+                return False
+            self.table.remove(member)
+            self.element_bytes -= sys.getsizeof(member)
+            return True
+
+        value = parse_int(member)
+        position = self._position(value) if value is not None else -1
+        if position < 0:
+            return False
+
+        del self.values[position]
+        return True
+
+    def _position(self, value: int) -> int:
+        """Finds an integer in the sorted values with a binary search, -1 if it is missing"""
+        values = self.values
+        position = bisect_left(values, value)
+
+        if position < len(values) and values[position] == value:
+            return position
+
+        return -1
+
+    def _filter_ints(self, candidates: List[int]) -> List[int]:
+        """Keeps the sorted integer candidates that are members of this integer set"""
+        values = self.values
+
+        if len(candidates) * BINARY_SEARCH_RATIO < len(values):
+            size = len(values)
+            kept = []
+            for value in candidates:
+                position = bisect_left(values, value)
+                if position < size and values[position] == value:
+                    kept.append(value)
+            return kept
+
+        return sorted(set(candidates).intersection(values))
+
+    def _convert(self) -> None:
+        """Moves the integer members into a set of strings"""
+        self.table = set(map(str, self.values))
+        self.element_bytes = sum(map(sys.getsizeof, self.table))
+        self.values = None
+
+
+def intersection(sets: List[CompactSet]) -> List[str]:
+    """
+    Computes the members present in every set.
+
+    Starts from the smallest set and filters its members through the others in
+    order of size, so the work is bounded by the smallest set rather than the
+    largest. Integer sets are intersected on their arrays without building strings.
+
+    Args:
+        sets: The sets to intersect
+
+    Returns:
+        The common members, sorted when every set is an integer set
+    """
+    if not sets or not all(sets):
+        return []
+
+    sets = sorted(sets, key=len)
+
+    if all(compact.table is None for compact in sets):
+        candidates = list(sets[0].values)
+        for compact in sets[1:]:
+            candidates = compact._filter_ints(candidates)
+            if not candidates:
+                return []
+        return list(map(str, candidates))
+
+    candidates = list(sets[0])
+    for compact in sets[1:]:
+        candidates = [member for member in candidates if member in compact]
+        if not candidates:
+            break
+
+    return candidates
+
+
+def union(sets: List[CompactSet]) -> List[str]:
+    """
+    Computes the members present in any of the sets.
+
+    Args:
+        sets: The sets to merge
+
+    Returns:
+        The members, sorted when every set is an integer set
+    """
+    if all(compact.table is None for compact in sets):
+        return list(map(str, sorted(set().union(*(compact.values for compact in sets)))))
+
+    return list(set().union(*sets))
+
+
+def difference(first: CompactSet, others: List[CompactSet]) -> List[str]:
+    """
+    Computes the members of the first set that are in none of the others.
+
+    Args:
+        first: The set to subtract from
+        others: The sets to subtract
+
+    Returns:
+        The remaining members, sorted when every set is an integer set
+    """
+    others = [compact for compact in others if compact]
+
+    if first.table is None and all(compact.table is None for compact in others):
+        remaining = set(first.values)
+        remaining.difference_update(*(compact.values for compact in others))
+        return list(map(str, sorted(remaining)))
+
+    # The largest sets are the most likely to contain a member, so they are checked first
+    others.sort(key=len, reverse=True)
+    return [member for member in first if not any(member in compact for compact in others)]
@@ -0,0 +1,114 @@
+import random
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+class ExpiryIndex:
+    """
+    Expiry deadlines of the keys that have a TTL.
+
+    Deadlines are packed into an array of doubles, parallel to a list of the keys,
+    and a dict maps each key to its slot. Reading a deadline is a single hash lookup
+    plus an array index, and each deadline costs 8 bytes instead of a float object.
+    Removal moves the last slot into the freed one, so the slots stay dense and a
+    random slot can be picked in O(1).
+    """
+
+    def __init__(self) -> None:
+        self.positions: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self.deadlines = array("d")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __bool__(self) -> bool:
+        return bool(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys)
+
+    def get(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        """
+        Fetches the deadline of a key.
+
+        Args:
+            key: The key to look up
+            default: Returned when the key has no deadline
+
+        Returns:
+            The deadline, or default
+        """
+        position = self.positions.get(key)
+
+        if position is None:
+            return default
+
+        return self.deadlines[position]
+
+    def __getitem__(self, key: str) -> float:
+        return self.deadlines[self.positions[key]]
+
+    def __setitem__(self, key: str, deadline: float) -> None:
+        position = self.positions.get(key)
+
+        if position is not None:
+            self.deadlines[position] = deadline
+            return
+
+        self.positions[key] = len(self.keys)
+        self.keys.append(key)
+        self.deadlines.append(deadline)
+
+    def __delitem__(self, key: str) -> None:
+        if self.pop(key) is None:
+            raise KeyError(key)
+
+    def pop(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        """
+        Removes the deadline of a key.
+
+        Args:
+            key: The key to remove
+            default: Returned when the key has no deadline
+
+        Returns:
+            The removed deadline, or default
+        """
+        position = self.positions.pop(key, None)
+
+        if position is None:
+            return default
+
+        deadline = self.deadlines[position]
+        last_key = self.keys.pop()
+        last_deadline = self.deadlines.pop()
+
+        # The last slot fills the hole, unless the removed key was the last one
+        if last_key != key:
+            self.keys[position] = last_key
+            self.deadlines[position] = last_deadline
+            self.positions[last_key] = position
+
+        return deadline
+
+    def sample(self, count: int) -> List[str]:
+        """
+        Picks distinct keys at random, in O(count) thanks to the dense slots.
+
+        Args:
+            count: Number of keys to pick, capped at the number of keys
+
+        Returns:
+            The sampled keys
+        """
+        keys = self.keys
+        return [keys[position] for position in random.sample(range(len(keys)), min(count, len(keys)))]
+
+    def clear(self) -> None:
+        """Removes every deadline"""
+        self.positions.clear()
+        self.keys.clear()
+        self.deadlines = array("d")
@@ -0,0 +1,307 @@
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+from typing import List, Optional
+
+# 2 ** PRECISION registers of REGISTER_BITS bits, the standard error is 1.04 / sqrt(REGISTERS) = 0.81%
+PRECISION = 14
+REGISTERS = 1 << PRECISION
+REGISTER_MASK = REGISTERS - 1
+REGISTER_BITS = 6
+REGISTER_MAX = (1 << REGISTER_BITS) - 1
+
+# Hash bits left after the register index, a register holds at most Q + 1
+Q = 64 - PRECISION
+
+# Dense registers packed 6 bits each, plus one byte so the last register can be read as a 16 bit word
+DENSE_BYTES = REGISTERS * REGISTER_BITS // 8
+DENSE_SIZE = DENSE_BYTES + 1
+
+# Sparse HyperLogLogs are converted to dense once their entries take more bytes than this
+DEFAULT_SPARSE_MAX_BYTES = 3000
+
+ALPHA_INF = 0.5 / math.log(2)
+
+# Tables shifting and masking every byte at once through bytes.translate, used to
+# move between the packed 6 bit layout and one register per byte
+_AND_63 = bytes(x & 63 for x in range(256))
+_SHR_2 = bytes(x >> 2 for x in range(256))
+_SHR_4 = bytes(x >> 4 for x in range(256))
+_SHR_6 = bytes(x >> 6 for x in range(256))
+_AND_3_SHL_4 = bytes((x & 3) << 4 for x in range(256))
+_AND_3_SHL_6 = bytes((x & 3) << 6 for x in range(256))
+_AND_15_SHL_2 = bytes((x & 15) << 2 for x in range(256))
+_AND_15_SHL_4 = bytes((x & 15) << 4 for x in range(256))
+_SHL_2 = bytes((x << 2) & 255 for x in range(256))
+
+# The high bit of every byte of the unpacked registers, for the lane wise maximum
+_HIGH_BITS = int.from_bytes(b"\x80" * REGISTERS, "little")
+
+
+def _or(left: bytes, right: bytes) -> bytes:
+    """ORs two byte strings of equal length in one big integer operation"""
+    merged = int.from_bytes(left, "little") | int.from_bytes(right, "little")
+    return merged.to_bytes(len(left), "little")
+
+
+def _unpack(dense: bytearray) -> bytearray:
+    """Expands the packed registers to one byte per register"""
+    packed = bytes(dense[:DENSE_BYTES])
+    # Every 3 bytes hold 4 registers, the bytes are split by their position in the group
+    b0, b1, b2 = packed[0::3], packed[1::3], packed[2::3]
+
+    registers = bytearray(REGISTERS)
+    registers[0::4] = b0.translate(_AND_63)
+    registers[1::4] = _or(b0.translate(_SHR_6), b1.translate(_AND_15_SHL_2))
+    registers[2::4] = _or(b1.translate(_SHR_4), b2.translate(_AND_3_SHL_4))
+    registers[3::4] = b2.translate(_SHR_2)
+    return registers
+
+
+def _pack(registers: bytes) -> bytearray:
+    """Packs one byte per register into the 6 bit layout"""
+    r0, r1, r2, r3 = registers[0::4], registers[1::4], registers[2::4], registers[3::4]
+
+    dense = bytearray(DENSE_SIZE)
+    dense[0:DENSE_BYTES:3] = _or(r0, r1.translate(_AND_3_SHL_6))
+    dense[1:DENSE_BYTES:3] = _or(r1.translate(_SHR_2), r2.translate(_AND_15_SHL_4))
+    dense[2:DENSE_BYTES:3] = _or(r2.translate(_SHR_4), r3.translate(_SHL_2))
+    return dense
+
+
+def _max_registers(left: bytes, right: bytes) -> bytes:
+    """
+    Takes the register wise maximum of two unpacked register arrays.
+
+    Both arrays become one big integer with a register per 8 bit lane. Setting
+    the high bit of every lane of left and subtracting right leaves the high bit
+    set exactly where left >= right, without borrowing across lanes since
+    registers fit in 6 bits. That bit is widened into a lane mask which picks
+    each maximum, so the whole merge is a handful of big integer operations.
+    """
+    x = int.from_bytes(left, "little")
+    y = int.from_bytes(right, "little")
+
+    mask = ((((x | _HIGH_BITS) - y) & _HIGH_BITS) >> 7) * 0xFF
+    return ((x & mask) | (y & ~mask)).to_bytes(REGISTERS, "little")
+
+
+def _hash(element: str) -> tuple:
+    """Hashes an element into its register index and the rank of its remaining bits"""
+    value = int.from_bytes(blake2b(element.encode(), digest_size=8).digest(), "little")
+    # The rank is the position of the lowest set bit, a sentinel bit caps it at Q + 1
+    rest = (value >> PRECISION) | (1 << Q)
+    return value & REGISTER_MASK, (rest & -rest).bit_length()
+
+
+def _sigma(x: float) -> float:
+    """Correction for the registers still at zero"""
+    if x == 1.0:
+        return math.inf
+
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if previous == z:
+            return z
+
+
+def _tau(x: float) -> float:
+    """Correction for the registers at their maximum"""
+    if x == 0.0 or x == 1.0:
+        return 0.0
+
+    y = 1.0
+    z = 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if previous == z:
+            return z / 3
+
+
+def _estimate(histogram: List[int]) -> int:
+    """Estimates the cardinality from the number of registers holding each value"""
+    m = REGISTERS
+    z = m * _tau((m - histogram[Q + 1]) / m)
+    for j in range(Q, 0, -1):
+        z += histogram[j]
+        z *= 0.5
+    z += m * _sigma(histogram[0] / m)
+
+    return round(ALPHA_INF * m * m / z)
+
+
+class HyperLogLog:
+    """
+    Cardinality estimator using a fixed amount of memory, with a 0.81% standard error.
+
+    Each element is hashed to one of 16384 registers, which keeps the highest
+    rank of the first set bit seen among the rest of the hashes.
+
+    Small HyperLogLogs use a sparse encoding: a sorted array of 32 bit entries,
+    each packing a register index with its value, so only non-zero registers
+    cost memory. Past sparse_max_bytes it is converted to the dense encoding,
+    the 16384 registers packed 6 bits each into a 12 KB bytearray.
+
+    The estimate is cached until a register changes. Counting and merging
+    work on the whole register array with C level bytes and big integer
+    operations rather than a Python loop over the registers.
+    """
+
+    def __init__(self, sparse_max_bytes: int = DEFAULT_SPARSE_MAX_BYTES) -> None:
+        """
+        Initializes an empty HyperLogLog in the sparse encoding.
+
+        Args:
+            sparse_max_bytes: Size of the sparse entries past which the dense encoding is used
+        """
+        self.sparse_max_bytes = sparse_max_bytes
+        # Sorted (index << REGISTER_BITS | value) entries of the non-zero registers, None once dense
+        self.sparse: Optional[array] = array("I")
+        self.dense: Optional[bytearray] = None
+        self.cached_count: Optional[int] = None
+
+    @property
+    def encoding(self) -> str:
+        """Name of the current encoding"""
+        return "sparse" if self.dense is None else "dense"
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used"""
+        data = self.sparse if self.dense is None else self.dense
+        return sys.getsizeof(self) + sys.getsizeof(data)
+
+    def add(self, element: str) -> bool:
+        """
+        Adds an element.
+
+        Args:
+            element: The element to add
+
+        Returns:
+            True if a register changed, False if the estimate stays the same
+        """
+        index, rank = _hash(element)
+
+        if self.dense is not None:
+            changed = self._set_dense(index, rank)
+        else:
+            changed = self._set_sparse(index, rank)
+
+        if changed:
+            self.cached_count = None
+
+        return changed
+
+    def count(self) -> int:
+        """
+        Estimates the number of distinct elements added.
+
+        Returns:
+            The estimated cardinality, cached until the next change
+        """
+        if self.cached_count is None:
+            self.cached_count = _estimate(self._histogram())
+
+        return self.cached_count
+
+    def registers(self) -> bytes:
+        """Returns the value of every register, one byte each"""
+        if self.dense is not None:
+            return bytes(_unpack(self.dense))
+
+        registers = bytearray(REGISTERS)
+        for entry in self.sparse:
+            registers[entry >> REGISTER_BITS] = entry & REGISTER_MAX
+        return bytes(registers)
+
+    def merge(self, others: List["HyperLogLog"]) -> None:
+        """
+        Merges other HyperLogLogs in, so this one estimates the union.
+
+        Args:
+            others: The HyperLogLogs to merge
+        """
+        if not others:
+            return
+
+        registers = self.registers()
+        for other in others:
+            registers = _max_registers(registers, other.registers())
+
+        self.sparse = None
+        self.dense = _pack(registers)
+        self.cached_count = None
+
+    @staticmethod
+    def count_union(hyperloglogs: List["HyperLogLog"]) -> int:
+        """
+        Estimates the cardinality of the union of several HyperLogLogs, leaving them unchanged.
+
+        Args:
+            hyperloglogs: The HyperLogLogs to combine
+
+        Returns:
+            The estimated cardinality of the union
+        """
+        if len(hyperloglogs) == 1:
+            return hyperloglogs[0].count()
+
+        merged = HyperLogLog()
+        merged.merge(hyperloglogs)
+        return merged.count()
+
+    def _histogram(self) -> List[int]:
+        """Counts the registers holding each possible value"""
+        if self.dense is not None:
+            registers = _unpack(self.dense)
+            return [registers.count(value) for value in range(Q + 2)]
+
+        histogram = [0] * (Q + 2)
+        histogram[0] = REGISTERS - len(self.sparse)
+        for entry in self.sparse:
+            histogram[entry & REGISTER_MAX] += 1
+        return histogram
+
+    def _set_sparse(self, index: int, rank: int) -> bool:
+        """Raises a register in the sparse entries"""
+        entries = self.sparse
+        key = index << REGISTER_BITS
+        position = bisect_left(entries, key)
+
+        if position < len(entries) and entries[position] >> REGISTER_BITS == index:
+            if entries[position] & REGISTER_MAX >= rank:
+                return False
+            entries[position] = key | rank
+            return True
+
+        entries.insert(position, key | rank)
+        if entries.itemsize * len(entries) > self.sparse_max_bytes:
+            self.dense = _pack(self.registers())
+            self.sparse = None
+
+        return True
+
+    def _set_dense(self, index: int, rank: int) -> bool:
+        """Raises a register in the packed dense registers"""
+        dense = self.dense
+        offset = index * REGISTER_BITS
+        byte, shift = offset >> 3, offset & 7
+        word = dense[byte] | (dense[byte + 1] << 8)
+
+        if (word >> shift) & REGISTER_MAX >= rank:
+            return False
+
+        word = (word & ~(REGISTER_MAX << shift)) | (rank << shift)
+        dense[byte] = word & 0xFF
+        dense[byte + 1] = word >> 8
+        return True
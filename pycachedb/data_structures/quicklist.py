@@ -0,0 +1,321 @@
+import marshal
+import sys
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Maximum number of elements per chunk
+DEFAULT_CHUNK_SIZE = 128
+
+# Fixed bytes of a chunk: the node object and its item list header
+CHUNK_OVERHEAD = 120
+
+# Chunks whose elements take fewer bytes than this are not worth compressing
+MIN_COMPRESS_BYTES = 256
+
+
+class QuickListNode:
+
+    __slots__ = ("prev", "next", "items", "compressed", "count", "size")
+
+    def __init__(self, items: List[Any]) -> None:
+        """
+        Initializes a chunk of elements.
+
+        Args:
+            items: The elements of the chunk, in order
+        """
+        self.prev: Optional["QuickListNode"] = None
+        self.next: Optional["QuickListNode"] = None
+        self.items = items
+        # Compressed form of items while the chunk sits in the interior, None otherwise
+        self.compressed: Optional[bytes] = None
+        self.count = len(items)
+        # Bytes of the elements, the compressed length while compressed
+        self.size = sum(map(sys.getsizeof, items))
+
+    def elements(self) -> List[Any]:
+        """Returns the elements of the chunk, decompressing a copy if needed"""
+        if self.compressed is None:
+            return self.items
+
+        return marshal.loads(zlib.decompress(self.compressed))
+
+
+class QuickList:
+    """
+    List stored as a doubly linked list of chunks holding up to chunk_size elements.
+
+    Pushing and popping touch only the end chunk, so they are O(1) amortized,
+    and a list costs one pointer per element plus one node per chunk instead of
+    one node per element. Index and range lookups skip whole chunks by their
+    element count before looking inside one.
+
+    With a compress_depth, the chunks further than that many chunks from both
+    ends are stored compressed. Queues only touch their ends, so the interior
+    of a long list is rarely read and mostly costs its compressed size.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, compress_depth: int = 0) -> None:
+        """
+        Initializes an empty list.
+
+        Args:
+            chunk_size: Maximum number of elements per chunk
+            compress_depth: Number of chunks at each end kept uncompressed, 0 disables compression
+        """
+        self.chunk_size = chunk_size
+        self.compress_depth = compress_depth
+        self.head: Optional[QuickListNode] = None
+        self.tail: Optional[QuickListNode] = None
+        self.length = 0
+        self.node_count = 0
+        # Bytes of the elements of every chunk, compressed chunks count their compressed length
+        self.element_bytes = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[Any]:
+        node = self.head
+        while node is not None:
+            yield from node.elements()
+            node = node.next
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used, maintained on every change so it is O(1)"""
+        return sys.getsizeof(self) + self.node_count * CHUNK_OVERHEAD + self.length * 8 + self.element_bytes
+
+    def push_left(self, value: Any) -> None:
+        """
+        Adds an element at the head.
+
+        Args:
+            value: The element to add
+        """
+        node = self.head
+
+        if node is None or node.count >= self.chunk_size:
+            node = QuickListNode([value])
+            node.next = self.head
+            if self.head is not None:
+                self.head.prev = node
+            else:
+                self.tail = node
+            self.head = node
+            self._node_added(node)
+        else:
+            node.items.insert(0, value)
+            node.count += 1
+            self._grow(node, value)
+
+        self.length += 1
+
+    def push_right(self, value: Any) -> None:
+        """
+        Adds an element at the tail.
+
+        Args:
+            value: The element to add
+        """
+        node = self.tail
+
+        if node is None or node.count >= self.chunk_size:
+            node = QuickListNode([value])
+            node.prev = self.tail
+            if self.tail is not None:
+                self.tail.next = node
+            else:
+                self.head = node
+            self.tail = node
+            self._node_added(node)
+        else:
+            node.items.append(value)
+            node.count += 1
+            self._grow(node, value)
+
+        self.length += 1
+
+    def pop_left(self) -> Optional[Any]:
+        """
+        Removes and returns the element at the head.
+
+        Returns:
+            The element, or None if the list is empty
+        """
+        node = self.head
+        if node is None:
+            return None
+
+        value = node.items.pop(0)
+        self._shrink(node, value)
+        return value
+
+    def pop_right(self) -> Optional[Any]:
+        """
+        Removes and returns the element at the tail.
+
+        Returns:
+            The element, or None if the list is empty
+        """
+        node = self.tail
+        if node is None:
+            return None
+
+        value = node.items.pop()
+        self._shrink(node, value)
+        return value
+
+    def index(self, index: int) -> Optional[Any]:
+        """
+        Fetches the element at an index, negative indexes count from the tail.
+
+        Args:
+            index: Position of the element
+
+        Returns:
+            The element, or None if the index is out of range
+        """
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            return None
+
+        node, offset = self._locate(index)
+        return node.elements()[offset]
+
+    def range(self, start: int, stop: int) -> List[Any]:
+        """
+        Returns the elements between two indexes, both inclusive.
+
+        Negative indexes count from the tail, as in Python slicing.
+
+        Args:
+            start: First index to return
+            stop: Last index to return
+
+        Returns:
+            The elements, in order
+        """
+        size = self.length
+        if start < 0:
+            start = max(start + size, 0)
+        if stop < 0:
+            stop += size
+        if stop >= size:
+            stop = size - 1
+
+        if start > stop:
+            return []
+
+        node, offset = self._locate(start)
+        remaining = stop - start + 1
+        result: List[Any] = []
+
+        while remaining > 0:
+            chunk = node.elements()[offset:offset + remaining]
+            result.extend(chunk)
+            remaining -= len(chunk)
+            node = node.next
+            offset = 0
+
+        return result
+
+    def _locate(self, index: int) -> Tuple[QuickListNode, int]:
+        """Finds the chunk holding a valid index and the offset inside it, walking from the nearer end"""
+        if index < self.length // 2:
+            node = self.head
+            while index >= node.count:
+                index -= node.count
+                node = node.next
+            return node, index
+
+        index = self.length - 1 - index
+        node = self.tail
+        while index >= node.count:
+            index -= node.count
+            node = node.prev
+        return node, node.count - 1 - index
+
+    def _grow(self, node: QuickListNode, value: Any) -> None:
+        """Accounts for an element added to an end chunk"""
+        size = sys.getsizeof(value)
+        node.size += size
+        self.element_bytes += size
+
+    def _shrink(self, node: QuickListNode, value: Any) -> None:
+        """Accounts for an element removed from an end chunk, unlinking the chunk once it is empty"""
+        size = sys.getsizeof(value)
+        node.count -= 1
+        node.size -= size
+        self.element_bytes -= size
+        self.length -= 1
+
+        if node.count:
+            return
+
+        if node.prev is not None:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+
+        self.node_count -= 1
+        if self.compress_depth:
+            self._update_compression()
+
+    def _node_added(self, node: QuickListNode) -> None:
+        """Accounts for a new end chunk holding one element"""
+        self.node_count += 1
+        self.element_bytes += node.size
+        if self.compress_depth:
+            self._update_compression()
+
+    def _update_compression(self) -> None:
+        """
+        Restores the compression layout after a chunk was added or removed at an end.
+
+        Only the chunks next to the depth boundary can change sides, so this walks
+        compress_depth + 1 chunks from each end.
+        """
+        depth = self.compress_depth
+        if self.node_count <= depth * 2:
+            # Every chunk is within depth of an end, so none stays compressed
+            node = self.head
+            while node is not None:
+                self._decompress(node)
+                node = node.next
+            return
+
+        for node, step in ((self.head, "next"), (self.tail, "prev")):
+            for _ in range(depth):
+                self._decompress(node)
+                node = getattr(node, step)
+            self._compress(node)
+
+    def _compress(self, node: QuickListNode) -> None:
+        """Stores a chunk compressed, unless compressing does not save anything"""
+        if node.compressed is not None or node.size < MIN_COMPRESS_BYTES:
+            return
+
+        compressed = zlib.compress(marshal.dumps(node.items), 1)
+        if len(compressed) >= node.size:
+            return
+
+        self.element_bytes += len(compressed) - node.size
+        node.compressed = compressed
+        node.size = len(compressed)
+        node.items = []
+
+    def _decompress(self, node: QuickListNode) -> None:
+        """Restores the elements of a compressed chunk"""
+        if node.compressed is None:
+            return
+
+        node.items = marshal.loads(zlib.decompress(node.compressed))
+        node.compressed = None
+        size = sum(map(sys.getsizeof, node.items))
+        self.element_bytes += size - node.size
+        node.size = size
@@ -0,0 +1,282 @@
+import random
+from typing import Any, Optional, List, Iterator
+
+# Levels are capped so the head node stays small, 32 levels cover 2^64 elements at p = 1/4
+MAX_LEVEL = 32
+LEVEL_PROBABILITY = 0.25
+
+class SkipListNode:
+
+    __slots__ = ("member", "score", "forward", "span", "backward")
+
+    def __init__(
+        self,
+        level: int,
+        score: float = 0.0,
+        member: Any = None
+    ) -> None:
+        """
+        Initializes a skip list node with the given number of levels.
+
+        Args:
+            level: Number of forward links this node has
+            score: The score used for ordering
+            member: The member stored in the node, ties on score are ordered by member
+        """
+        self.member = member
+        self.score = score
+        # Next node on every level and the number of level 0 steps that link skips
+        self.forward: List[Optional["SkipListNode"]] = [None] * level
+        self.span: List[int] = [0] * level
+        # Previous node on level 0, for reverse traversal
+        self.backward: Optional["SkipListNode"] = None
+
+    def __str__(self) -> str:
+        return f"SkipListNode(member={self.member}, score={self.score})"
+
+
+class SkipList:
+    """
+    Skip list ordered by (score, member) with span counters on every link.
+
+    Each forward link records how many elements it jumps over, so the rank of an
+    element is the sum of the spans crossed while searching for it. This gives
+    O(log n) insert, delete, rank and access by rank, and range scans that walk
+    level 0 from the first element in range.
+    """
+
+    def __init__(self) -> None:
+        self.head = SkipListNode(MAX_LEVEL)
+        self.tail: Optional[SkipListNode] = None
+        self.level = 1
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @staticmethod
+    def _random_level() -> int:
+        """Picks the level of a new node with a geometric distribution"""
+        level = 1
+        while level < MAX_LEVEL and random.random() < LEVEL_PROBABILITY:
+            level += 1
+        return level
+
+    def insert(self, score: float, member: Any) -> SkipListNode:
+        """
+        Inserts a new element, the member must not already be in the list.
+
+        Args:
+            score: The score of the element
+            member: The member to insert
+
+        Returns:
+            The inserted node
+        """
+        update: List[SkipListNode] = [self.head] * MAX_LEVEL
+        rank = [0] * MAX_LEVEL
+        node = self.head
+
+        # Finding the predecessor on every level and the rank of each predecessor
+        for i in range(self.level - 1, -1, -1):
+            rank[i] = 0 if i == self.level - 1 else rank[i + 1]
+            forward = node.forward[i]
+            while forward is not None and (
+                forward.score < score or (forward.score == score and forward.member < member)
+            ):
+                rank[i] += node.span[i]
+                node = forward
+                forward = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                rank[i] = 0
+                update[i] = self.head
+                update[i].span[i] = self.size
+            self.level = level
+
+        new_node = SkipListNode(level, score, member)
+        for i in range(level):
+            new_node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new_node
+
+            # The old link is split in two around the new node
+            new_node.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = (rank[0] - rank[i]) + 1
+
+        # Links above the new node's height now jump over one more element
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+
+        new_node.backward = update[0] if update[0] is not self.head else None
+        if new_node.forward[0] is not None:
+            new_node.forward[0].backward = new_node
+        else:
+            self.tail = new_node
+
+        self.size += 1
+        return new_node
+
+    def delete(self, score: float, member: Any) -> bool:
+        """
+        Deletes the element with the given score and member.
+
+        Args:
+            score: The score of the element
+            member: The member to delete
+
+        Returns:
+            True if the element was found and deleted, False otherwise
+        """
+        update: List[SkipListNode] = [self.head] * MAX_LEVEL
+        node = self.head
+
+        for i in range(self.level - 1, -1, -1):
+            forward = node.forward[i]
+            while forward is not None and (
+                forward.score < score or (forward.score == score and forward.member < member)
+            ):
+                node = forward
+                forward = node.forward[i]
+            update[i] = node
+
+        node = node.forward[0]
+        if node is None or node.score != score or node.member != member:
+            return False
+
+        for i in range(self.level):
+            if update[i].forward[i] is node:
+                update[i].span[i] += node.span[i] - 1
+                update[i].forward[i] = node.forward[i]
+            else:
+                update[i].span[i] -= 1
+
+        if node.forward[0] is not None:
+            node.forward[0].backward = node.backward
+        else:
+            self.tail = node.backward
+
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+
+        self.size -= 1
+        return True
+
+    def get_rank(self, score: float, member: Any) -> Optional[int]:
+        """
+        Finds the zero based rank of an element.
+
+        Args:
+            score: The score of the element
+            member: The member to rank
+
+        Returns:
+            The rank, or None if the element is not in the list
+        """
+        rank = 0
+        node = self.head
+
+        for i in range(self.level - 1, -1, -1):
+            forward = node.forward[i]
+            while forward is not None and (
+                forward.score < score or (forward.score == score and forward.member <= member)
+            ):
+                rank += node.span[i]
+                node = forward
+                forward = node.forward[i]
+
+            if node is not self.head and node.score == score and node.member == member:
+                return rank - 1
+
+        return None
+
+    def get_by_rank(self, rank: int) -> Optional[SkipListNode]:
+        """
+        Finds the element at a zero based rank by following spans.
+
+        Args:
+            rank: The rank to look up
+
+        Returns:
+            The node at that rank, or None if out of range
+        """
+        if rank < 0 or rank >= self.size:
+            return None
+
+        # Spans count from one, the head sits at position zero
+        target = rank + 1
+        traversed = 0
+        node = self.head
+
+        for i in range(self.level - 1, -1, -1):
+            while node.forward[i] is not None and traversed + node.span[i] <= target:
+                traversed += node.span[i]
+                node = node.forward[i]
+
+            if traversed == target:
+                return node
+
+        return None
+
+    def first_in_range(self, min_score: float, exclusive: bool = False) -> Optional[SkipListNode]:
+        """
+        Finds the first element with a score above the lower bound.
+
+        Args:
+            min_score: The lower bound
+            exclusive: Whether elements scoring exactly min_score are excluded
+
+        Returns:
+            The first node in range, or None
+        """
+        node = self.head
+
+        for i in range(self.level - 1, -1, -1):
+            forward = node.forward[i]
+            while forward is not None and (
+                forward.score < min_score or (exclusive and forward.score == min_score)
+            ):
+                node = forward
+                forward = node.forward[i]
+
+        return node.forward[0]
+
+    def last_in_range(self, max_score: float, exclusive: bool = False) -> Optional[SkipListNode]:
+        """
+        Finds the last element with a score below the upper bound.
+
+        Args:
+            max_score: The upper bound
+            exclusive: Whether elements scoring exactly max_score are excluded
+
+        Returns:
+            The last node in range, or None
+        """
+        node = self.head
+
+        for i in range(self.level - 1, -1, -1):
+            forward = node.forward[i]
+            while forward is not None and (
+                forward.score < max_score or (not exclusive and forward.score == max_score)
+            ):
+                node = forward
+                forward = node.forward[i]
+
+        return node if node is not self.head else None
+
+    def iterate_from(self, node: Optional[SkipListNode], reverse: bool = False) -> Iterator[SkipListNode]:
+        """
+        Walks level 0 starting at node.
+
+        Args:
+            node: The node to start from, included in the output
+            reverse: Follow backward links instead of forward links
+
+        Returns:
+            Generator of nodes
+        """
+        while node is not None:
+            yield node
+            node = node.backward if reverse else node.forward[0]
@@ -0,0 +1,478 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Optional, List, Tuple, Iterator, Iterable
+
+from pycachedb.data_structures.binary_tree import merge_sorted
+
+class SortedList:
+    """
+    Ordered key-value index stored as a list of sorted, bounded-size chunks.
+
+    Keys live in plain Python lists of at most 2 * load entries, with a parallel list
+    of values per chunk and a list holding the largest key of every chunk. A lookup is
+    two bisects over contiguous lists instead of a pointer chase per comparison, and an
+    insert only shifts one small chunk. Range queries slice whole chunks at C speed.
+
+    Offers the same API as BinaryTree so the two can be swapped as ordered indexes.
+    """
+
+    def __init__(self, load: int = 1000) -> None:
+        """
+        Initializes an empty sorted list.
+
+        Args:
+            load: Target chunk length, chunks are split at twice this size
+        """
+        self.load = load
+        self.size = 0
+        # Sorted chunks of keys and the values stored alongside them
+        self._keys: List[List[Any]] = []
+        self._values: List[List[Any]] = []
+        # Largest key of every chunk, used to pick the chunk for a key
+        self._maxes: List[Any] = []
+        # Number of keys before each chunk, rebuilt lazily after structural changes
+        self._offsets: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, key: Any) -> bool:
+        return self._locate(key) is not None
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the keys in ascending order"""
+        for chunk in self._keys:
+            yield from chunk
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[Tuple[Any, Any]], load: int = 1000) -> "SortedList":
+        """
+        Builds a sorted list from key-value pairs in linear time.
+
+        The pairs are cut into full chunks without any key comparisons, so they must
+        already be in strictly ascending key order.
+
+        Args:
+            items: (key, value) tuples sorted by key with no duplicates
+            load: Target chunk length
+
+        Returns:
+            A new SortedList holding the pairs
+        """
+        index = cls(load)
+        index._build(list(items))
+        return index
+
+    def _build(self, items: List[Tuple[Any, Any]]) -> None:
+        """
+        Replaces the contents of the list with chunks cut from sorted pairs.
+
+        Args:
+            items: (key, value) tuples sorted by key with no duplicates
+        """
+        self.clear()
+
+        if not items:
+            return
+
+        keys, values = map(list, zip(*items))
+        for start in range(0, len(keys), self.load):
+            self._keys.append(keys[start:start + self.load])
+            self._values.append(values[start:start + self.load])
+            self._maxes.append(self._keys[-1][-1])
+
+        self.size = len(keys)
+
+    def merge(self, other: "SortedList") -> None:
+        """
+        Merges another sorted list into this one in O(n + m).
+
+        Args:
+            other: The list to merge in, values from it win on equal keys
+        """
+        self._build(merge_sorted(self.range(), other.range()))
+
+    def _locate(self, key: Any) -> Optional[Tuple[int, int]]:
+        """
+        Finds the chunk and position holding key.
+
+        Args:
+            key: The key to search for
+
+        Returns:
+            A (chunk index, position) tuple, or None if the key is absent
+        """
+        maxes = self._maxes
+        chunk_index = bisect_left(maxes, key)
+
+        if chunk_index == len(maxes):
+            return None
+
+        chunk = self._keys[chunk_index]
+        position = bisect_left(chunk, key)
+
+        if chunk[position] == key:
+            return chunk_index, position
+
+        return None
+
+    def insert(self, key: Any, value: Any) -> None:
+        """
+        Inserting a key-value pair, updating the value if the key exists.
+
+        Args:
+            key: The key to insert
+            value: The value to associate with the key
+        """
+        maxes = self._maxes
+
+        if not maxes:
+            self._keys.append([key])
+            self._values.append([value])
+            maxes.append(key)
+            self.size = 1
+            self._offsets = None
+            return
+
+        chunk_index = bisect_left(maxes, key)
+
+        if chunk_index == len(maxes):
+            # Larger than every key, goes to the end of the last chunk
+            chunk_index -= 1
+            self._keys[chunk_index].append(key)
+            self._values[chunk_index].append(value)
+            maxes[chunk_index] = key
+        else:
+            chunk = self._keys[chunk_index]
+            position = bisect_left(chunk, key)
+
+            if chunk[position] == key:
+                self._values[chunk_index][position] = value
+                return
+
+            chunk.insert(position, key)
+            self._values[chunk_index].insert(position, value)
+
+        self.size += 1
+        self._offsets = None
+
+        if len(self._keys[chunk_index]) > 2 * self.load:
+            self._split(chunk_index)
+
+    def _split(self, chunk_index: int) -> None:
+        """
+        Splits an oversized chunk into two halves.
+
+        Args:
+            chunk_index: Index of the chunk to split
+        """
+        keys = self._keys[chunk_index]
+        values = self._values[chunk_index]
+        half = len(keys) >> 1
+
+        self._keys.insert(chunk_index + 1, keys[half:])
+        self._values.insert(chunk_index + 1, values[half:])
+        del keys[half:]
+        del values[half:]
+
+        self._maxes[chunk_index] = keys[-1]
+        self._maxes.insert(chunk_index + 1, self._keys[chunk_index + 1][-1])
+
+    def search(self, key: Any) -> Optional[Any]:
+        """
+        Searches for a value by its key.
+
+        Args:
+            key: The key to search for
+
+        Returns:
+            The value associated with the key, or None if not found
+        """
+        location = self._locate(key)
+
+        if location is None:
+            return None
+
+        return self._values[location[0]][location[1]]
+
+    def delete(self, key: Any) -> bool:
+        """
+        Deletes the given key.
+
+        Args:
+            key: The key to delete
+
+        Returns:
+            True if the key was found and deleted, False otherwise
+        """
+        location = self._locate(key)
+
+        if location is None:
+            return False
+
+        chunk_index, position = location
+        keys = self._keys[chunk_index]
+        del keys[position]
+        del self._values[chunk_index][position]
+
+        self.size -= 1
+        self._offsets = None
+
+        if not keys:
+            del self._keys[chunk_index]
+            del self._values[chunk_index]
+            del self._maxes[chunk_index]
+            return True
+
+        self._maxes[chunk_index] = keys[-1]
+
+        # Merging undersized chunks into their neighbour keeps the chunk count bounded
+        if len(keys) < self.load >> 1 and len(self._keys) > 1:
+            left = chunk_index - 1 if chunk_index > 0 else chunk_index
+            self._keys[left].extend(self._keys.pop(left + 1))
+            self._values[left].extend(self._values.pop(left + 1))
+            del self._maxes[left]
+            self._maxes[left] = self._keys[left][-1]
+
+            if len(self._keys[left]) > 2 * self.load:
+                self._split(left)
+
+        return True
+
+    def range(
+        self,
+        lo: Optional[Any] = None,
+        hi: Optional[Any] = None,
+        reverse: bool = False
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        Lazily yields the key-value pairs with lo <= key <= hi in key order.
+
+        Args:
+            lo: Inclusive lower bound, None for unbounded
+            hi: Inclusive upper bound, None for unbounded
+            reverse: Yield in descending order when True
+
+        Returns:
+            Generator of (key, value) tuples
+        """
+        first, start, last, stop = self._bounds(lo, hi)
+        if first > last:
+            return
+
+        chunks = range(last, first - 1, -1) if reverse else range(first, last + 1)
+
+        for chunk_index in chunks:
+            begin = start if chunk_index == first else 0
+            end = stop if chunk_index == last else len(self._keys[chunk_index])
+
+            pairs = zip(self._keys[chunk_index][begin:end], self._values[chunk_index][begin:end])
+            if reverse:
+                pairs = reversed(list(pairs))
+            yield from pairs
+
+    def bulk_range(
+        self,
+        lo: Optional[Any] = None,
+        hi: Optional[Any] = None
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        Materializes the keys and values with lo <= key <= hi using list slicing.
+
+        Every chunk inside the range is copied with a single slice, which is much faster
+        than stepping through the pairs one by one when the whole result is needed.
+
+        Args:
+            lo: Inclusive lower bound, None for unbounded
+            hi: Inclusive upper bound, None for unbounded
+
+        Returns:
+            A tuple of (keys, values) lists in ascending key order
+        """
+        first, start, last, stop = self._bounds(lo, hi)
+        keys: List[Any] = []
+        values: List[Any] = []
+
+        if first > last:
+            return keys, values
+
+        if first == last:
+            return self._keys[first][start:stop], self._values[first][start:stop]
+
+        keys.extend(self._keys[first][start:])
+        values.extend(self._values[first][start:])
+        for chunk_index in range(first + 1, last):
+            keys.extend(self._keys[chunk_index])
+            values.extend(self._values[chunk_index])
+        keys.extend(self._keys[last][:stop])
+        values.extend(self._values[last][:stop])
+
+        return keys, values
+
+    def _bounds(self, lo: Optional[Any], hi: Optional[Any]) -> Tuple[int, int, int, int]:
+        """
+        Translates inclusive key bounds into chunk positions.
+
+        Args:
+            lo: Inclusive lower bound, None for unbounded
+            hi: Inclusive upper bound, None for unbounded
+
+        Returns:
+            (first chunk, start position, last chunk, stop position), with the stop
+            position exclusive and first > last when the range is empty
+        """
+        maxes = self._maxes
+        if not maxes:
+            return 0, 0, -1, 0
+
+        if lo is None:
+            first, start = 0, 0
+        else:
+            first = bisect_left(maxes, lo)
+            if first == len(maxes):
+                return 0, 0, -1, 0
+            start = bisect_left(self._keys[first], lo)
+
+        if hi is None:
+            last = len(maxes) - 1
+            stop = len(self._keys[last])
+        else:
+            last = bisect_right(maxes, hi)
+            if last == len(maxes):
+                last -= 1
+            stop = bisect_right(self._keys[last], hi)
+            if stop == 0:
+                # Every key of this chunk is above hi, the range ends in the previous one
+                last -= 1
+                stop = len(self._keys[last]) if last >= 0 else 0
+
+        if first == last and start >= stop:
+            return 0, 0, -1, 0
+
+        return first, start, last, stop
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        """Yields all key-value pairs in ascending key order"""
+        return self.range()
+
+    def min(self) -> Optional[Tuple[Any, Any]]:
+        """
+        Returns the smallest key-value pair, or None if the list is empty
+        """
+        if not self._keys:
+            return None
+
+        return self._keys[0][0], self._values[0][0]
+
+    def max(self) -> Optional[Tuple[Any, Any]]:
+        """
+        Returns the largest key-value pair, or None if the list is empty
+        """
+        if not self._keys:
+            return None
+
+        return self._keys[-1][-1], self._values[-1][-1]
+
+    def floor(self, key: Any) -> Optional[Tuple[Any, Any]]:
+        """
+        Finds the largest key less than or equal to key.
+
+        Args:
+            key: The key to search for
+
+        Returns:
+            The matching (key, value) tuple, or None if every key is greater
+        """
+        chunk_index = bisect_right(self._maxes, key)
+
+        if chunk_index < len(self._maxes):
+            position = bisect_right(self._keys[chunk_index], key)
+            if position > 0:
+                return self._keys[chunk_index][position - 1], self._values[chunk_index][position - 1]
+
+        # The floor is the last key of the previous chunk
+        if chunk_index == 0:
+            return None
+
+        return self._keys[chunk_index - 1][-1], self._values[chunk_index - 1][-1]
+
+    def ceiling(self, key: Any) -> Optional[Tuple[Any, Any]]:
+        """
+        Finds the smallest key greater than or equal to key.
+
+        Args:
+            key: The key to search for
+
+        Returns:
+            The matching (key, value) tuple, or None if every key is smaller
+        """
+        chunk_index = bisect_left(self._maxes, key)
+
+        if chunk_index == len(self._maxes):
+            return None
+
+        position = bisect_left(self._keys[chunk_index], key)
+        return self._keys[chunk_index][position], self._values[chunk_index][position]
+
+    def _chunk_offsets(self) -> List[int]:
+        """Returns the number of keys stored before every chunk"""
+        if self._offsets is None:
+            offsets = []
+            total = 0
+            for chunk in self._keys:
+                offsets.append(total)
+                total += len(chunk)
+            self._offsets = offsets
+
+        return self._offsets
+
+    def rank(self, key: Any) -> int:
+        """
+        Counts the keys strictly smaller than key.
+
+        Args:
+            key: The key to rank, it does not need to be present
+
+        Returns:
+            The number of keys smaller than key
+        """
+        chunk_index = bisect_left(self._maxes, key)
+
+        if chunk_index == len(self._maxes):
+            return self.size
+
+        return self._chunk_offsets()[chunk_index] + bisect_left(self._keys[chunk_index], key)
+
+    def select(self, index: int) -> Tuple[Any, Any]:
+        """
+        Finds the key-value pair at the given position in key order.
+
+        Args:
+            index: Zero based position, negative values count from the end
+
+        Returns:
+            The (key, value) tuple at that position
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        if index < 0:
+            index += self.size
+
+        if index < 0 or index >= self.size:
+            raise IndexError("SortedList index out of range")
+
+        offsets = self._chunk_offsets()
+        chunk_index = bisect_right(offsets, index) - 1
+        position = index - offsets[chunk_index]
+
+        return self._keys[chunk_index][position], self._values[chunk_index][position]
+
+    def clear(self) -> None:
+        """
+        Clear the list.
+        """
+        self._keys = []
+        self._values = []
+        self._maxes = []
+        self._offsets = None
+        self.size = 0
@@ -0,0 +1,226 @@
+import sys
+from typing import Any, Dict, Optional, List, Tuple
+
+from pycachedb.data_structures.skip_list import SkipList
+
+# Approximate bytes per member: a skip list node with its link lists, the score and a short member name
+MEMBER_SIZE = 256
+
+class SortedSet:
+    """
+    Set of unique members ordered by a floating point score.
+
+    A dict maps every member to its score for O(1) lookups, and a skip list with
+    span counters keeps the (score, member) order for O(log n) rank queries and
+    O(log n + m) range scans.
+    """
+
+    def __init__(self) -> None:
+        self.scores: Dict[Any, float] = {}
+        self.skip_list = SkipList()
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __contains__(self, member: Any) -> bool:
+        return member in self.scores
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used from the number of members, so it stays O(1)"""
+        return sys.getsizeof(self.scores) + len(self.scores) * MEMBER_SIZE
+
+    def add(self, member: Any, score: float) -> bool:
+        """
+        Adds a member or updates its score.
+
+        Args:
+            member: The member to add
+            score: The score of the member
+
+        Returns:
+            True if the member was added, False if it already existed
+        """
+        current = self.scores.get(member)
+
+        if current is not None:
+            if current != score:
+                # Changing the score moves the member, so it is re-inserted in order
+                self.skip_list.delete(current, member)
+                self.skip_list.insert(score, member)
+                self.scores[member] = score
+            return False
+
+        self.skip_list.insert(score, member)
+        self.scores[member] = score
+        return True
+
+    def increment(self, member: Any, amount: float) -> float:
+        """
+        Increments the score of a member, adding it with a score of zero if missing.
+
+        Args:
+            member: The member to update
+            amount: The value added to the score
+
+        Returns:
+            The new score
+        """
+        score = self.scores.get(member, 0.0) + amount
+        self.add(member, score)
+        return score
+
+    def remove(self, member: Any) -> bool:
+        """
+        Removes a member.
+
+        Args:
+            member: The member to remove
+
+        Returns:
+            True if the member was found and removed, False otherwise
+        """
+        score = self.scores.pop(member, None)
+
+        if score is None:
+            return False
+
+        self.skip_list.delete(score, member)
+        return True
+
+    def score(self, member: Any) -> Optional[float]:
+        """Returns the score of a member, or None if it is not in the set"""
+        return self.scores.get(member)
+
+    def rank(self, member: Any, reverse: bool = False) -> Optional[int]:
+        """
+        Finds the zero based position of a member in score order.
+
+        Args:
+            member: The member to rank
+            reverse: Rank from the highest score instead of the lowest
+
+        Returns:
+            The rank, or None if the member is not in the set
+        """
+        score = self.scores.get(member)
+
+        if score is None:
+            return None
+
+        rank = self.skip_list.get_rank(score, member)
+        return len(self.scores) - 1 - rank if reverse else rank
+
+    def range(self, start: int, stop: int, reverse: bool = False) -> List[Tuple[Any, float]]:
+        """
+        Returns the members between two ranks, both inclusive.
+
+        Negative ranks count from the end, as in Python slicing.
+
+        Args:
+            start: First rank to return
+            stop: Last rank to return
+            reverse: Order by descending score
+
+        Returns:
+            List of (member, score) tuples
+        """
+        size = len(self.scores)
+        if start < 0:
+            start = max(start + size, 0)
+        if stop < 0:
+            stop += size
+        if stop >= size:
+            stop = size - 1
+
+        if start > stop:
+            return []
+
+        # Finding the first node by span and walking level 0 from there
+        first_rank = size - 1 - start if reverse else start
+        node = self.skip_list.get_by_rank(first_rank)
+
+        result = []
+        for node in self.skip_list.iterate_from(node, reverse):
+            result.append((node.member, node.score))
+            if len(result) > stop - start:
+                break
+
+        return result
+
+    def range_by_score(
+        self,
+        min_score: float,
+        max_score: float,
+        min_exclusive: bool = False,
+        max_exclusive: bool = False,
+        reverse: bool = False,
+        offset: int = 0,
+        count: Optional[int] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Returns the members with a score between two bounds.
+
+        Args:
+            min_score: The lower bound
+            max_score: The upper bound
+            min_exclusive: Whether members scoring exactly min_score are excluded
+            max_exclusive: Whether members scoring exactly max_score are excluded
+            reverse: Order by descending score
+            offset: Number of matching members to skip
+            count: Maximum number of members to return, None for all
+
+        Returns:
+            List of (member, score) tuples
+        """
+        if reverse:
+            node = self.skip_list.last_in_range(max_score, max_exclusive)
+        else:
+            node = self.skip_list.first_in_range(min_score, min_exclusive)
+
+        result = []
+        for node in self.skip_list.iterate_from(node, reverse):
+            score = node.score
+            if score < min_score or (min_exclusive and score == min_score):
+                break
+            if score > max_score or (max_exclusive and score == max_score):
+                break
+
+            if offset > 0:
+                offset -= 1
+                continue
+
+            if count is not None and len(result) >= count:
+                break
+
+            result.append((node.member, score))
+
+        return result
+
+    def count(
+        self,
+        min_score: float,
+        max_score: float,
+        min_exclusive: bool = False,
+        max_exclusive: bool = False
+    ) -> int:
+        """
+        Counts the members with a score between two bounds in O(log n).
+
+        Args:
+            min_score: The lower bound
+            max_score: The upper bound
+            min_exclusive: Whether members scoring exactly min_score are excluded
+            max_exclusive: Whether members scoring exactly max_score are excluded
+
+        Returns:
+            The number of members in range
+        """
+        first = self.skip_list.first_in_range(min_score, min_exclusive)
+        last = self.skip_list.last_in_range(max_score, max_exclusive)
+
+        if first is None or last is None:
+            return 0
+
+        first_rank = self.skip_list.get_rank(first.score, first.member)
+        last_rank = self.skip_list.get_rank(last.score, last.member)
+        return max(last_rank - first_rank + 1, 0)
@@ -0,0 +1,317 @@
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+from pycachedb.data_structures.binary_tree import BinaryTree
+
+# Maximum number of entries per chunk
+DEFAULT_CHUNK_SIZE = 100
+
+# Fixed bytes of a chunk: the object, its delta arrays, entry list and tree node
+CHUNK_OVERHEAD = 400
+
+# Bytes per entry beyond its values: two deltas, a flag and a list slot
+ENTRY_OVERHEAD = 25
+
+# Largest millisecond time and sequence number of an ID
+ID_PART_MAX = (1 << 64) - 1
+
+# Range of the signed 64 bit deltas, an entry whose ID is further from the master ID starts a new chunk
+DELTA_MIN = -(1 << 63)
+DELTA_MAX = (1 << 63) - 1
+
+StreamID = Tuple[int, int]
+
+
+def parse_id(text: str, default_seq: int = 0) -> Optional[StreamID]:
+    """
+    Parses an ID of the form ms-seq, or just ms.
+
+    Args:
+        text: The ID as given in the query
+        default_seq: Sequence number of an ID given as ms alone
+
+    Returns:
+        The (ms, seq) tuple, or None if the ID is invalid
+    """
+    ms, separator, seq = text.partition("-")
+    if not (ms.isascii() and ms.isdigit()):
+        return None
+    if separator and not (seq.isascii() and seq.isdigit()):
+        return None
+
+    entry_id = (int(ms), int(seq) if separator else default_seq)
+    if entry_id[0] > ID_PART_MAX or entry_id[1] > ID_PART_MAX:
+        return None
+
+    return entry_id
+
+
+def format_id(entry_id: StreamID) -> str:
+    """Formats an ID as ms-seq"""
+    return f"{entry_id[0]}-{entry_id[1]}"
+
+
+def next_id(entry_id: StreamID) -> Optional[StreamID]:
+    """Returns the smallest ID greater than entry_id, None if it is the last possible ID"""
+    ms, seq = entry_id
+    if seq < ID_PART_MAX:
+        return ms, seq + 1
+    if ms < ID_PART_MAX:
+        return ms + 1, 0
+    return None
+
+
+class StreamChunk:
+
+    __slots__ = ("master_id", "fields", "ms_deltas", "seq_deltas", "entries", "shared", "size")
+
+    def __init__(self, master_id: StreamID, fields: Tuple[str, ...]) -> None:
+        """
+        Initializes an empty chunk.
+
+        Args:
+            master_id: ID of the first entry, the IDs of the chunk are stored relative to it
+            fields: Field names of the first entry, shared by the entries with the same fields
+        """
+        self.master_id = master_id
+        self.fields = fields
+        self.ms_deltas = array("q")
+        self.seq_deltas = array("q")
+        # Values of the entries with the shared fields, alternating fields and values for the others
+        self.entries: List[Tuple[str, ...]] = []
+        self.shared = bytearray()
+        # Bytes of the stored entries
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def id_at(self, index: int) -> StreamID:
+        """Decodes the ID of the entry at an index"""
+        ms, seq = self.master_id
+        return ms + self.ms_deltas[index], seq + self.seq_deltas[index]
+
+    def pairs_at(self, index: int) -> List[str]:
+        """Decodes the alternating fields and values of the entry at an index"""
+        entry = self.entries[index]
+        if not self.shared[index]:
+            return list(entry)
+
+        pairs = []
+        for field, value in zip(self.fields, entry):
+            pairs.append(field)
+            pairs.append(value)
+        return pairs
+
+    def position(self, entry_id: StreamID) -> int:
+        """Finds the index of the first entry with an ID >= entry_id"""
+        return bisect_left(range(len(self.entries)), entry_id, key=self.id_at)
+
+    def append(self, entry_id: StreamID, pairs: List[str]) -> int:
+        """
+        Adds an entry at the end, storing only its values if it has the shared fields.
+
+        Returns:
+            The bytes the entry takes
+        """
+        self.ms_deltas.append(entry_id[0] - self.master_id[0])
+        self.seq_deltas.append(entry_id[1] - self.master_id[1])
+
+        fields = tuple(pairs[0::2])
+        shared = fields == self.fields
+        entry = tuple(pairs[1::2]) if shared else tuple(pairs)
+        self.entries.append(entry)
+        self.shared.append(shared)
+
+        size = sys.getsizeof(entry) + sum(map(sys.getsizeof, entry))
+        self.size += size
+        return size
+
+    def fits(self, entry_id: StreamID) -> bool:
+        """Checks whether the ID of an entry can be stored as deltas from the master ID"""
+        return (
+            DELTA_MIN <= entry_id[0] - self.master_id[0] <= DELTA_MAX
+            and DELTA_MIN <= entry_id[1] - self.master_id[1] <= DELTA_MAX
+        )
+
+    def drop_head(self, count: int) -> int:
+        """
+        Removes the first entries, the master ID stays the base of the remaining deltas.
+
+        Returns:
+            The bytes freed
+        """
+        freed = sum(sys.getsizeof(entry) + sum(map(sys.getsizeof, entry)) for entry in self.entries[:count])
+        del self.ms_deltas[:count]
+        del self.seq_deltas[:count]
+        del self.entries[:count]
+        del self.shared[:count]
+        self.size -= freed
+        return freed
+
+
+class Stream:
+    """
+    Append-only log of entries, each made of field-value pairs under an increasing ID.
+
+    IDs are (milliseconds, sequence) pairs. Entries are stored in chunks of up
+    to chunk_size entries: a chunk keeps the ID of its first entry and the IDs
+    of its entries as two arrays of deltas from it, and the field names of its
+    first entry, which later entries with the same fields share instead of
+    storing their own. Event streams usually repeat the same fields, so an
+    entry mostly costs its values.
+
+    The chunks are indexed by their first ID in a BinaryTree, so a range by ID
+    finds its first chunk in O(log n) and then reads m entries in order. Trimming
+    drops whole chunks from the head, only an exact MAXLEN cuts into a chunk.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Initializes an empty stream.
+
+        Args:
+            chunk_size: Maximum number of entries per chunk
+        """
+        self.chunk_size = chunk_size
+        self.index = BinaryTree()
+        self.tail: Optional[StreamChunk] = None
+        self.length = 0
+        # The last ID ever added, kept when entries are trimmed so IDs never go back
+        self.last_id: StreamID = (0, 0)
+        # Bytes of the entries of every chunk
+        self.element_bytes = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def memory_usage(self) -> int:
+        """Estimates the bytes used, maintained on every change so it is O(1)"""
+        return (
+            sys.getsizeof(self)
+            + len(self.index) * CHUNK_OVERHEAD
+            + self.length * ENTRY_OVERHEAD
+            + self.element_bytes
+        )
+
+    def next_id(self, ms: Optional[int] = None) -> Optional[StreamID]:
+        """
+        Generates the ID of a new entry.
+
+        Args:
+            ms: Millisecond part of the ID, the current time by default
+
+        Returns:
+            The ID, or None if no greater ID is possible
+        """
+        if ms is None:
+            ms = max(int(time.time() * 1000), self.last_id[0])
+
+        if ms > self.last_id[0]:
+            return ms, 0
+        if ms == self.last_id[0]:
+            return next_id(self.last_id)
+        return None
+
+    def add(self, entry_id: StreamID, pairs: List[str]) -> None:
+        """
+        Appends an entry.
+
+        Args:
+            entry_id: ID of the entry, greater than every ID added before
+            pairs: Alternating fields and values
+
+        Raises:
+            ValueError: If the ID is not greater than the last ID
+        """
+        if entry_id <= self.last_id:
+            raise ValueError("The ID specified in XADD is equal or smaller than the target stream top item")
+
+        chunk = self.tail
+        if chunk is None or len(chunk) >= self.chunk_size or not chunk.fits(entry_id):
+            chunk = StreamChunk(entry_id, tuple(pairs[0::2]))
+            self.index.insert(entry_id, chunk)
+            self.tail = chunk
+
+        self.element_bytes += chunk.append(entry_id, pairs)
+        self.length += 1
+        self.last_id = entry_id
+
+    def range(
+        self,
+        start: Optional[StreamID] = None,
+        end: Optional[StreamID] = None,
+        count: Optional[int] = None
+    ) -> List[Tuple[StreamID, List[str]]]:
+        """
+        Returns the entries with start <= ID <= end, in ID order.
+
+        Args:
+            start: Inclusive lower bound, None for the first entry
+            end: Inclusive upper bound, None for the last entry
+            count: Maximum number of entries to return, None for no limit
+
+        Returns:
+            List of (ID, alternating fields and values) tuples
+        """
+        result: List[Tuple[StreamID, List[str]]] = []
+        if count is not None and count <= 0:
+            return result
+
+        # The chunk that may hold start is the last one beginning at or before it
+        lo = None
+        if start is not None:
+            floor = self.index.floor(start)
+            lo = floor[0] if floor is not None else None
+
+        for _, chunk in self.index.range(lo, end):
+            i = chunk.position(start) if start is not None else 0
+            size = len(chunk)
+
+            while i < size:
+                entry_id = chunk.id_at(i)
+                if end is not None and entry_id > end:
+                    return result
+                result.append((entry_id, chunk.pairs_at(i)))
+                if count is not None and len(result) >= count:
+                    return result
+                i += 1
+
+        return result
+
+    def trim(self, maxlen: int, approximate: bool = False) -> int:
+        """
+        Removes the oldest entries until at most maxlen remain.
+
+        Args:
+            maxlen: Number of entries to keep
+            approximate: Only drop whole chunks, possibly keeping a few more than maxlen entries
+
+        Returns:
+            The number of entries removed
+        """
+        removed = 0
+
+        while self.length > maxlen:
+            head_id, head = self.index.min()
+            excess = self.length - maxlen
+
+            if len(head) <= excess:
+                self.index.delete(head_id)
+                if head is self.tail:
+                    self.tail = None
+                dropped = len(head)
+                self.element_bytes -= head.size
+            elif approximate:
+                break
+            else:
+                self.element_bytes -= head.drop_head(excess)
+                dropped = excess
+
+            self.length -= dropped
+            removed += dropped
+
+        return removed
@@ -0,0 +1,194 @@
+import math
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Length of one tick in seconds
+DEFAULT_RESOLUTION = 0.01
+
+# Every level has 2 ** SLOT_BITS slots and one slot of a level spans a whole turn of the level below
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 5
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel scheduling the expiry of keys.
+
+    Deadlines are rounded up to ticks. A key is stored at the level of the
+    highest group of SLOT_BITS bits in which its tick differs from the current
+    tick, in the slot given by that group of its tick. Scheduling and
+    cancelling are a couple of hash operations. When the current tick crosses a
+    slot boundary of a level, the keys of that slot are moved down to the
+    levels below, so every key is moved at most LEVELS times before it fires.
+    Stretches of ticks in which the lower levels are empty are skipped in one
+    step, so advancing a mostly idle wheel does not visit every tick.
+
+    Deadlines beyond the turn of the top level are parked in its first slot,
+    which no other key uses, and placed again every time the top level wraps.
+    """
+
+    def __init__(self, resolution: float = DEFAULT_RESOLUTION, start: Optional[float] = None) -> None:
+        """
+        Initializes an empty wheel.
+
+        Args:
+            resolution: Length of a tick in seconds
+            start: Current time, time.monotonic() by default
+        """
+        self.resolution = resolution
+        self.current = int((time.monotonic() if start is None else start) / resolution)
+        self.slots: List[List[Set[Any]]] = [[set() for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.level_sizes = [0] * LEVELS
+        # Mapping from key to its deadline, and to the level and slot holding it
+        self.deadlines: Dict[Any, float] = {}
+        self.locations: Dict[Any, Tuple[int, Set[Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.deadlines
+
+    def get(self, key: Any) -> Optional[float]:
+        """
+        Fetches the deadline of a key.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            The deadline, or None if the key is not scheduled
+        """
+        return self.deadlines.get(key)
+
+    def schedule(self, key: Any, deadline: float) -> None:
+        """
+        Schedules a key to expire at a deadline, replacing its previous deadline.
+
+        Args:
+            key: The key to schedule
+            deadline: Expiry time, on the same clock as advance
+        """
+        if key in self.deadlines:
+            self.cancel(key)
+
+        self.deadlines[key] = deadline
+        self._place(key, math.ceil(deadline / self.resolution))
+
+    def cancel(self, key: Any) -> bool:
+        """
+        Removes a key from the wheel.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key was scheduled, False otherwise
+        """
+        location = self.locations.pop(key, None)
+
+        if location is None:
+            return False
+
+        level, slot = location
+        slot.discard(key)
+        self.level_sizes[level] -= 1
+        del self.deadlines[key]
+        return True
+
+    def advance(self, now: float) -> List[Any]:
+        """
+        Moves the wheel up to a time and removes the keys that expired.
+
+        Args:
+            now: Current time, on the same clock as the deadlines
+
+        Returns:
+            The expired keys
+        """
+        target = int(now / self.resolution)
+        expired: List[Any] = []
+
+        while self.current < target:
+            if not self.deadlines:
+                self.current = target
+                break
+
+            # Jumping to the next tick at which something can happen
+            step = 1
+            for level in range(LEVELS - 1):
+                if self.level_sizes[level]:
+                    break
+                step <<= SLOT_BITS
+            tick = min((self.current // step + 1) * step, target)
+            self.current = tick
+
+            # Moving the keys of the slots whose boundary was crossed down, the highest level first
+            for level in range(LEVELS - 1, 0, -1):
+                if tick & ((1 << (SLOT_BITS * level)) - 1) == 0:
+                    self._cascade(level, (tick >> (SLOT_BITS * level)) & SLOT_MASK)
+
+            slot = self.slots[0][tick & SLOT_MASK]
+            if slot:
+                self.slots[0][tick & SLOT_MASK] = set()
+                self.level_sizes[0] -= len(slot)
+                for key in slot:
+                    del self.locations[key]
+                    del self.deadlines[key]
+                expired.extend(slot)
+
+        return expired
+
+    def clear(self) -> None:
+        """Removes every key"""
+        for level in self.slots:
+            for slot in level:
+                slot.clear()
+        self.level_sizes = [0] * LEVELS
+        self.deadlines.clear()
+        self.locations.clear()
+
+    def _place(self, key: Any, tick: int, cascading: bool = False) -> None:
+        """
+        Stores a key in the slot matching its tick, relative to the current tick.
+
+        Args:
+            key: The key to store
+            tick: The tick it expires at
+            cascading: Whether the key moves down while advance reaches the current tick,
+                which then fires the current level 0 slot, so a key due now goes there
+        """
+        current = self.current
+        if tick <= current and cascading:
+            level, index = 0, current & SLOT_MASK
+        else:
+            if tick <= current:
+                # Overdue keys fire on the next tick
+                tick = current + 1
+
+            level = ((tick ^ current).bit_length() - 1) // SLOT_BITS
+            if level < LEVELS:
+                index = (tick >> (SLOT_BITS * level)) & SLOT_MASK
+            else:
+                # Too far away, parked in the first top level slot, which comes up when the top level wraps
+                level = LEVELS - 1
+                index = 0
+
+        slot = self.slots[level][index]
+        slot.add(key)
+        self.level_sizes[level] += 1
+        self.locations[key] = (level, slot)
+
+    def _cascade(self, level: int, index: int) -> None:
+        """Places the keys of a slot again, relative to the current tick"""
+        slot = self.slots[level][index]
+        if not slot:
+            return
+
+        self.slots[level][index] = set()
+        self.level_sizes[level] -= len(slot)
+        resolution = self.resolution
+        for key in slot:
+            self._place(key, math.ceil(self.deadlines[key] / resolution), cascading=True)
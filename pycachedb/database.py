@@ -0,0 +1,1329 @@
+import math
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple, Iterable, Iterator, Callable, Type
+
+from pycachedb.cache.base import Cache
+from pycachedb.cache.lfu_cache import LFUCache
+from pycachedb.cache.lru_cache import LRUCache
+from pycachedb.data_structures.bitmap import Bitmap
+from pycachedb.data_structures.expiry_index import ExpiryIndex
+from pycachedb.integers import INT64_MAX, INT64_MIN, parse_int
+from pycachedb.memory import IMMUTABLE_TYPES, encode_string, entry_size, format_bytes, shared_integer, value_size
+from pycachedb.query.commands import OOM_ERROR, Command, CommandRegistry, CommandFactory
+from pycachedb.query.parser import Parser, ParseError, PreparedCommand
+from pycachedb.query.scan import KeyIndex, ScanCursors, compile_glob
+from pycachedb.query.stats import CommandStats
+
+# Commands that control a transaction are executed immediately instead of being queued
+TRANSACTION_COMMANDS = frozenset({"MULTI", "EXEC", "DISCARD", "WATCH"})
+
+# Upper bound on consecutive same-command queries grouped into one batched call
+MAX_BATCH_SIZE = 1024
+
+# Keys with a TTL sampled per round of the active expire cycle, another round follows
+# while more than ACTIVE_EXPIRE_THRESHOLD of a sample turned out to be expired
+ACTIVE_EXPIRE_SAMPLE = 20
+ACTIVE_EXPIRE_THRESHOLD = 0.25
+
+# Cache classes tracking the access order for each eviction policy name
+EVICTION_POLICIES: Dict[str, Type[Cache]] = {
+    "LRU": LRUCache,
+    "LFU": LFUCache,
+}
+
+# Eviction policy each maxmemory policy tracks key accesses with, None when it needs no tracking
+MAXMEMORY_POLICIES: Dict[str, Optional[str]] = {
+    "allkeys-lru": "LRU",
+    "allkeys-lfu": "LFU",
+    "volatile-ttl": None,
+    "noeviction": None,
+}
+
+# Keys with a TTL sampled by volatile-ttl, the one closest to expiring is evicted
+MAXMEMORY_SAMPLES = 5
+
+# First characters of the strings that can hold an integer
+INTEGER_START = frozenset("-0123456789")
+
+class PyCacheDB:
+    """
+    In-memory database executing queries written in the custom query language.
+
+    Values live in a dict keyed by name, strings holding an integer are stored
+    as ints, with expiry deadlines kept in a separate
+    compact index so keys without a TTL pay nothing for them. Expired keys are
+    removed lazily when they are accessed, and an active expire cycle samples the
+    index a few times per second so expired keys nobody reads are reclaimed too.
+
+    With an eviction policy, an LRUCache or LFUCache tracks the access order of
+    the keys and picks the key to evict once max_keys is reached. Without one,
+    reads and writes are a single dict operation.
+
+    The estimated size of every key and value is added to used_memory as it is
+    written and removed as it is overwritten or deleted. Once used_memory is
+    over maxmemory, commands that add data first evict keys with the maxmemory
+    policy, or are refused with noeviction.
+
+    Command latency statistics and the slow log are only collected while stats
+    are enabled, otherwise commands run without being timed.
+    """
+
+    def __init__(
+        self,
+        eviction_policy: Optional[str] = None,
+        max_keys: Optional[int] = None,
+        maxmemory: Optional[int] = None,
+        maxmemory_policy: str = "noeviction",
+        list_chunk_size: int = 128,
+        list_compress_depth: int = 0,
+        hash_max_compact_entries: int = 128,
+        hash_max_compact_value: int = 64,
+        set_max_intset_entries: int = 512,
+        hll_sparse_max_bytes: int = 3000,
+        bf_error_rate: float = 0.01,
+        bf_initial_capacity: int = 100,
+        bf_expansion: int = 2,
+        stream_chunk_size: int = 100,
+        active_expire_hz: int = 10,
+        active_expire_budget_ms: float = 1.0,
+        parse_cache_size: int = 1024,
+        stats_enabled: bool = False,
+        slowlog_threshold: int = 10000,
+        slowlog_max_len: int = 128
+    ) -> None:
+        """
+        Initializes an empty database and registers every command.
+
+        Args:
+            eviction_policy: "LRU" or "LFU" to track key accesses for eviction, None for no tracking
+            max_keys: Number of keys kept before the policy evicts one, None for no limit
+            maxmemory: Estimated bytes the keys may use before write commands evict, None for no limit
+            maxmemory_policy: "allkeys-lru", "allkeys-lfu", "volatile-ttl" or "noeviction"
+            list_chunk_size: Maximum number of values per chunk of a list
+            list_compress_depth: Number of chunks at each end of a list kept uncompressed, 0 disables compression
+            hash_max_compact_entries: Number of fields a hash keeps in the compact encoding
+            hash_max_compact_value: Longest field or value a hash keeps in the compact encoding
+            set_max_intset_entries: Number of members a set of integers keeps in the integer encoding
+            hll_sparse_max_bytes: Size of the sparse registers past which a HyperLogLog turns dense
+            bf_error_rate: False positive rate of the Bloom filters BF.ADD creates
+            bf_initial_capacity: Elements the first layer of the Bloom filters BF.ADD creates holds
+            bf_expansion: Capacity ratio between a new layer of a Bloom filter and the previous one
+            stream_chunk_size: Maximum number of entries per chunk of a stream
+            active_expire_hz: Active expire cycles per second, run between commands, 0 disables them
+            active_expire_budget_ms: Maximum time one active expire cycle may take
+            parse_cache_size: Number of parsed queries the parser remembers
+            stats_enabled: Time every command for INFO COMMANDSTATS and SLOWLOG
+            slowlog_threshold: Minimum duration in microseconds for the slow log,
+                0 logs every command and a negative value disables the log
+            slowlog_max_len: Number of slow log entries kept
+
+        Raises:
+            ValueError: If a policy is unknown, the two policies disagree or max_keys is set without a policy
+        """
+        self.data: Dict[str, Any] = {}
+        # Absolute expiry deadlines in seconds of time.monotonic()
+        self.expires = ExpiryIndex()
+
+        # Estimated bytes used by the keyspace, and the accounted size of the keys whose
+        # value can grow in place, the size of the other values is simply recomputed
+        self.used_memory = 0
+        self.sizes: Dict[str, int] = {}
+
+        maxmemory_policy = maxmemory_policy.lower()
+        if maxmemory_policy not in MAXMEMORY_POLICIES:
+            raise ValueError(f"Unknown maxmemory policy '{maxmemory_policy}'")
+
+        tracked_policy = MAXMEMORY_POLICIES[maxmemory_policy] if maxmemory is not None else None
+        if tracked_policy is not None:
+            if eviction_policy is not None and eviction_policy.upper() != tracked_policy:
+                raise ValueError(f"Eviction policy '{eviction_policy}' conflicts with '{maxmemory_policy}'")
+            eviction_policy = tracked_policy
+
+        self.maxmemory = maxmemory
+        self.maxmemory_policy = maxmemory_policy
+
+        self.policy: Optional[Cache] = None
+        if eviction_policy is not None:
+            policy_class = EVICTION_POLICIES.get(eviction_policy.upper())
+            if policy_class is None:
+                raise ValueError(f"Unknown eviction policy '{eviction_policy}'")
+            # The database decides when to evict, so the policy itself never runs full
+            self.policy = policy_class(sys.maxsize)
+        elif max_keys is not None:
+            raise ValueError("max_keys requires an eviction policy")
+
+        self.max_keys = max_keys
+        self.evicted_keys = 0
+
+        self.list_chunk_size = list_chunk_size
+        self.list_compress_depth = list_compress_depth
+        self.hash_max_compact_entries = hash_max_compact_entries
+        self.hash_max_compact_value = hash_max_compact_value
+        self.set_max_intset_entries = set_max_intset_entries
+        self.hll_sparse_max_bytes = hll_sparse_max_bytes
+        self.bf_error_rate = bf_error_rate
+        self.bf_initial_capacity = bf_initial_capacity
+        self.bf_expansion = bf_expansion
+        self.stream_chunk_size = stream_chunk_size
+
+        self.active_expire_interval = 1 / active_expire_hz if active_expire_hz > 0 else None
+        self.active_expire_budget = active_expire_budget_ms / 1000
+        self.next_expire_cycle = 0.0
+        self.expired_keys = 0
+        self.expired_keys_active = 0
+        self.expire_cycle_time_cap_reached = 0
+
+        self.registry = CommandRegistry(self)
+        self.registry.register_all(CommandFactory.create_all_commands())
+        self.parser = Parser(self.registry, parse_cache_size)
+
+        # Commands queued by MULTI with their prepared runners, None when no transaction is open
+        self.transaction_queue: Optional[List[Tuple[Command, List[str], Callable[[List[str]], str]]]] = None
+        # Set when a command failed to queue, EXEC then discards the transaction
+        self.transaction_failed = False
+
+        # Modification counters of the watched keys and their values when WATCH ran.
+        # Only watched keys are counted, so writes cost one empty dict check otherwise.
+        self.key_versions: Dict[str, int] = {}
+        self.watched: Dict[str, int] = {}
+
+        self.stats = CommandStats(slowlog_threshold, slowlog_max_len)
+        self.stats_enabled = stats_enabled
+
+        # Creation order of the keys for SCAN, and the element indexes of the scanned collections
+        self.key_index = KeyIndex(self.data)
+        self.scan_cursors = ScanCursors()
+
+    def execute(self, query: str) -> str:
+        """
+        Executes a single query.
+
+        Args:
+            query: The query to run, e.g. "SET user:1 'John Doe'"
+
+        Returns:
+            The reply of the command as a string
+        """
+        if self.expires:
+            self._maybe_expire_cycle()
+
+        if self.transaction_queue is None and not self.stats_enabled and self.maxmemory is None:
+            return self.parser.execute(query)
+
+        try:
+            command, args = self.parser.parse(query)
+        except ParseError as error:
+            if self.transaction_queue is not None:
+                self.transaction_failed = True
+            return f"ERROR: {error}"
+
+        return self._dispatch(command, args)
+
+    def _dispatch(
+        self,
+        command: Command,
+        args: List[str],
+        runner: Optional[Callable[[List[str]], str]] = None
+    ) -> str:
+        """
+        Executes a parsed command, or queues it while a transaction is open.
+
+        Args:
+            command: The resolved command
+            args: Its arguments
+            runner: The command's prepared runner, if the command was prepared already
+
+        Returns:
+            The reply of the command, or QUEUED
+        """
+        if self.maxmemory is not None and command.write and not self._free_memory():
+            if self.transaction_queue is not None:
+                self.transaction_failed = True
+            return OOM_ERROR
+
+        if self.transaction_queue is None or command.name in TRANSACTION_COMMANDS:
+            if runner is None:
+                runner = command.execute
+            if self.stats_enabled:
+                return self._run_timed(command, args, runner)
+            return runner(args)
+
+        if runner is None:
+            # Queued commands are validated now, so EXEC does not parse their options again
+            runner, error = command.prepare(args, [])
+            if error:
+                self.transaction_failed = True
+                return error
+
+        self.transaction_queue.append((command, args, runner))
+        return "QUEUED"
+
+    def _run_timed(
+        self,
+        command: Command,
+        args: List[str],
+        runner: Callable[[List[str]], str]
+    ) -> str:
+        """
+        Runs a command and records its latency.
+
+        Args:
+            command: The command being run
+            args: Its arguments
+            runner: Callable executing the command, execute or a prepared runner
+
+        Returns:
+            The reply of the command
+        """
+        start = time.perf_counter_ns()
+        reply = runner(args)
+        self.stats.record(command.name, args, time.perf_counter_ns() - start)
+        return reply
+
+    def _run_batch(self, command: Command, batch: List[List[str]]) -> List[str]:
+        """
+        Executes a batch of calls to one command, recording their average latency.
+
+        Args:
+            command: The command being run
+            batch: The argument lists of the calls
+
+        Returns:
+            The reply of every call, in order
+        """
+        if self.maxmemory is not None and command.write:
+            # Memory is checked before every write, so the batch runs one call at a time
+            return [self._dispatch(command, args) for args in batch]
+
+        if not self.stats_enabled:
+            return command.execute_batch(batch)
+
+        start = time.perf_counter_ns()
+        replies = command.execute_batch(batch)
+        self.stats.record(command.name, batch[0], time.perf_counter_ns() - start, len(batch))
+        return replies
+
+    def prepare(self, query: str) -> PreparedCommand:
+        """
+        Prepares a parameterized query for repeated execution.
+
+        Args:
+            query: The query with ? placeholders, e.g. "SET session:? ? EX ?"
+
+        Returns:
+            A handle whose run(*params) executes the command
+
+        Raises:
+            ParseError: If the query or its argument layout is invalid
+        """
+        return self.parser.prepare(query, self._dispatch_prepared)
+
+    def _dispatch_prepared(
+        self,
+        command: Command,
+        args: List[str],
+        runner: Callable[[List[str]], str]
+    ) -> str:
+        """
+        Runs a prepared command, or queues it while a transaction is open.
+
+        Args:
+            command: The resolved command
+            args: The filled in arguments
+            runner: The command's prepared runner
+
+        Returns:
+            The reply of the command, or QUEUED
+        """
+        if self.expires:
+            self._maybe_expire_cycle()
+
+        return self._dispatch(command, args, runner)
+
+    def execute_many(self, queries: Iterable[str]) -> List[str]:
+        """
+        Executes a pipeline of queries.
+
+        Args:
+            queries: The queries to run in order
+
+        Returns:
+            The reply of every query, in order
+        """
+        replies: List[str] = []
+        for chunk in self._chunks(queries):
+            replies.extend(self._execute_parsed(self.parser.parse_many(chunk)))
+        return replies
+
+    def execute_iter(self, queries: Iterable[str]) -> Iterator[str]:
+        """
+        Executes a stream of queries, yielding replies as they become available.
+
+        Queries are consumed a chunk at a time, so a lazy iterable is never read
+        more than one chunk ahead of the replies.
+
+        Args:
+            queries: The queries to run in order, may be a lazy iterable
+
+        Returns:
+            Generator of replies
+        """
+        for chunk in self._chunks(queries):
+            yield from self._execute_parsed(self.parser.parse_many(chunk))
+
+    @staticmethod
+    def _chunks(queries: Iterable[str]) -> Iterator[List[str]]:
+        """Splits queries into lists of at most MAX_BATCH_SIZE"""
+        queries = iter(queries)
+        while True:
+            chunk = list(islice(queries, MAX_BATCH_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+    def _execute_parsed(self, parsed_queries: List[Any]) -> List[str]:
+        """
+        Executes parsed queries, batching runs of the same command.
+
+        Runs of consecutive queries for the same command are handed to the command
+        as one batch, so for example a run of GETs becomes a single multi-get on the
+        keyspace. Replies always come back in query order.
+
+        Args:
+            parsed_queries: Output of Parser.parse_many
+
+        Returns:
+            The reply of every query, in order
+        """
+        replies: List[str] = []
+        batch_command: Optional[Command] = None
+        batch: List[List[str]] = []
+
+        if self.expires:
+            self._maybe_expire_cycle()
+
+        for parsed in parsed_queries:
+            if isinstance(parsed, ParseError):
+                if batch:
+                    replies.extend(self._run_batch(batch_command, batch))
+                    batch = []
+                batch_command = None
+                if self.transaction_queue is not None:
+                    self.transaction_failed = True
+                replies.append(f"ERROR: {parsed}")
+                continue
+
+            command, args = parsed
+
+            if command is batch_command:
+                batch.append(args)
+                continue
+
+            if batch:
+                replies.extend(self._run_batch(batch_command, batch))
+                batch = []
+
+            if self.transaction_queue is not None or command.name in TRANSACTION_COMMANDS:
+                # Transactions change how the following queries run, so no batching here
+                batch_command = None
+                replies.append(self._dispatch(command, args))
+                continue
+
+            batch_command = command
+            batch.append(args)
+
+        if batch:
+            replies.extend(self._run_batch(batch_command, batch))
+
+        return replies
+
+    def _expire_if_needed(self, key: str) -> bool:
+        """
+        Deletes key if its deadline has passed.
+
+        Args:
+            key: The key to check
+
+        Returns:
+            True if the key was expired and removed
+        """
+        deadline = self.expires.get(key)
+
+        if deadline is None or deadline > time.monotonic():
+            return False
+
+        self._remove_expired(key)
+        return True
+
+    def _remove_expired(self, key: str) -> None:
+        """Removes a key whose deadline has passed"""
+        del self.expires[key]
+        value = self.data.pop(key, None)
+        if value is not None:
+            self._unaccount(key, value)
+        if self.policy is not None:
+            self.policy.delete(key)
+        if self.key_versions:
+            self._touch(key)
+        self.expired_keys += 1
+
+    def _maybe_expire_cycle(self) -> None:
+        """Runs the active expire cycle if its interval has passed"""
+        if self.active_expire_interval is not None and time.monotonic() >= self.next_expire_cycle:
+            self.active_expire_cycle()
+
+    def active_expire_cycle(self, budget: Optional[float] = None) -> int:
+        """
+        Reclaims expired keys that are never accessed.
+
+        Samples ACTIVE_EXPIRE_SAMPLE keys with a TTL and removes the expired ones,
+        repeating while more than ACTIVE_EXPIRE_THRESHOLD of a sample was expired,
+        so the work adapts to how many expired keys there are. The cycle stops once
+        the time budget is spent, so it never stalls the commands around it.
+
+        Args:
+            budget: Maximum duration in seconds, None for the configured budget
+
+        Returns:
+            The number of keys removed
+        """
+        start = time.monotonic()
+        stop_at = start + (self.active_expire_budget if budget is None else budget)
+        expires = self.expires
+        removed = 0
+
+        while expires:
+            now = time.monotonic()
+            sample = expires.sample(ACTIVE_EXPIRE_SAMPLE)
+            expired = 0
+
+            for key in sample:
+                if expires[key] <= now:
+                    self._remove_expired(key)
+                    expired += 1
+
+            removed += expired
+
+            if expired <= len(sample) * ACTIVE_EXPIRE_THRESHOLD:
+                break
+
+            if time.monotonic() >= stop_at:
+                self.expire_cycle_time_cap_reached += 1
+                break
+
+        self.expired_keys_active += removed
+        if self.active_expire_interval is not None:
+            self.next_expire_cycle = start + self.active_expire_interval
+
+        return removed
+
+    def _admit(self, key: str) -> None:
+        """
+        Records a write to key with the eviction policy, evicting first if a new key
+        would exceed max_keys.
+
+        Args:
+            key: The key about to be written
+        """
+        policy = self.policy
+
+        if key in policy:
+            policy.get(key)
+            return
+
+        if self.max_keys is not None:
+            while len(self.data) >= self.max_keys and self._evict():
+                pass
+
+        policy.put(key, None)
+
+    def _evict(self) -> bool:
+        """
+        Removes the key chosen by the eviction policy.
+
+        Returns:
+            True if a key was evicted, False if there was nothing to evict
+        """
+        key = self.policy.evict()
+        if key is None:
+            return False
+
+        self._remove_evicted(key)
+        return True
+
+    def _evict_volatile_ttl(self) -> bool:
+        """
+        Removes the key closest to expiring among a sample of the keys with a TTL.
+
+        Returns:
+            True if a key was evicted, False if no key has a TTL
+        """
+        expires = self.expires
+        if not expires:
+            return False
+
+        key = min(expires.sample(MAXMEMORY_SAMPLES), key=expires.__getitem__)
+        if self.policy is not None:
+            self.policy.delete(key)
+
+        self._remove_evicted(key)
+        return True
+
+    def _remove_evicted(self, key: str) -> None:
+        """Removes a key chosen for eviction, the policy has forgotten it already"""
+        value = self.data.pop(key, None)
+        if value is not None:
+            self._unaccount(key, value)
+        if self.expires:
+            self.expires.pop(key, None)
+        if self.key_versions:
+            self._touch(key)
+
+        self.evicted_keys += 1
+
+    def _free_memory(self) -> bool:
+        """
+        Evicts keys with the maxmemory policy until used_memory is within maxmemory.
+
+        Returns:
+            True if memory is within the limit, False if the policy could not free enough
+        """
+        while self.used_memory > self.maxmemory:
+            if self.maxmemory_policy == "noeviction":
+                return False
+
+            if self.maxmemory_policy == "volatile-ttl":
+                evicted = self._evict_volatile_ttl()
+            else:
+                evicted = self._evict()
+
+            if not evicted:
+                return False
+
+        return True
+
+    def has_room(self, size: int) -> bool:
+        """
+        Checks whether a value of size bytes can be stored within maxmemory.
+
+        Under noeviction it has to fit beside the current keys, otherwise the policy
+        can evict them but the value alone still has to fit.
+
+        Args:
+            size: Bytes of the value about to be allocated
+
+        Returns:
+            True if there is no maxmemory or the value fits
+        """
+        if self.maxmemory is None:
+            return True
+
+        if self.maxmemory_policy == "noeviction":
+            return self.used_memory + size <= self.maxmemory
+
+        return size <= self.maxmemory
+
+    def _account(self, key: str, old: Any, value: Any) -> None:
+        """
+        Updates used_memory for a value stored at key.
+
+        Args:
+            key: The key written
+            old: The value it replaces, None for a new key
+            value: The new value
+        """
+        if old is not None:
+            self._unaccount(key, old)
+        else:
+            self.key_index.add(key)
+
+        size = entry_size(key, value)
+        if not isinstance(value, IMMUTABLE_TYPES):
+            self.sizes[key] = size
+        self.used_memory += size
+
+    def _unaccount(self, key: str, value: Any) -> None:
+        """Removes the size of the value stored at key from used_memory"""
+        size = self.sizes.pop(key, None) if self.sizes else None
+        self.used_memory -= entry_size(key, value) if size is None else size
+
+    def _touch(self, key: str) -> None:
+        """Bumps the modification counter of a watched key"""
+        versions = self.key_versions
+        if key in versions:
+            versions[key] += 1
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False
+    ) -> Optional[bool]:
+        """
+        Stores a value, replacing any previous value and TTL.
+
+        Args:
+            key: The key to set
+            value: The value to store
+            ttl: Time to live in seconds, None to keep the key forever
+            nx: Only set the key if it does not exist
+            xx: Only set the key if it already exists
+
+        Returns:
+            True if the value was stored, None if the NX/XX condition was not met
+        """
+        if nx or xx:
+            exists = self.exists(key)
+            if (nx and exists) or (xx and not exists):
+                return None
+
+        if self.policy is not None:
+            self._admit(key)
+
+        # Most strings are ruled out as integers on their first character without a call
+        if type(value) is str and value[:1] in INTEGER_START:
+            value = encode_string(value)
+
+        data = self.data
+        old = data.get(key)
+        data[key] = value
+        self._account(key, old, value)
+
+        if ttl is not None:
+            self.expires[key] = time.monotonic() + ttl
+        elif self.expires:
+            self.expires.pop(key, None)
+
+        if self.key_versions:
+            self._touch(key)
+
+        return True
+
+    def get(self, key: str) -> Any:
+        """
+        Fetches the value stored at key.
+
+        Args:
+            key: The key to fetch
+
+        Returns:
+            The stored value, or None if the key does not exist or has expired
+        """
+        if self.expires and self._expire_if_needed(key):
+            return None
+
+        value = self.data.get(key)
+
+        if value is not None and self.policy is not None:
+            self.policy.get(key)
+
+        return value
+
+    def get_many(self, keys: List[str]) -> List[Any]:
+        """
+        Fetches several keys in one pass.
+
+        Args:
+            keys: The keys to fetch
+
+        Returns:
+            The value of every key, None for missing or expired keys
+        """
+        if not self.expires and self.policy is None:
+            data_get = self.data.get
+            return [data_get(key) for key in keys]
+
+        return [self.get(key) for key in keys]
+
+    def set_many(self, pairs: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Stores several key-value pairs in one pass, clearing their TTLs.
+
+        Args:
+            pairs: (key, value) pairs, later pairs win on duplicate keys
+        """
+        data = self.data
+        expires = self.expires
+        account = self._account
+        admit = self._admit if self.policy is not None else None
+        touch = self._touch if self.key_versions else None
+
+        for key, value in pairs:
+            if admit:
+                admit(key)
+            if type(value) is str and value[:1] in INTEGER_START:
+                value = encode_string(value)
+            old = data.get(key)
+            data[key] = value
+            account(key, old, value)
+            if expires:
+                expires.pop(key, None)
+            if touch:
+                touch(key)
+
+    def increment(self, key: str, amount: int) -> int:
+        """
+        Adds to the integer stored at key, starting from 0 if the key is missing.
+
+        The TTL of the key is kept. Integers are stored as ints, so this is a single
+        addition without parsing or formatting the value.
+
+        Args:
+            key: The key of the counter
+            amount: The value to add, negative to decrement
+
+        Returns:
+            The new value
+
+        Raises:
+            TypeError: If the key holds a data structure
+            ValueError: If the value is not an integer or the result overflows 64 bits
+        """
+        if self.expires:
+            self._expire_if_needed(key)
+
+        data = self.data
+        current = data.get(key)
+
+        if type(current) is int:
+            value = current + amount
+        elif current is None:
+            value = amount
+        elif isinstance(current, IMMUTABLE_TYPES):
+            number = parse_int(str(current))
+            if number is None:
+                raise ValueError("Value is not an integer or out of range")
+            value = number + amount
+        else:
+            raise TypeError("WRONGTYPE")
+
+        if not INT64_MIN <= value <= INT64_MAX:
+            raise ValueError("Increment or decrement would overflow")
+
+        if self.policy is not None:
+            self._admit(key)
+
+        value = shared_integer(value)
+        data[key] = value
+
+        if type(current) is int:
+            # Only the value changes size, the key and entry are unchanged
+            self.used_memory += value_size(value) - value_size(current)
+        else:
+            self._account(key, current, value)
+
+        if self.key_versions:
+            self._touch(key)
+
+        return value
+
+    def increment_float(self, key: str, amount: float) -> str:
+        """
+        Adds a float to the number stored at key, starting from 0 if the key is missing.
+
+        The TTL of the key is kept. The result is stored as its shortest string form,
+        or as an int when it is a whole number.
+
+        Args:
+            key: The key of the number
+            amount: The value to add
+
+        Returns:
+            The new value as a string
+
+        Raises:
+            TypeError: If the key holds a data structure
+            ValueError: If the value is not a number or the result is not finite
+        """
+        if self.expires:
+            self._expire_if_needed(key)
+
+        data = self.data
+        current = data.get(key)
+
+        if current is None:
+            number = 0.0
+        elif isinstance(current, IMMUTABLE_TYPES):
+            try:
+                number = float(current)
+            except ValueError:
+                raise ValueError("Value is not a valid float") from None
+        else:
+            raise TypeError("WRONGTYPE")
+
+        result = number + amount
+        if math.isnan(result) or math.isinf(result):
+            raise ValueError("Increment would produce NaN or Infinity")
+
+        text = str(int(result)) if result.is_integer() else repr(result)
+
+        if self.policy is not None:
+            self._admit(key)
+
+        value = encode_string(text)
+        data[key] = value
+        self._account(key, current, value)
+
+        if self.key_versions:
+            self._touch(key)
+
+        return text
+
+    def set_many_nx(self, pairs: Iterable[Tuple[str, Any]]) -> bool:
+        """
+        Stores several key-value pairs only if none of the keys exists.
+
+        All keys are checked before anything is written, so either every pair is
+        stored or none is.
+
+        Args:
+            pairs: (key, value) pairs
+
+        Returns:
+            True if the pairs were stored, False if any key already existed
+        """
+        pairs = list(pairs)
+
+        if self.exists_many([key for key, _ in pairs]):
+            return False
+
+        self.set_many(pairs)
+        return True
+
+    def delete(self, key: str) -> bool:
+        """
+        Removes a key.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key existed and was removed
+        """
+        if self.expires and self._expire_if_needed(key):
+            return False
+
+        value = self.data.pop(key, None)
+        if value is None:
+            return False
+
+        self._unaccount(key, value)
+        self.expires.pop(key, None)
+        if self.policy is not None:
+            self.policy.delete(key)
+        if self.key_versions:
+            self._touch(key)
+        return True
+
+    def delete_many(self, keys: List[str]) -> int:
+        """
+        Removes several keys in one pass.
+
+        Args:
+            keys: The keys to remove
+
+        Returns:
+            The number of keys that existed and were removed
+        """
+        data = self.data
+        expires = self.expires
+        policy = self.policy
+        touch = self._touch if self.key_versions else None
+        deleted = 0
+
+        for key in keys:
+            if expires and self._expire_if_needed(key):
+                continue
+            value = data.pop(key, None)
+            if value is not None:
+                deleted += 1
+                self._unaccount(key, value)
+                if expires:
+                    expires.pop(key, None)
+                if policy is not None:
+                    policy.delete(key)
+                if touch:
+                    touch(key)
+
+        return deleted
+
+    def exists_many(self, keys: List[str]) -> int:
+        """
+        Counts how many of the keys exist, a key given twice is counted twice.
+
+        Args:
+            keys: The keys to check
+
+        Returns:
+            The number of existing keys
+        """
+        if not self.expires:
+            data = self.data
+            return sum(1 for key in keys if key in data)
+
+        return sum(1 for key in keys if self.exists(key))
+
+    def exists(self, key: str) -> bool:
+        """Checks whether a key exists and has not expired"""
+        if self.expires and self._expire_if_needed(key):
+            return False
+
+        return key in self.data
+
+    def expire(self, key: str, seconds: int) -> bool:
+        """
+        Sets a timeout on a key.
+
+        Args:
+            key: The key to expire
+            seconds: Seconds until the key is removed
+
+        Returns:
+            True if the timeout was set, False if the key does not exist
+        """
+        if not self.exists(key):
+            return False
+
+        self.expires[key] = time.monotonic() + seconds
+        if self.key_versions:
+            self._touch(key)
+        return True
+
+    def ttl(self, key: str) -> int:
+        """
+        Gets the remaining time to live of a key.
+
+        Args:
+            key: The key to check
+
+        Returns:
+            Remaining seconds, -1 if the key has no timeout and -2 if it does not exist
+        """
+        if not self.exists(key):
+            return -2
+
+        deadline = self.expires.get(key)
+        if deadline is None:
+            return -1
+
+        return max(int(round(deadline - time.monotonic())), 0)
+
+    def append(self, key: str, value: str) -> int:
+        """
+        Appends to the string stored at key, creating it if needed.
+
+        Args:
+            key: The key to append to
+            value: The string to append
+
+        Returns:
+            The length of the string after the append, in bytes for a bitmap
+
+        Raises:
+            TypeError: If the key holds a data structure
+        """
+        current = self.get(key)
+
+        if isinstance(current, Bitmap):
+            current.data.extend(value.encode("utf-8", "surrogateescape"))
+            self.signal_modified(key)
+            return len(current)
+
+        if current is not None and not isinstance(current, (str, int, float)):
+            raise TypeError("WRONGTYPE")
+
+        new_value = value if current is None else str(current) + value
+        if current is None and self.policy is not None:
+            self._admit(key)
+        self.data[key] = new_value
+        self._account(key, current, new_value)
+        if self.key_versions:
+            self._touch(key)
+        return len(new_value)
+
+    def bitmap(self, key: str, create: bool = False) -> Optional[Bitmap]:
+        """
+        Fetches the bitmap stored at key, a string is read as the bitmap of its bytes.
+
+        Args:
+            key: The key of the bitmap
+            create: Store an empty bitmap at a missing key and convert a string in place,
+                keeping its TTL, so its bits can be changed
+
+        Returns:
+            The bitmap, or None if the key is missing and create is False
+
+        Raises:
+            TypeError: If the key holds a data structure
+        """
+        current = self.get(key)
+
+        if isinstance(current, Bitmap):
+            return current
+
+        if current is None:
+            if not create:
+                return None
+            value = Bitmap()
+        elif isinstance(current, IMMUTABLE_TYPES):
+            value = Bitmap.from_string(str(current))
+            if not create:
+                return value
+        else:
+            raise TypeError("WRONGTYPE")
+
+        if current is None and self.policy is not None:
+            self._admit(key)
+        self.data[key] = value
+        self._account(key, current, value)
+        if self.key_versions:
+            self._touch(key)
+        return value
+
+    def keys(self, pattern: str) -> List[str]:
+        """
+        Finds all live keys matching a glob pattern.
+
+        Args:
+            pattern: Glob pattern supporting *, ? and [...]
+
+        Returns:
+            List of matching keys
+        """
+        matches = compile_glob(pattern).filter(self.data)
+
+        if not self.expires:
+            return matches
+
+        return [key for key in matches if self.exists(key)]
+
+    def scan(
+        self,
+        cursor: int,
+        pattern: Optional[str] = None,
+        count: int = 10,
+        value_filter: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[int, List[str]]:
+        """
+        Iterates the keyspace a bounded batch at a time.
+
+        Every call looks at count keys, so a call with a pattern may return fewer
+        keys, or none, while the iteration is not yet finished. Keys that exist
+        for the whole iteration are returned exactly once. The cursor is a
+        position in the creation order of the keys, so it holds no state and
+        stays valid however many iterations run at once.
+
+        Args:
+            cursor: 0 to start an iteration, otherwise the cursor returned by the previous call
+            pattern: Glob pattern the keys must match, None for every key
+            count: Number of keys to look at
+            value_filter: Predicate the value of a key must satisfy, e.g. a type check
+
+        Returns:
+            Tuple of (next cursor, keys), the next cursor is 0 once the iteration is done
+
+        Raises:
+            ValueError: If the cursor is not valid
+        """
+        cursor, keys = self.key_index.scan(cursor, count)
+
+        if pattern is not None:
+            keys = compile_glob(pattern).filter(keys)
+
+        if self.expires:
+            keys = [key for key in keys if self.exists(key)]
+
+        if value_filter is not None:
+            data = self.data
+            keys = [key for key in keys if value_filter(data[key])]
+
+        return cursor, keys
+
+    def flushdb(self) -> None:
+        """Removes every key"""
+        self.data.clear()
+        self.expires.clear()
+        self.used_memory = 0
+        self.sizes.clear()
+        self.key_index.clear()
+        self.scan_cursors.clear()
+        if self.policy is not None:
+            self.policy.clear()
+
+        for key in self.key_versions:
+            self.key_versions[key] += 1
+
+    def info(self, section: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Collects statistics about the database.
+
+        Args:
+            section: Only return this section, None for everything
+
+        Returns:
+            Mapping of statistic names to values
+        """
+        sections = {
+            "keyspace": {
+                "keys": len(self.data),
+                "expires": len(self.expires),
+            },
+            "memory": {
+                "used_memory": self.used_memory,
+                "used_memory_human": format_bytes(self.used_memory),
+                "maxmemory": self.maxmemory or 0,
+                "maxmemory_human": format_bytes(self.maxmemory or 0),
+                "maxmemory_policy": self.maxmemory_policy,
+            },
+            "stats": {
+                "expired_keys": self.expired_keys,
+                "expired_keys_active": self.expired_keys_active,
+                "expire_cycle_time_cap_reached": self.expire_cycle_time_cap_reached,
+                "evicted_keys": self.evicted_keys,
+            },
+            "commandstats": self.stats.info(),
+        }
+
+        if section is not None:
+            return dict(sections.get(section.lower(), {}))
+
+        info: Dict[str, Any] = {}
+        for values in sections.values():
+            info.update(values)
+        return info
+
+    def set_stats_enabled(self, enabled: bool) -> None:
+        """
+        Switches command timing on or off, collected statistics are kept.
+
+        Args:
+            enabled: Whether to time every command
+        """
+        self.stats_enabled = enabled
+
+    def signal_modified(self, key: str) -> None:
+        """
+        Notifies the database that the value at key was changed in place.
+
+        Args:
+            key: The key whose value was mutated by a command
+        """
+        size = self.sizes.get(key)
+        if size is not None:
+            new_size = entry_size(key, self.data[key])
+            self.sizes[key] = new_size
+            self.used_memory += new_size - size
+
+        if self.key_versions:
+            self._touch(key)
+
+    def start_transaction(self) -> bool:
+        """
+        Opens a transaction, queueing every following command until EXEC.
+
+        Returns:
+            True if the transaction was opened, False if one is already open
+        """
+        if self.transaction_queue is not None:
+            return False
+
+        self.transaction_queue = []
+        self.transaction_failed = False
+        return True
+
+    def exec_transaction(self) -> Optional[List[str]]:
+        """
+        Executes all queued commands in order, unless a watched key was modified.
+
+        Commands were validated and prepared when they were queued, so only their
+        runners are called here. The watches are released either way.
+
+        Returns:
+            The reply of every queued command, or None if no transaction is open or
+            a watched key was modified since WATCH
+
+        Raises:
+            MemoryError: If the transaction would run, writes and maxmemory is exceeded, nothing is executed
+        """
+        queue = self.transaction_queue
+        if queue is None:
+            return None
+
+        self.transaction_queue = None
+        aborted = self._watched_key_modified()
+        self.unwatch()
+
+        if aborted:
+            return None
+
+        # Memory was only checked as each command was queued, and may have grown since
+        if self.maxmemory is not None and any(command.write for command, _, _ in queue):
+            if not self._free_memory():
+                raise MemoryError(OOM_ERROR)
+
+        if self.stats_enabled:
+            return [self._run_timed(command, args, runner) for command, args, runner in queue]
+
+        return [runner(args) for _, args, runner in queue]
+
+    def discard_transaction(self) -> bool:
+        """
+        Drops all queued commands.
+
+        Returns:
+            True if a transaction was discarded, False if none was open
+        """
+        if self.transaction_queue is None:
+            return False
+
+        self.transaction_queue = None
+        self.unwatch()
+        return True
+
+    def watch(self, keys: List[str]) -> bool:
+        """
+        Watches keys for a check-and-set transaction.
+
+        If any watched key is written, deleted or expires before EXEC, the
+        transaction is aborted.
+
+        Args:
+            keys: The keys to watch
+
+        Returns:
+            True if the keys are watched, False if a transaction is already open
+        """
+        if self.transaction_queue is not None:
+            return False
+
+        for key in keys:
+            if key in self.watched:
+                continue
+            # A key that already expired must not count as modified later
+            if self.expires:
+                self._expire_if_needed(key)
+            self.watched[key] = self.key_versions.setdefault(key, 0)
+
+        return True
+
+    def unwatch(self) -> None:
+        """Forgets every watched key"""
+        self.watched.clear()
+        self.key_versions.clear()
+
+    def _watched_key_modified(self) -> bool:
+        """Checks whether any watched key changed since it was watched"""
+        versions = self.key_versions
+
+        for key, version in self.watched.items():
+            # Expiring between WATCH and EXEC counts as a modification
+            if self.expires:
+                self._expire_if_needed(key)
+            if versions[key] != version:
+                return True
+
+        return False
@@ -0,0 +1,28 @@
+from typing import Optional
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+def parse_int(text: str) -> Optional[int]:
+    """
+    Parses a string that is the canonical form of a 64 bit integer.
+
+    Args:
+        text: The string as given in the query
+
+    Returns:
+        The integer, or None if the string would not read back identically from one
+    """
+    if not text or len(text) > 20:
+        return None
+
+    try:
+        value = int(text)
+    except ValueError:
+        return None
+
+    if not INT64_MIN <= value <= INT64_MAX or str(value) != text:
+        return None
+
+    return value
@@ -0,0 +1,103 @@
+import sys
+from typing import Any
+
+from pycachedb.integers import parse_int
+
+# Bytes a key costs beyond its name and value: its dict slot, hash and bookkeeping
+ENTRY_OVERHEAD = 64
+
+# Values that never change size in place, so their size can be recomputed instead of stored
+IMMUTABLE_TYPES = (str, int, float, bytes)
+
+UNITS = ("B", "K", "M", "G", "T")
+
+# Integers below this are stored as one shared object each, like Python does up to 256
+SHARED_INTEGERS_COUNT = 10000
+SHARED_INTEGERS = tuple(range(SHARED_INTEGERS_COUNT))
+
+
+def shared_integer(number: int) -> int:
+    """Returns the shared object for small integers, number itself otherwise"""
+    if 0 <= number < SHARED_INTEGERS_COUNT:
+        return SHARED_INTEGERS[number]
+
+    return number
+
+
+def encode_string(value: str) -> Any:
+    """
+    Picks the storage form of a string value.
+
+    Strings holding the canonical form of a 64 bit integer are stored as an int,
+    so counters are updated without parsing and formatting, and small ones share
+    a single object. Reading the int back as a string gives the original value.
+
+    Args:
+        value: The string written by a command
+
+    Returns:
+        The int, or value unchanged
+    """
+    # Most strings are rejected on their first character
+    if not value or not (value[0].isdigit() or value[0] == "-"):
+        return value
+
+    number = parse_int(value)
+    if number is None:
+        return value
+
+    return shared_integer(number)
+
+
+def value_size(value: Any) -> int:
+    """
+    Estimates the bytes used by a stored value.
+
+    Data structures report their own estimate through a memory_usage() method,
+    which must run in O(1) since it is called on every write.
+
+    Args:
+        value: The value to measure
+
+    Returns:
+        The estimated size in bytes
+    """
+    value_type = type(value)
+    if value_type is str:
+        return sys.getsizeof(value)
+
+    if value_type is int:
+        # Shared integers cost nothing per key
+        return 0 if 0 <= value < SHARED_INTEGERS_COUNT else sys.getsizeof(value)
+
+    memory_usage = getattr(value, "memory_usage", None)
+    if memory_usage is not None:
+        return memory_usage()
+
+    return sys.getsizeof(value)
+
+
+def entry_size(key: str, value: Any) -> int:
+    """
+    Estimates the bytes used by a key and its value in the keyspace.
+
+    Args:
+        key: The key
+        value: The value stored at key
+
+    Returns:
+        The estimated size in bytes
+    """
+    return ENTRY_OVERHEAD + sys.getsizeof(key) + value_size(value)
+
+
+def format_bytes(size: int) -> str:
+    """Formats a byte count the way INFO does, e.g. 1.50M"""
+    amount = float(size)
+
+    for unit in UNITS[:-1]:
+        if abs(amount) < 1024:
+            return f"{size}B" if unit == "B" else f"{amount:.2f}{unit}"
+        amount /= 1024
+
+    return f"{amount:.2f}{UNITS[-1]}"
@@ -1,12 +1,41 @@
-from typing import List, Dict, Any, Optional, Union, Callable, Type
+import math
+from typing import List, Dict, Any, Optional, Union, Callable, Type, Tuple
 from abc import ABC, abstractmethod
 
+from pycachedb.data_structures.bitmap import BITOP_OPERATIONS, MAX_BIT_OFFSET, Bitmap, bitop
+from pycachedb.data_structures.bloom_filter import BloomFilter, check_parameters
+from pycachedb.data_structures.compact_hash import CompactHash
+from pycachedb.data_structures.compact_set import CompactSet, difference, intersection, union
+from pycachedb.data_structures.hyperloglog import HyperLogLog
+from pycachedb.data_structures.quicklist import QuickList
+from pycachedb.data_structures.sorted_set import SortedSet
+from pycachedb.data_structures.stream import Stream, StreamID, format_id, next_id, parse_id
+from pycachedb.integers import INT64_MAX, INT64_MIN, parse_int
+from pycachedb.query.scan import compile_glob
+
+WRONGTYPE_ERROR = "ERROR: WRONGTYPE Operation against a key holding the wrong kind of value"
+
+OOM_ERROR = "ERROR: OOM command not allowed when used memory > 'maxmemory'"
+
+# Names reported for the value types, anything else is a string
+TYPE_NAMES: Dict[type, str] = {
+    SortedSet: "zset",
+    QuickList: "list",
+    CompactHash: "hash",
+    CompactSet: "set",
+    HyperLogLog: "hyperloglog",
+    BloomFilter: "bloom",
+    Stream: "stream",
+}
+
 class Command(ABC):
 
     name: str = ""
     min_args: int = 0
     max_args: Optional[int] = None
     description: str = ""
+    # Commands that may add data are refused once maxmemory is reached and nothing can be evicted
+    write: bool = False
 
     def __init__(self, db):
         """Initializes with a reference to the database"""
@@ -17,6 +46,47 @@ class Command(ABC):
         """Executes the command with the given arguments"""
         pass
 
+    def execute_batch(self, batch: List[List[str]]) -> List[str]:
+        """
+        Executes the command once per argument list.
+
+        Commands that can resolve a whole batch with a single database call
+        override this, the default simply loops over execute.
+
+        Args:
+            batch: Argument lists of consecutive calls to this command
+
+        Returns:
+            The reply of every call, in order
+        """
+        execute = self.execute
+        return [execute(args) for args in batch]
+
+    def prepare(
+        self,
+        args: List[str],
+        slots: List[int]
+    ) -> Tuple[Optional[Callable[[List[str]], str]], Optional[str]]:
+        """
+        Validates a parameterized argument layout once and returns a runner for it.
+
+        Commands override this to resolve options up front and return a runner
+        that goes straight to the database. The default runner is execute itself.
+
+        Args:
+            args: The template arguments, placeholders hold "?"
+            slots: Indexes in args that are filled in on every run
+
+        Returns:
+            Tuple of (runner, error), the runner takes the filled in argument list
+        """
+        error = self.validate_args(args)
+
+        if error:
+            return None, error
+
+        return self.execute, None
+
     def validate_args(self, args: List[str]) -> Optional[str]:
         """
         Validates the number of arguments.
@@ -35,13 +105,227 @@ class Command(ABC):
         
         return None
 
+    def lookup_typed(
+        self,
+        key: str,
+        value_type: Type,
+        create: bool = False,
+        factory: Optional[Callable[[], Any]] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Fetches the value stored at key, making sure it holds the expected data type.
+
+        Args:
+            key: The key to look up
+            value_type: The class the stored value must be an instance of
+            create: Store a new empty value_type at key when it is missing
+            factory: Builds the new empty value, value_type() by default
+
+        Returns:
+            Tuple of (value, error), value is None if the key is missing and error is
+            the WRONGTYPE message if the key holds another data type
+        """
+        value = self.db.get(key)
+
+        if value is None:
+            if create:
+                value = value_type() if factory is None else factory()
+                self.db.set(key, value)
+            return value, None
+
+        if not isinstance(value, value_type):
+            return None, WRONGTYPE_ERROR
+
+        return value, None
+
+
+# Values a string command reads, bitmaps read back as the string of their bytes
+STRING_TYPES = (str, int, float, Bitmap)
+
+
+def format_value(value: Any) -> str:
+    """Formats a value read by a string command"""
+    if value is None:
+        return "Not Found"
+
+    if not isinstance(value, STRING_TYPES):
+        return WRONGTYPE_ERROR
+
+    return str(value)
+
+
+def format_list(items: List[Any]) -> str:
+    """Formats a multi-value reply as a numbered list"""
+    if not items:
+        return "(empty list)"
+
+    return "\n".join([f"{i+1}) {item}" for i, item in enumerate(items)])
+
+
+def format_score(score: float) -> str:
+    """Formats a sorted set score, dropping the fraction of whole numbers"""
+    if score.is_integer():
+        return str(int(score))
+
+    return repr(score)
+
+
+def format_members(members: List[Tuple[Any, float]], with_scores: bool) -> str:
+    """Formats sorted set members, interleaving the scores when requested"""
+    if not with_scores:
+        return format_list([member for member, _ in members])
+
+    items = []
+    for member, score in members:
+        items.append(member)
+        items.append(format_score(score))
+
+    return format_list(items)
+
+
+def parse_score_bound(bound: str) -> Tuple[float, bool]:
+    """
+    Parses a score range bound such as 5, (5, -inf or +inf.
+
+    Args:
+        bound: The bound as given in the query, a leading ( marks it exclusive
+
+    Returns:
+        Tuple of (score, exclusive)
+
+    Raises:
+        ValueError: If the bound is not a valid float
+    """
+    if bound.startswith("("):
+        return float(bound[1:]), True
+
+    return float(bound), False
+
+
+def type_name(value: Any) -> str:
+    """Returns the name of the data type a value belongs to"""
+    return TYPE_NAMES.get(type(value), "string")
+
+
+def format_scan(cursor: int, items: List[Any]) -> str:
+    """Formats a SCAN reply as the next cursor followed by the nested list of items"""
+    nested = format_list(items).replace("\n", "\n   ")
+    return f"1) {cursor}\n2) {nested}"
+
+
+def format_entries(entries: List[Tuple[StreamID, List[str]]]) -> str:
+    """Formats stream entries as a list of (ID, nested list of fields and values) pairs"""
+    items = []
+    for entry_id, pairs in entries:
+        nested = format_list(pairs).replace("\n", "\n   ")
+        items.append(f"1) {format_id(entry_id)}\n2) {nested}".replace("\n", "\n   "))
+
+    return format_list(items)
+
+
+def parse_scan_options(
+    args: List[str],
+    allow_type: bool = False
+) -> Tuple[int, Optional[str], int, Optional[str], Optional[str]]:
+    """
+    Parses the cursor and the MATCH, COUNT and TYPE options of the SCAN commands.
+
+    Args:
+        args: The cursor followed by the options
+        allow_type: Whether the TYPE option is accepted
+
+    Returns:
+        Tuple of (cursor, pattern, count, type, error)
+    """
+    try:
+        cursor = int(args[0])
+    except ValueError:
+        return 0, None, 0, None, "ERROR: Invalid cursor"
+
+    if cursor < 0:
+        return 0, None, 0, None, "ERROR: Invalid cursor"
+
+    pattern = None
+    count = 10
+    value_type = None
+
+    i = 1
+    while i < len(args):
+        option = args[i].upper()
+        if i + 1 >= len(args):
+            return 0, None, 0, None, f"ERROR: Invalid option '{args[i]}'"
+
+        if option == "MATCH":
+            pattern = args[i+1]
+        elif option == "COUNT":
+            try:
+                count = int(args[i+1])
+            except ValueError:
+                return 0, None, 0, None, "ERROR: COUNT must be an integer"
+            if count < 1:
+                return 0, None, 0, None, "ERROR: COUNT must be positive"
+        elif option == "TYPE" and allow_type:
+            value_type = args[i+1].lower()
+        else:
+            return 0, None, 0, None, f"ERROR: Invalid option '{args[i]}'"
+        i += 2
+
+    # Patterns matching everything are skipped instead of being applied to every key
+    if pattern is not None and compile_glob(pattern).match_all:
+        pattern = None
+
+    return cursor, pattern, count, value_type, None
+
+
+def parse_bit_range(
+    args: List[str],
+    size: int
+) -> Tuple[Optional[Tuple[int, int]], bool, Optional[str]]:
+    """
+    Parses the optional start, end and BYTE|BIT arguments of BITCOUNT and BITPOS.
+
+    Negative indexes count from the end and the range is clipped to the bitmap.
+
+    Args:
+        args: The start, end and unit arguments, each one optional
+        size: Length of the bitmap in bytes
+
+    Returns:
+        Tuple of (range, end_given, error), range is the first and last bit offsets,
+        both inclusive, or None if no bit of the bitmap is in the range
+    """
+    unit = args[2].upper() if len(args) > 2 else "BYTE"
+    if unit not in ("BYTE", "BIT"):
+        return None, False, f"ERROR: Invalid option '{args[2]}'"
+
+    try:
+        start = int(args[0]) if args else 0
+        end = int(args[1]) if len(args) > 1 else -1
+    except ValueError:
+        return None, False, "ERROR: start and end must be integers"
+
+    length = size * 8 if unit == "BIT" else size
+    if start < 0:
+        start = max(start + length, 0)
+    if end < 0:
+        end = max(end + length, 0)
+    end = min(end, length - 1)
+
+    if start > end:
+        return None, len(args) > 1, None
+
+    if unit == "BYTE":
+        start, end = start * 8, end * 8 + 7
+
+    return (start, end), len(args) > 1, None
+
 
 class CommandRegistry:
 
     def __init__(self,db) -> None:
         """Initializes the registry with a database reference"""
         self.db = db
-        self.commands = Dict[str,Command] = {}
+        self.commands: Dict[str,Command] = {}
 
     def register(self, command_class: Type[Command]) -> None:
         """Registers the command class"""
@@ -69,6 +353,7 @@ class SetCommand(Command):
     min_args = 2
     max_args = 6
     description = "Set key to hold the value field. If key exists, it is overwritten."
+    write = True
 
     def execute(self, args: List[Any]) -> str:
         error = self.validate_args(args)
@@ -78,6 +363,31 @@ class SetCommand(Command):
         
         key, value = args[0], args[1]
 
+        ttl, nx, xx, error = self._parse_options(args)
+
+        if error:
+            return error
+        
+        result = self.db.set(
+            key,
+            value,
+            ttl,
+            nx,
+            xx
+        )
+
+        if result is None:
+            return "Not Found"
+        
+        return "OK"
+
+    def _parse_options(self, args: List[str]) -> Tuple[Optional[int], bool, bool, Optional[str]]:
+        """
+        Parses the EX, NX and XX options following the key and value.
+
+        Returns:
+            Tuple of (ttl, nx, xx, error)
+        """
         ttl = None
         nx = False
         xx = False
@@ -89,9 +399,9 @@ class SetCommand(Command):
                     ttl = int(args[i+1])
                     i = i + 2
                 except ValueError:
-                    return "ERROR: EX value must be an integer"
+                    return None, False, False, "ERROR: EX value must be an integer"
                 
-            elif args[i].upper() == "EX":
+            elif args[i].upper() == "NX":
                 nx = True
                 i = i + 1
 
@@ -100,24 +410,61 @@ class SetCommand(Command):
                 i += 1
 
             else:
-                return f"ERROR: Invalid option '{args[i]}'"
+                return None, False, False, f"ERROR: Invalid option '{args[i]}'"
 
         # Checking for clashing config 
         if nx and xx:
-            return "ERROR: NX and XX options cannot be used together"
-        
-        result = self.db.set(
-            key,
-            value,
-            ttl,
-            nx,
-            xx
-        )
+            return None, False, False, "ERROR: NX and XX options cannot be used together"
 
-        if result is None:
-            return "Not Found"
-        
-        return "OK"
+        return ttl, nx, xx, None
+
+    def execute_batch(self, batch: List[List[str]]) -> List[str]:
+        # Plain SET key value calls are stored with one bulk write
+        if any(len(args) != 2 for args in batch):
+            return super().execute_batch(batch)
+
+        self.db.set_many(batch)
+        return ["OK"] * len(batch)
+
+    def prepare(
+        self,
+        args: List[str],
+        slots: List[int]
+    ) -> Tuple[Optional[Callable[[List[str]], str]], Optional[str]]:
+        error = self.validate_args(args)
+
+        if error:
+            return None, error
+
+        # Only the EX value may be a placeholder among the options
+        ttl_slot = None
+        template = list(args)
+        for slot in slots:
+            if slot >= 2:
+                if slot < 3 or args[slot - 1].upper() != "EX":
+                    return None, "ERROR: Only the key, value and EX seconds can be parameters"
+                ttl_slot = slot
+                template[slot] = "0"
+
+        ttl, nx, xx, error = self._parse_options(template)
+
+        if error:
+            return None, error
+
+        db_set = self.db.set
+
+        if ttl_slot is None:
+            def run(args: List[str]) -> str:
+                return "OK" if db_set(args[0], args[1], ttl, nx, xx) is not None else "Not Found"
+        else:
+            def run(args: List[str]) -> str:
+                try:
+                    seconds = int(args[ttl_slot])
+                except ValueError:
+                    return "ERROR: EX value must be an integer"
+                return "OK" if db_set(args[0], args[1], seconds, nx, xx) is not None else "Not Found"
+
+        return run, None
     
 
 class GetCommand(Command):
@@ -134,12 +481,90 @@ class GetCommand(Command):
         if error:
             return error
         
-        value = self.db.get(args[0])
-        
-        if value is None:
-            return "Not Found"
-        
-        return str(value)
+        return format_value(self.db.get(args[0]))
+
+    def execute_batch(self, batch: List[List[str]]) -> List[str]:
+        if any(len(args) != 1 for args in batch):
+            return super().execute_batch(batch)
+
+        # All keys are fetched with one bulk read
+        return [format_value(value) for value in self.db.get_many([args[0] for args in batch])]
+
+    def prepare(
+        self,
+        args: List[str],
+        slots: List[int]
+    ) -> Tuple[Optional[Callable[[List[str]], str]], Optional[str]]:
+        error = self.validate_args(args)
+
+        if error:
+            return None, error
+
+        db_get = self.db.get
+
+        def run(args: List[str]) -> str:
+            return format_value(db_get(args[0]))
+
+        return run, None
+
+
+class MGetCommand(Command):
+    """MGET command used to fetch the values of several keys at once"""
+
+    name = "MGET"
+    min_args = 1
+    description = "Get the values of all the given keys. Missing keys and non-string values return Not Found."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        values = self.db.get_many(args)
+        return format_list([
+            format_value(value) if isinstance(value, STRING_TYPES) else "Not Found"
+            for value in values
+        ])
+
+
+class MSetCommand(Command):
+    """MSET command used to set several key-value pairs at once"""
+
+    name = "MSET"
+    min_args = 2
+    description = "Set the given keys to their respective values, replacing existing values."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        if len(args) % 2 != 0:
+            return f"ERROR: {self.name} requires key value pairs"
+
+        self.db.set_many(zip(args[0::2], args[1::2]))
+        return "OK"
+
+
+class MSetNXCommand(MSetCommand):
+    """MSETNX command used to set several key-value pairs only if none of the keys exist"""
+
+    name = "MSETNX"
+    description = "Set the given keys to their respective values only if none of them exists. Returns 1 if set, 0 if not."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        if len(args) % 2 != 0:
+            return f"ERROR: {self.name} requires key value pairs"
+
+        return "1" if self.db.set_many_nx(zip(args[0::2], args[1::2])) else "0"
 
 
 class DelCommand(Command):
@@ -155,13 +580,7 @@ class DelCommand(Command):
         if error:
             return error
         
-        deleted = 0
-        
-        for key in args:
-            if self.db.delete(key):
-                deleted += 1
-        
-        return str(deleted)
+        return str(self.db.delete_many(args))
 
 
 class ExistsCommand(Command):
@@ -176,12 +595,7 @@ class ExistsCommand(Command):
         if error:
             return error
         
-        count = 0
-        for key in args:
-            if self.db.exists(key):
-                count += 1
-        
-        return str(count)
+        return str(self.db.exists_many(args))
 
 
 class ExpireCommand(Command):
@@ -232,6 +646,7 @@ class AppendCommand(Command):
     min_args = 2
     max_args = 2
     description = "Append value to key. Creates the key if it doesn't exist."
+    write = True
     
     def execute(self, args: List[str]) -> str:
         error = self.validate_args(args)
@@ -240,74 +655,247 @@ class AppendCommand(Command):
             return error
         
         key, value = args[0], args[1]
-        return str(self.db.append(key, value))
+        try:
+            return str(self.db.append(key, value))
+        except TypeError:
+            return WRONGTYPE_ERROR
 
 
-class KeysCommand(Command):
-    """KEYS Command used to find all the keys that match the provided pattern"""
-    
-    name = "KEYS"
+class IncrCommand(Command):
+    """INCR Command used to increment the integer value of a key by one"""
+
+    name = "INCR"
     min_args = 1
     max_args = 1
-    description = "Find all keys matching the given pattern."
-    
+    description = "Increment the integer value of key by one, starting from 0. Returns the new value."
+    write = True
+    sign = 1
+
     def execute(self, args: List[str]) -> str:
         error = self.validate_args(args)
 
         if error:
             return error
-        
-        pattern = args[0]
-        keys = self.db.keys(pattern)
-        
-        if not keys:
-            return "Not Found"
-        
-        return "\n".join([f"{i+1}) {key}" for i, key in enumerate(keys)])
 
+        return self.increment(args[0], self.sign)
+
+    def increment(self, key: str, amount: int) -> str:
+        """Adds amount to the counter at key and formats the reply"""
+        try:
+            return str(self.db.increment(key, amount))
+        except TypeError:
+            return WRONGTYPE_ERROR
+        except ValueError as error:
+            return f"ERROR: {error}"
+
+
+class DecrCommand(IncrCommand):
+    """DECR Command used to decrement the integer value of a key by one"""
+
+    name = "DECR"
+    description = "Decrement the integer value of key by one, starting from 0. Returns the new value."
+    sign = -1
+
+
+class IncrByCommand(IncrCommand):
+    """INCRBY Command used to increment the integer value of a key by an amount"""
+
+    name = "INCRBY"
+    min_args = 2
+    max_args = 2
+    description = "Increment the integer value of key by the given amount, starting from 0. Returns the new value."
 
-class FlushDBCommand(Command):
-    """FLUSHDB Command to remove all the keys from the existing database"""
-    
-    name = "FLUSHDB"
-    max_args = 0
-    description = "Remove all keys from the current database."
-    
     def execute(self, args: List[str]) -> str:
         error = self.validate_args(args)
 
         if error:
             return error
-        
-        self.db.flushdb()
-        return "OK"
 
+        try:
+            amount = int(args[1])
+        except ValueError:
+            return "ERROR: Increment must be an integer"
+
+        return self.increment(args[0], amount * self.sign)
+
+
+class DecrByCommand(IncrByCommand):
+    """DECRBY Command used to decrement the integer value of a key by an amount"""
+
+    name = "DECRBY"
+    description = "Decrement the integer value of key by the given amount, starting from 0. Returns the new value."
+    sign = -1
+
+
+class IncrByFloatCommand(Command):
+    """INCRBYFLOAT Command used to increment the numeric value of a key by a float"""
+
+    name = "INCRBYFLOAT"
+    min_args = 2
+    max_args = 2
+    description = "Increment the numeric value of key by the given float, starting from 0. Returns the new value."
+    write = True
 
-class InfoCommand(Command):
-    """INFO Command that will be used to give all information regarding the database server"""
-    
-    name = "INFO"
-    max_args = 1
-    description = "Get information and statistics about the server."
-    
     def execute(self, args: List[str]) -> str:
         error = self.validate_args(args)
 
         if error:
             return error
-        
-        section = args[0] if args else None
-        info = self.db.info(section)
-        
-        if not info:
-            return "(no information available)"
-        
-        output = []
 
-        for key, value in info.items():
-            output.append(f"{key}: {value}")
+        try:
+            amount = float(args[1])
+        except ValueError:
+            return "ERROR: Increment must be a valid float"
 
-        return "\n".join(output)
+        if math.isnan(amount) or math.isinf(amount):
+            return "ERROR: Increment must be a valid float"
+
+        try:
+            return self.db.increment_float(args[0], amount)
+        except TypeError:
+            return WRONGTYPE_ERROR
+        except ValueError as error:
+            return f"ERROR: {error}"
+
+
+class ScanCommand(Command):
+    """SCAN Command used to iterate the keyspace in bounded batches"""
+
+    name = "SCAN"
+    min_args = 1
+    max_args = 7
+    description = "Incrementally iterate the keys. Returns the next cursor and a batch of keys."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        cursor, pattern, count, value_type, error = parse_scan_options(args, allow_type=True)
+
+        if error:
+            return error
+
+        value_filter = None
+        if value_type is not None:
+            value_filter = lambda value: type_name(value) == value_type
+
+        try:
+            cursor, keys = self.db.scan(cursor, pattern, count, value_filter)
+        except ValueError:
+            return "ERROR: Invalid cursor"
+
+        return format_scan(cursor, keys)
+
+
+class KeysCommand(Command):
+    """KEYS Command used to find all the keys that match the provided pattern"""
+    
+    name = "KEYS"
+    min_args = 1
+    max_args = 1
+    description = "Find all keys matching the given pattern."
+    
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+        
+        pattern = args[0]
+        keys = self.db.keys(pattern)
+        
+        if not keys:
+            return "Not Found"
+        
+        return "\n".join([f"{i+1}) {key}" for i, key in enumerate(keys)])
+
+
+class FlushDBCommand(Command):
+    """FLUSHDB Command to remove all the keys from the existing database"""
+    
+    name = "FLUSHDB"
+    max_args = 0
+    description = "Remove all keys from the current database."
+    
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+        
+        self.db.flushdb()
+        return "OK"
+
+
+class InfoCommand(Command):
+    """INFO Command that will be used to give all information regarding the database server"""
+    
+    name = "INFO"
+    max_args = 1
+    description = "Get information and statistics about the server."
+    
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+        
+        section = args[0] if args else None
+        info = self.db.info(section)
+        
+        if not info:
+            return "(no information available)"
+        
+        output = []
+
+        for key, value in info.items():
+            output.append(f"{key}: {value}")
+
+        return "\n".join(output)
+
+
+class SlowlogCommand(Command):
+    """SLOWLOG Command used to inspect the log of commands that exceeded the latency threshold"""
+
+    name = "SLOWLOG"
+    min_args = 1
+    max_args = 2
+    description = "Read or reset the slow log. Subcommands: GET [count], LEN, RESET."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        slowlog = self.db.stats.slowlog
+        subcommand = args[0].upper()
+
+        if subcommand == "GET":
+            count: Optional[int] = 10
+            if len(args) == 2:
+                try:
+                    count = int(args[1])
+                except ValueError:
+                    return "ERROR: count must be an integer"
+                # A negative count returns the whole log
+                if count < 0:
+                    count = None
+            return format_list([str(entry) for entry in slowlog.get(count)])
+
+        if len(args) != 1:
+            return f"ERROR: SLOWLOG {subcommand} takes no arguments"
+
+        if subcommand == "LEN":
+            return str(len(slowlog))
+
+        if subcommand == "RESET":
+            slowlog.reset()
+            return "OK"
+
+        return f"ERROR: Unknown SLOWLOG subcommand '{args[0]}'"
 
 
 class MultiCommand(Command):
@@ -342,10 +930,21 @@ class ExecCommand(Command):
         if error:
             return error
         
-        results = self.db.exec_transaction()
+        if self.db.transaction_queue is None:
+            return "ERROR: No transaction in progress"
+
+        if self.db.transaction_failed:
+            self.db.discard_transaction()
+            return "ERROR: EXECABORT Transaction discarded because of previous errors"
+
+        try:
+            results = self.db.exec_transaction()
+        except MemoryError:
+            return OOM_ERROR
 
+        # A watched key was modified, nothing was executed
         if results is None:
-            return "ERROR: No transaction in progress"
+            return "(nil)"
         
         if not results:
             return "(empty transaction)"
@@ -372,26 +971,1926 @@ class DiscardCommand(Command):
         return "ERROR: No transaction in progress"
     
 
-class CommandFactory:
-    """Factory for creating and registering all available commands."""
-    
-    @staticmethod
-    def create_all_commands() -> List[Type[Command]]:
-        """Get a list of all available command classes."""
-        return [
-            SetCommand,
-            GetCommand,
-            DelCommand,
-            ExistsCommand,
-            ExpireCommand,
-            TtlCommand,
-            
-            AppendCommand,
-            KeysCommand,
-            FlushDBCommand,
-            InfoCommand,
-            
-            MultiCommand,
-            ExecCommand,
-            DiscardCommand,
+class WatchCommand(Command):
+    """WATCH Command used to make the next transaction conditional on keys staying unchanged"""
+
+    name = "WATCH"
+    min_args = 1
+    description = "Watch keys, EXEC aborts the following transaction if any of them is modified."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        if self.db.watch(args):
+            return "OK"
+
+        return "ERROR: WATCH inside MULTI is not allowed"
+
+
+class UnwatchCommand(Command):
+    """UNWATCH Command used to forget all watched keys"""
+
+    name = "UNWATCH"
+    max_args = 0
+    description = "Forget all watched keys."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        self.db.unwatch()
+        return "OK"
+
+
+class ZAddCommand(Command):
+    """ZADD Command used to add members with scores to a sorted set"""
+
+    name = "ZADD"
+    min_args = 3
+    description = "Add members with scores to a sorted set. Returns the number of members added."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        key = args[0]
+        nx = False
+        xx = False
+        changed = False
+
+        i = 1
+        while i < len(args):
+            option = args[i].upper()
+            if option == "NX":
+                nx = True
+            elif option == "XX":
+                xx = True
+            elif option == "CH":
+                changed = True
+            else:
+                break
+            i += 1
+
+        if nx and xx:
+            return "ERROR: NX and XX options cannot be used together"
+
+        pairs = args[i:]
+        if not pairs or len(pairs) % 2 != 0:
+            return "ERROR: ZADD requires score member pairs"
+
+        try:
+            scores = [float(score) for score in pairs[0::2]]
+        except ValueError:
+            return "ERROR: Score must be a valid float"
+
+        if any(math.isnan(score) for score in scores):
+            return "ERROR: Score must be a valid float"
+
+        zset, error = self.lookup_typed(key, SortedSet, create=not xx)
+        if error:
+            return error
+        if zset is None:
+            return "0"
+
+        added = 0
+        updated = 0
+        for score, member in zip(scores, pairs[1::2]):
+            current = zset.score(member)
+
+            if current is None:
+                if xx:
+                    continue
+                zset.add(member, score)
+                added += 1
+
+            elif not nx and current != score:
+                zset.add(member, score)
+                updated += 1
+
+        if not zset:
+            self.db.delete(key)
+        else:
+            self.db.signal_modified(key)
+
+        return str(added + updated if changed else added)
+
+
+class ZRemCommand(Command):
+    """ZREM Command used to remove members from a sorted set"""
+
+    name = "ZREM"
+    min_args = 2
+    description = "Remove members from a sorted set. Returns the number of members removed."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        key = args[0]
+        zset, error = self.lookup_typed(key, SortedSet)
+        if error:
+            return error
+        if zset is None:
+            return "0"
+
+        removed = 0
+        for member in args[1:]:
+            if zset.remove(member):
+                removed += 1
+
+        if not zset:
+            self.db.delete(key)
+        elif removed:
+            self.db.signal_modified(key)
+
+        return str(removed)
+
+
+class ZIncrByCommand(Command):
+    """ZINCRBY Command used to increment the score of a sorted set member"""
+
+    name = "ZINCRBY"
+    min_args = 3
+    max_args = 3
+    description = "Increment the score of a member in a sorted set. Returns the new score."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        key, increment, member = args[0], args[1], args[2]
+        try:
+            amount = float(increment)
+        except ValueError:
+            return "ERROR: Increment must be a valid float"
+
+        if math.isnan(amount):
+            return "ERROR: Increment must be a valid float"
+
+        zset, error = self.lookup_typed(key, SortedSet, create=True)
+        if error:
+            return error
+
+        # inf plus -inf would store a NaN score, which has no place in the order
+        current = zset.score(member)
+        if current is not None and math.isnan(current + amount):
+            return "ERROR: Resulting score is not a number (NaN)"
+
+        score = zset.increment(member, amount)
+        self.db.signal_modified(key)
+        return format_score(score)
+
+
+class ZScoreCommand(Command):
+    """ZSCORE Command used to fetch the score of a sorted set member"""
+
+    name = "ZSCORE"
+    min_args = 2
+    max_args = 2
+    description = "Get the score of a member in a sorted set."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        zset, error = self.lookup_typed(args[0], SortedSet)
+        if error:
+            return error
+
+        score = zset.score(args[1]) if zset is not None else None
+        if score is None:
+            return "Not Found"
+
+        return format_score(score)
+
+
+class ZCardCommand(Command):
+    """ZCARD Command used to count the members of a sorted set"""
+
+    name = "ZCARD"
+    min_args = 1
+    max_args = 1
+    description = "Get the number of members in a sorted set."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        zset, error = self.lookup_typed(args[0], SortedSet)
+        if error:
+            return error
+
+        return str(len(zset) if zset is not None else 0)
+
+
+class ZCountCommand(Command):
+    """ZCOUNT Command used to count the members of a sorted set within a score range"""
+
+    name = "ZCOUNT"
+    min_args = 3
+    max_args = 3
+    description = "Count the members in a sorted set with a score between min and max."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        try:
+            min_score, min_exclusive = parse_score_bound(args[1])
+            max_score, max_exclusive = parse_score_bound(args[2])
+        except ValueError:
+            return "ERROR: min and max must be valid floats"
+
+        zset, error = self.lookup_typed(args[0], SortedSet)
+        if error:
+            return error
+        if zset is None:
+            return "0"
+
+        return str(zset.count(min_score, max_score, min_exclusive, max_exclusive))
+
+
+class ZRankCommand(Command):
+    """ZRANK Command used to find the position of a member ordered by ascending score"""
+
+    name = "ZRANK"
+    min_args = 2
+    max_args = 2
+    description = "Get the zero based rank of a member in a sorted set, ordered from low to high score."
+    reverse = False
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        zset, error = self.lookup_typed(args[0], SortedSet)
+        if error:
+            return error
+
+        rank = zset.rank(args[1], self.reverse) if zset is not None else None
+        if rank is None:
+            return "Not Found"
+
+        return str(rank)
+
+
+class ZRevRankCommand(ZRankCommand):
+    """ZREVRANK Command used to find the position of a member ordered by descending score"""
+
+    name = "ZREVRANK"
+    description = "Get the zero based rank of a member in a sorted set, ordered from high to low score."
+    reverse = True
+
+
+class ZRangeCommand(Command):
+    """ZRANGE Command used to fetch the members of a sorted set between two ranks"""
+
+    name = "ZRANGE"
+    min_args = 3
+    max_args = 4
+    description = "Return the members of a sorted set between start and stop ranks, ordered from low to high score."
+    reverse = False
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        try:
+            start = int(args[1])
+            stop = int(args[2])
+        except ValueError:
+            return "ERROR: start and stop must be integers"
+
+        with_scores = False
+        if len(args) == 4:
+            if args[3].upper() != "WITHSCORES":
+                return f"ERROR: Invalid option '{args[3]}'"
+            with_scores = True
+
+        zset, error = self.lookup_typed(args[0], SortedSet)
+        if error:
+            return error
+        if zset is None:
+            return format_list([])
+
+        return format_members(zset.range(start, stop, self.reverse), with_scores)
+
+
+class ZRevRangeCommand(ZRangeCommand):
+    """ZREVRANGE Command used to fetch the members of a sorted set between two ranks in reverse"""
+
+    name = "ZREVRANGE"
+    description = "Return the members of a sorted set between start and stop ranks, ordered from high to low score."
+    reverse = True
+
+
+class ZRangeByScoreCommand(Command):
+    """ZRANGEBYSCORE Command used to fetch the members of a sorted set within a score range"""
+
+    name = "ZRANGEBYSCORE"
+    min_args = 3
+    max_args = 7
+    description = "Return the members of a sorted set with a score between min and max."
+    reverse = False
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        # ZREVRANGEBYSCORE takes the bounds as max min
+        low, high = (args[2], args[1]) if self.reverse else (args[1], args[2])
+        try:
+            min_score, min_exclusive = parse_score_bound(low)
+            max_score, max_exclusive = parse_score_bound(high)
+        except ValueError:
+            return "ERROR: min and max must be valid floats"
+
+        with_scores = False
+        offset = 0
+        count = None
+
+        i = 3
+        while i < len(args):
+            option = args[i].upper()
+            if option == "WITHSCORES":
+                with_scores = True
+                i += 1
+            elif option == "LIMIT" and i + 2 < len(args):
+                try:
+                    offset = int(args[i+1])
+                    count = int(args[i+2])
+                except ValueError:
+                    return "ERROR: LIMIT offset and count must be integers"
+                # A negative count returns everything after the offset
+                if count < 0:
+                    count = None
+                i += 3
+            else:
+                return f"ERROR: Invalid option '{args[i]}'"
+
+        zset, error = self.lookup_typed(args[0], SortedSet)
+        if error:
+            return error
+        if zset is None or offset < 0:
+            return format_list([])
+
+        members = zset.range_by_score(
+            min_score,
+            max_score,
+            min_exclusive,
+            max_exclusive,
+            self.reverse,
+            offset,
+            count
+        )
+        return format_members(members, with_scores)
+
+
+class ZScanCommand(Command):
+    """ZSCAN Command used to iterate the members of a sorted set in bounded batches"""
+
+    name = "ZSCAN"
+    min_args = 2
+    max_args = 6
+    description = "Incrementally iterate a sorted set. Returns the next cursor and a batch of members with scores."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        cursor, pattern, count, _, error = parse_scan_options(args[1:])
+
+        if error:
+            return error
+
+        zset, error = self.lookup_typed(args[0], SortedSet)
+        if error:
+            return error
+        if zset is None:
+            return format_scan(0, [])
+
+        scores = zset.scores
+        try:
+            cursor, members = self.db.scan_cursors.scan(zset, cursor, count, lambda: list(scores))
+        except ValueError:
+            return "ERROR: Invalid cursor"
+
+        if pattern is not None:
+            members = compile_glob(pattern).filter(members)
+
+        items = []
+        for member in members:
+            # Members removed since the iteration started are skipped
+            score = scores.get(member)
+            if score is not None:
+                items.append(member)
+                items.append(format_score(score))
+
+        return format_scan(cursor, items)
+
+
+class ZRevRangeByScoreCommand(ZRangeByScoreCommand):
+    """ZREVRANGEBYSCORE Command used to fetch the members of a sorted set within a score range in reverse"""
+
+    name = "ZREVRANGEBYSCORE"
+    description = "Return the members of a sorted set with a score between max and min, ordered from high to low score."
+    reverse = True
+
+
+class LPushCommand(Command):
+    """LPUSH Command used to prepend values to a list"""
+
+    name = "LPUSH"
+    min_args = 2
+    description = "Insert values at the head of a list, creating it if needed. Returns the length of the list."
+    write = True
+    left = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        db = self.db
+        key = args[0]
+        values, error = self.lookup_typed(
+            key,
+            QuickList,
+            create=True,
+            factory=lambda: QuickList(db.list_chunk_size, db.list_compress_depth)
+        )
+        if error:
+            return error
+
+        push = values.push_left if self.left else values.push_right
+        for value in args[1:]:
+            push(value)
+
+        db.signal_modified(key)
+        return str(len(values))
+
+
+class RPushCommand(LPushCommand):
+    """RPUSH Command used to append values to a list"""
+
+    name = "RPUSH"
+    description = "Insert values at the tail of a list, creating it if needed. Returns the length of the list."
+    left = False
+
+
+class LPopCommand(Command):
+    """LPOP Command used to remove and return the first values of a list"""
+
+    name = "LPOP"
+    min_args = 1
+    max_args = 2
+    description = "Remove and return the first value of a list, or the first count values."
+    left = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        count = None
+        if len(args) == 2:
+            try:
+                count = int(args[1])
+            except ValueError:
+                return "ERROR: count must be an integer"
+            if count < 0:
+                return "ERROR: count must be positive"
+
+        key = args[0]
+        values, error = self.lookup_typed(key, QuickList)
+        if error:
+            return error
+        if values is None:
+            return "Not Found" if count is None else format_list([])
+
+        pop = values.pop_left if self.left else values.pop_right
+        popped = [pop() for _ in range(min(1 if count is None else count, len(values)))]
+
+        if not values:
+            self.db.delete(key)
+        elif popped:
+            self.db.signal_modified(key)
+
+        if count is None:
+            return popped[0]
+
+        return format_list(popped)
+
+
+class RPopCommand(LPopCommand):
+    """RPOP Command used to remove and return the last values of a list"""
+
+    name = "RPOP"
+    description = "Remove and return the last value of a list, or the last count values."
+    left = False
+
+
+class LRangeCommand(Command):
+    """LRANGE Command used to fetch the values of a list between two indexes"""
+
+    name = "LRANGE"
+    min_args = 3
+    max_args = 3
+    description = "Return the values of a list between start and stop indexes, both inclusive."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        try:
+            start = int(args[1])
+            stop = int(args[2])
+        except ValueError:
+            return "ERROR: start and stop must be integers"
+
+        values, error = self.lookup_typed(args[0], QuickList)
+        if error:
+            return error
+        if values is None:
+            return format_list([])
+
+        return format_list(values.range(start, stop))
+
+
+class LIndexCommand(Command):
+    """LINDEX Command used to fetch the value at an index of a list"""
+
+    name = "LINDEX"
+    min_args = 2
+    max_args = 2
+    description = "Get the value at an index of a list, negative indexes count from the tail."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        try:
+            index = int(args[1])
+        except ValueError:
+            return "ERROR: index must be an integer"
+
+        values, error = self.lookup_typed(args[0], QuickList)
+        if error:
+            return error
+
+        value = values.index(index) if values is not None else None
+        if value is None:
+            return "Not Found"
+
+        return value
+
+
+class LLenCommand(Command):
+    """LLEN Command used to count the values of a list"""
+
+    name = "LLEN"
+    min_args = 1
+    max_args = 1
+    description = "Get the length of a list."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        values, error = self.lookup_typed(args[0], QuickList)
+        if error:
+            return error
+
+        return str(len(values) if values is not None else 0)
+
+
+class HSetCommand(Command):
+    """HSET Command used to set fields of a hash"""
+
+    name = "HSET"
+    min_args = 3
+    description = "Set fields of a hash to their values, creating it if needed. Returns the number of new fields."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        pairs = args[1:]
+        if len(pairs) % 2 != 0:
+            return "ERROR: HSET requires field value pairs"
+
+        db = self.db
+        key = args[0]
+        fields, error = self.lookup_typed(
+            key,
+            CompactHash,
+            create=True,
+            factory=lambda: CompactHash(db.hash_max_compact_entries, db.hash_max_compact_value)
+        )
+        if error:
+            return error
+
+        added = 0
+        for field, value in zip(pairs[0::2], pairs[1::2]):
+            if fields.set(field, value):
+                added += 1
+
+        db.signal_modified(key)
+        return str(added)
+
+
+class HGetCommand(Command):
+    """HGET Command used to fetch the value of a hash field"""
+
+    name = "HGET"
+    min_args = 2
+    max_args = 2
+    description = "Get the value of a field in a hash."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        fields, error = self.lookup_typed(args[0], CompactHash)
+        if error:
+            return error
+
+        value = fields.get(args[1]) if fields is not None else None
+        if value is None:
+            return "Not Found"
+
+        return value
+
+
+class HMGetCommand(Command):
+    """HMGET Command used to fetch the values of several hash fields at once"""
+
+    name = "HMGET"
+    min_args = 2
+    description = "Get the values of the given fields in a hash. Missing fields return Not Found."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        fields, error = self.lookup_typed(args[0], CompactHash)
+        if error:
+            return error
+
+        if fields is None:
+            return format_list(["Not Found"] * (len(args) - 1))
+
+        get = fields.get
+        return format_list([
+            value if value is not None else "Not Found"
+            for value in map(get, args[1:])
+        ])
+
+
+class HGetAllCommand(Command):
+    """HGETALL Command used to fetch every field and value of a hash"""
+
+    name = "HGETALL"
+    min_args = 1
+    max_args = 1
+    description = "Get all the fields and values of a hash."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        fields, error = self.lookup_typed(args[0], CompactHash)
+        if error:
+            return error
+        if fields is None:
+            return format_list([])
+
+        items = []
+        for field, value in fields.items():
+            items.append(field)
+            items.append(value)
+
+        return format_list(items)
+
+
+class HIncrByCommand(Command):
+    """HINCRBY Command used to increment the integer value of a hash field"""
+
+    name = "HINCRBY"
+    min_args = 3
+    max_args = 3
+    description = "Increment the integer value of a hash field, starting from 0. Returns the new value."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        key, field = args[0], args[1]
+        # Checked before the lookup so a new key is not left holding an empty hash
+        increment = parse_int(args[2])
+        if increment is None:
+            return "ERROR: Increment must be an integer"
+
+        db = self.db
+        fields, error = self.lookup_typed(
+            key,
+            CompactHash,
+            create=True,
+            factory=lambda: CompactHash(db.hash_max_compact_entries, db.hash_max_compact_value)
+        )
+        if error:
+            return error
+
+        current = fields.get(field)
+        if current is None:
+            value = increment
+        else:
+            number = parse_int(current)
+            if number is None:
+                return "ERROR: Hash value is not an integer"
+            value = number + increment
+
+        if not INT64_MIN <= value <= INT64_MAX:
+            return "ERROR: Increment or decrement would overflow"
+
+        fields.set(field, str(value))
+        db.signal_modified(key)
+        return str(value)
+
+
+class HDelCommand(Command):
+    """HDEL Command used to remove fields from a hash"""
+
+    name = "HDEL"
+    min_args = 2
+    description = "Remove fields from a hash. Returns the number of fields removed."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        key = args[0]
+        fields, error = self.lookup_typed(key, CompactHash)
+        if error:
+            return error
+        if fields is None:
+            return "0"
+
+        removed = 0
+        for field in args[1:]:
+            if fields.delete(field):
+                removed += 1
+
+        if not fields:
+            self.db.delete(key)
+        elif removed:
+            self.db.signal_modified(key)
+
+        return str(removed)
+
+
+class HLenCommand(Command):
+    """HLEN Command used to count the fields of a hash"""
+
+    name = "HLEN"
+    min_args = 1
+    max_args = 1
+    description = "Get the number of fields in a hash."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        fields, error = self.lookup_typed(args[0], CompactHash)
+        if error:
+            return error
+
+        return str(len(fields) if fields is not None else 0)
+
+
+class HScanCommand(Command):
+    """HSCAN Command used to iterate the fields of a hash in bounded batches"""
+
+    name = "HSCAN"
+    min_args = 2
+    max_args = 6
+    description = "Incrementally iterate a hash. Returns the next cursor and a batch of fields with values."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        cursor, pattern, count, _, error = parse_scan_options(args[1:])
+
+        if error:
+            return error
+
+        fields, error = self.lookup_typed(args[0], CompactHash)
+        if error:
+            return error
+        if fields is None:
+            return format_scan(0, [])
+
+        try:
+            cursor, names = self.db.scan_cursors.scan(fields, cursor, count, lambda: list(fields))
+        except ValueError:
+            return "ERROR: Invalid cursor"
+
+        if pattern is not None:
+            names = compile_glob(pattern).filter(names)
+
+        items = []
+        for field in names:
+            # Fields removed since the iteration started are skipped
+            value = fields.get(field)
+            if value is not None:
+                items.append(field)
+                items.append(value)
+
+        return format_scan(cursor, items)
+
+
+class SAddCommand(Command):
+    """SADD Command used to add members to a set"""
+
+    name = "SADD"
+    min_args = 2
+    description = "Add members to a set, creating it if needed. Returns the number of members added."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        db = self.db
+        key = args[0]
+        members, error = self.lookup_typed(
+            key,
+            CompactSet,
+            create=True,
+            factory=lambda: CompactSet(db.set_max_intset_entries)
+        )
+        if error:
+            return error
+
+        added = 0
+        for member in args[1:]:
+            if members.add(member):
+                added += 1
+
+        if added:
+            db.signal_modified(key)
+
+        return str(added)
+
+
+class SRemCommand(Command):
+    """SREM Command used to remove members from a set"""
+
+    name = "SREM"
+    min_args = 2
+    description = "Remove members from a set. Returns the number of members removed."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        key = args[0]
+        members, error = self.lookup_typed(key, CompactSet)
+        if error:
+            return error
+        if members is None:
+            return "0"
+
+        removed = 0
+        for member in args[1:]:
+            if members.remove(member):
+                removed += 1
+
+        if not members:
+            self.db.delete(key)
+        elif removed:
+            self.db.signal_modified(key)
+
+        return str(removed)
+
+
+class SIsMemberCommand(Command):
+    """SISMEMBER Command used to check whether a value is a member of a set"""
+
+    name = "SISMEMBER"
+    min_args = 2
+    max_args = 2
+    description = "Check whether a value is a member of a set. Returns 1 or 0."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        members, error = self.lookup_typed(args[0], CompactSet)
+        if error:
+            return error
+
+        return "1" if members is not None and args[1] in members else "0"
+
+
+class SMembersCommand(Command):
+    """SMEMBERS Command used to fetch every member of a set"""
+
+    name = "SMEMBERS"
+    min_args = 1
+    max_args = 1
+    description = "Get all the members of a set."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        members, error = self.lookup_typed(args[0], CompactSet)
+        if error:
+            return error
+
+        return format_list(list(members) if members is not None else [])
+
+
+class SCardCommand(Command):
+    """SCARD Command used to count the members of a set"""
+
+    name = "SCARD"
+    min_args = 1
+    max_args = 1
+    description = "Get the number of members in a set."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        members, error = self.lookup_typed(args[0], CompactSet)
+        if error:
+            return error
+
+        return str(len(members) if members is not None else 0)
+
+
+class SInterCommand(Command):
+    """SINTER Command used to fetch the members common to several sets"""
+
+    name = "SINTER"
+    min_args = 1
+    description = "Get the members present in every given set."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        sets, error = self.lookup_sets(args)
+        if error:
+            return error
+
+        # A missing key is an empty set, so the intersection is empty
+        if len(sets) < len(args):
+            return format_list([])
+
+        return format_list(intersection(sets))
+
+    def lookup_sets(self, keys: List[str]) -> Tuple[List[CompactSet], Optional[str]]:
+        """
+        Fetches the sets stored at several keys, leaving out missing keys.
+
+        Args:
+            keys: The keys to look up
+
+        Returns:
+            Tuple of (sets, error), error is the WRONGTYPE message if a key holds another data type
+        """
+        sets = []
+        for key in keys:
+            members, error = self.lookup_typed(key, CompactSet)
+            if error:
+                return [], error
+            if members is not None:
+                sets.append(members)
+
+        return sets, None
+
+
+class SUnionCommand(SInterCommand):
+    """SUNION Command used to fetch the members of any of several sets"""
+
+    name = "SUNION"
+    description = "Get the members present in any of the given sets."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        sets, error = self.lookup_sets(args)
+        if error:
+            return error
+
+        return format_list(union(sets))
+
+
+class SDiffCommand(SInterCommand):
+    """SDIFF Command used to fetch the members of a set missing from other sets"""
+
+    name = "SDIFF"
+    description = "Get the members of the first set that are in none of the other given sets."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        first, error = self.lookup_typed(args[0], CompactSet)
+        if error:
+            return error
+
+        others, error = self.lookup_sets(args[1:])
+        if error:
+            return error
+
+        if first is None:
+            return format_list([])
+
+        return format_list(difference(first, others))
+
+
+class SScanCommand(Command):
+    """SSCAN Command used to iterate the members of a set in bounded batches"""
+
+    name = "SSCAN"
+    min_args = 2
+    max_args = 6
+    description = "Incrementally iterate a set. Returns the next cursor and a batch of members."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        cursor, pattern, count, _, error = parse_scan_options(args[1:])
+
+        if error:
+            return error
+
+        members, error = self.lookup_typed(args[0], CompactSet)
+        if error:
+            return error
+        if members is None:
+            return format_scan(0, [])
+
+        try:
+            cursor, batch = self.db.scan_cursors.scan(members, cursor, count, lambda: list(members))
+        except ValueError:
+            return "ERROR: Invalid cursor"
+
+        if pattern is not None:
+            batch = compile_glob(pattern).filter(batch)
+
+        # Members removed since the iteration started are skipped
+        return format_scan(cursor, [member for member in batch if member in members])
+
+
+class PFAddCommand(Command):
+    """PFADD Command used to add elements to a HyperLogLog"""
+
+    name = "PFADD"
+    min_args = 1
+    description = "Add elements to a HyperLogLog, creating it if needed. Returns 1 if the estimate may have changed."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        db = self.db
+        key = args[0]
+        created = not db.exists(key)
+        hyperloglog, error = self.lookup_typed(
+            key,
+            HyperLogLog,
+            create=True,
+            factory=lambda: HyperLogLog(db.hll_sparse_max_bytes)
+        )
+        if error:
+            return error
+
+        changed = False
+        for element in args[1:]:
+            if hyperloglog.add(element):
+                changed = True
+
+        if changed:
+            db.signal_modified(key)
+
+        return "1" if changed or created else "0"
+
+
+class PFCountCommand(Command):
+    """PFCOUNT Command used to estimate the number of distinct elements of HyperLogLogs"""
+
+    name = "PFCOUNT"
+    min_args = 1
+    description = "Estimate the number of distinct elements added to the union of the given HyperLogLogs."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        hyperloglogs, error = self.lookup_hyperloglogs(args)
+        if error:
+            return error
+
+        if not hyperloglogs:
+            return "0"
+
+        return str(HyperLogLog.count_union(hyperloglogs))
+
+    def lookup_hyperloglogs(self, keys: List[str]) -> Tuple[List[HyperLogLog], Optional[str]]:
+        """
+        Fetches the HyperLogLogs stored at several keys, leaving out missing keys.
+
+        Args:
+            keys: The keys to look up
+
+        Returns:
+            Tuple of (HyperLogLogs, error), error is the WRONGTYPE message if a key holds another data type
+        """
+        hyperloglogs = []
+        for key in keys:
+            hyperloglog, error = self.lookup_typed(key, HyperLogLog)
+            if error:
+                return [], error
+            if hyperloglog is not None:
+                hyperloglogs.append(hyperloglog)
+
+        return hyperloglogs, None
+
+
+class PFMergeCommand(PFCountCommand):
+    """PFMERGE Command used to merge HyperLogLogs into one"""
+
+    name = "PFMERGE"
+    min_args = 1
+    description = "Merge HyperLogLogs into the destination, which then estimates their union."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        # Every key is checked before the destination is created
+        sources, error = self.lookup_hyperloglogs(args[1:])
+        if error:
+            return error
+
+        db = self.db
+        key = args[0]
+        destination, error = self.lookup_typed(
+            key,
+            HyperLogLog,
+            create=True,
+            factory=lambda: HyperLogLog(db.hll_sparse_max_bytes)
+        )
+        if error:
+            return error
+
+        sources = [source for source in sources if source is not destination]
+        if sources:
+            destination.merge(sources)
+            db.signal_modified(key)
+
+        return "OK"
+
+
+class SetBitCommand(Command):
+    """SETBIT Command used to set or clear a bit of a string"""
+
+    name = "SETBIT"
+    min_args = 3
+    max_args = 3
+    description = "Set or clear the bit at an offset of a string, growing it as needed. Returns the previous bit."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        try:
+            offset = int(args[1])
+        except ValueError:
+            offset = -1
+        if not 0 <= offset <= MAX_BIT_OFFSET:
+            return "ERROR: bit offset is not an integer or out of range"
+
+        if args[2] not in ("0", "1"):
+            return "ERROR: bit is not an integer or out of range"
+
+        key = args[0]
+        try:
+            bitmap = self.db.bitmap(key, create=True)
+        except TypeError:
+            return WRONGTYPE_ERROR
+
+        old = bitmap.set_bit(offset, int(args[2]))
+        self.db.signal_modified(key)
+        return str(old)
+
+
+class GetBitCommand(Command):
+    """GETBIT Command used to fetch a bit of a string"""
+
+    name = "GETBIT"
+    min_args = 2
+    max_args = 2
+    description = "Get the bit at an offset of a string, bits past the end are 0."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        try:
+            offset = int(args[1])
+        except ValueError:
+            offset = -1
+        if not 0 <= offset <= MAX_BIT_OFFSET:
+            return "ERROR: bit offset is not an integer or out of range"
+
+        try:
+            bitmap = self.db.bitmap(args[0])
+        except TypeError:
+            return WRONGTYPE_ERROR
+
+        return str(bitmap.get_bit(offset)) if bitmap is not None else "0"
+
+
+class BitCountCommand(Command):
+    """BITCOUNT Command used to count the set bits of a string"""
+
+    name = "BITCOUNT"
+    min_args = 1
+    max_args = 4
+    description = "Count the set bits of a string, optionally between start and end bytes or bits."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        if len(args) == 2:
+            return "ERROR: BITCOUNT requires both start and end"
+
+        try:
+            bitmap = self.db.bitmap(args[0])
+        except TypeError:
+            return WRONGTYPE_ERROR
+
+        bits, _, error = parse_bit_range(args[1:], len(bitmap) if bitmap is not None else 0)
+        if error:
+            return error
+        if bits is None:
+            return "0"
+
+        return str(bitmap.count(*bits))
+
+
+class BitPosCommand(Command):
+    """BITPOS Command used to find the first set or clear bit of a string"""
+
+    name = "BITPOS"
+    min_args = 2
+    max_args = 5
+    description = "Find the first bit set to 0 or 1 in a string, optionally between start and end bytes or bits."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        if args[1] not in ("0", "1"):
+            return "ERROR: The bit argument must be 1 or 0"
+        bit = int(args[1])
+
+        try:
+            bitmap = self.db.bitmap(args[0])
+        except TypeError:
+            return WRONGTYPE_ERROR
+
+        size = len(bitmap) if bitmap is not None else 0
+        bits, end_given, error = parse_bit_range(args[2:], size)
+        if error:
+            return error
+
+        if not size:
+            # A missing key is an empty string, which is all clear bits
+            return "-1" if bit else "0"
+        if bits is None:
+            return "-1"
+
+        position = bitmap.position(bit, *bits)
+        if position < 0 and bit == 0 and not end_given:
+            # Without an explicit end the string is treated as padded with clear bits
+            return str(bits[1] + 1)
+
+        return str(position)
+
+
+class BitOpCommand(Command):
+    """BITOP Command used to combine strings bitwise"""
+
+    name = "BITOP"
+    min_args = 3
+    description = "Combine strings with AND, OR, XOR or NOT into destkey. Returns the length of the result."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        operation = args[0].upper()
+        if operation not in BITOP_OPERATIONS and operation != "NOT":
+            return f"ERROR: Unknown BITOP operation '{args[0]}'"
+        if operation == "NOT" and len(args) != 3:
+            return "ERROR: BITOP NOT must be called with a single source key"
+
+        sources = []
+        for key in args[2:]:
+            try:
+                bitmap = self.db.bitmap(key)
+            except TypeError:
+                return WRONGTYPE_ERROR
+            # A missing key is an empty string
+            sources.append(bitmap.data if bitmap is not None else b"")
+
+        result = bitop(operation, sources)
+        if not result:
+            self.db.delete(args[1])
+            return "0"
+
+        self.db.set(args[1], Bitmap(result))
+        return str(len(result))
+
+
+class BFReserveCommand(Command):
+    """BF.RESERVE Command used to create a Bloom filter with a given error rate and capacity"""
+
+    name = "BF.RESERVE"
+    min_args = 3
+    max_args = 6
+    description = "Create an empty Bloom filter: BF.RESERVE key error_rate capacity [EXPANSION n] [NONSCALING]."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        try:
+            error_rate = float(args[1])
+            capacity = int(args[2])
+        except ValueError:
+            return "ERROR: error rate must be a float and capacity an integer"
+
+        expansion = self.db.bf_expansion
+        scaling = True
+
+        i = 3
+        while i < len(args):
+            option = args[i].upper()
+            if option == "NONSCALING":
+                scaling = False
+                i += 1
+            elif option == "EXPANSION" and i + 1 < len(args):
+                try:
+                    expansion = int(args[i+1])
+                except ValueError:
+                    return "ERROR: EXPANSION must be an integer"
+                i += 2
+            else:
+                return f"ERROR: Invalid option '{args[i]}'"
+
+        try:
+            size = check_parameters(error_rate, capacity, expansion)
+        except ValueError as error:
+            return f"ERROR: {error}"
+
+        # The bit array is allocated at once, so it has to fit before it is created
+        if not self.db.has_room(size):
+            return OOM_ERROR
+
+        if self.db.exists(args[0]):
+            return "ERROR: item exists"
+
+        bloom = BloomFilter(error_rate, capacity, expansion, scaling)
+        if self.db.set(args[0], bloom, nx=True) is None:
+            return "ERROR: item exists"
+
+        return "OK"
+
+
+class BFAddCommand(Command):
+    """BF.ADD Command used to add an element to a Bloom filter"""
+
+    name = "BF.ADD"
+    min_args = 2
+    max_args = 2
+    description = "Add an element to a Bloom filter, creating it if needed. Returns 1 if it was not present."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        bloom, error = self.lookup_filter(args[0])
+        if error:
+            return error
+
+        reply = self.add(bloom, args[1])
+        if reply == "1":
+            self.db.signal_modified(args[0])
+        return reply
+
+    def lookup_filter(self, key: str) -> Tuple[Optional[BloomFilter], Optional[str]]:
+        """Fetches the Bloom filter at key, creating one with the database defaults if needed"""
+        db = self.db
+        return self.lookup_typed(
+            key,
+            BloomFilter,
+            create=True,
+            factory=lambda: BloomFilter(db.bf_error_rate, db.bf_initial_capacity, db.bf_expansion)
+        )
+
+    @staticmethod
+    def add(bloom: BloomFilter, element: str) -> str:
+        """Adds an element to a filter and formats the reply"""
+        try:
+            return "1" if bloom.add(element) else "0"
+        except ValueError as error:
+            return f"ERROR: {error}"
+
+
+class BFMAddCommand(BFAddCommand):
+    """BF.MADD Command used to add several elements to a Bloom filter"""
+
+    name = "BF.MADD"
+    min_args = 2
+    max_args = None
+    description = "Add elements to a Bloom filter, creating it if needed. Returns 1 or 0 for each element."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        bloom, error = self.lookup_filter(args[0])
+        if error:
+            return error
+
+        replies = [self.add(bloom, element) for element in args[1:]]
+        if "1" in replies:
+            self.db.signal_modified(args[0])
+        return format_list(replies)
+
+
+class BFExistsCommand(Command):
+    """BF.EXISTS Command used to check whether an element may be in a Bloom filter"""
+
+    name = "BF.EXISTS"
+    min_args = 2
+    max_args = 2
+    description = "Check whether an element may have been added to a Bloom filter. 0 means it definitely was not."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        bloom, error = self.lookup_typed(args[0], BloomFilter)
+        if error:
+            return error
+
+        return "1" if bloom is not None and args[1] in bloom else "0"
+
+
+class BFMExistsCommand(Command):
+    """BF.MEXISTS Command used to check whether several elements may be in a Bloom filter"""
+
+    name = "BF.MEXISTS"
+    min_args = 2
+    description = "Check whether elements may have been added to a Bloom filter. Returns 1 or 0 for each element."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        bloom, error = self.lookup_typed(args[0], BloomFilter)
+        if error:
+            return error
+
+        if bloom is None:
+            return format_list(["0"] * (len(args) - 1))
+
+        return format_list(["1" if element in bloom else "0" for element in args[1:]])
+
+
+class XAddCommand(Command):
+    """XADD Command used to append an entry to a stream"""
+
+    name = "XADD"
+    min_args = 4
+    description = "Append an entry to a stream: XADD key [MAXLEN [~|=] n] <*|id> field value [field value ...]."
+    write = True
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        maxlen = None
+        approximate = False
+
+        i = 1
+        if args[i].upper() == "MAXLEN":
+            i += 1
+            if i < len(args) and args[i] in ("~", "="):
+                approximate = args[i] == "~"
+                i += 1
+            try:
+                maxlen = int(args[i]) if i < len(args) else -1
+            except ValueError:
+                maxlen = -1
+            if maxlen < 0:
+                return "ERROR: MAXLEN must be a non-negative integer"
+            i += 1
+
+        pairs = args[i + 1:]
+        if i >= len(args) or not pairs or len(pairs) % 2:
+            return "ERROR: XADD requires an ID followed by field value pairs"
+
+        db = self.db
+        key = args[0]
+        requested = args[i]
+        if requested != "*" and parse_id(requested.removesuffix("-*")) is None:
+            return "ERROR: Invalid stream ID specified as stream command argument"
+
+        stream, error = self.lookup_typed(
+            key,
+            Stream,
+            create=True,
+            factory=lambda: Stream(db.stream_chunk_size)
+        )
+        if error:
+            return error
+
+        if requested == "*":
+            entry_id = stream.next_id()
+        elif requested.endswith("-*"):
+            entry_id = stream.next_id(int(requested[:-2]))
+        else:
+            entry_id = parse_id(requested)
+
+        if entry_id is None or entry_id <= stream.last_id:
+            if not stream:
+                db.delete(key)
+            return "ERROR: The ID specified in XADD is equal or smaller than the target stream top item"
+
+        stream.add(entry_id, pairs)
+        if maxlen is not None:
+            stream.trim(maxlen, approximate)
+
+        db.signal_modified(key)
+        return format_id(entry_id)
+
+
+class XLenCommand(Command):
+    """XLEN Command used to count the entries of a stream"""
+
+    name = "XLEN"
+    min_args = 1
+    max_args = 1
+    description = "Get the number of entries in a stream."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        stream, error = self.lookup_typed(args[0], Stream)
+        if error:
+            return error
+
+        return str(len(stream) if stream is not None else 0)
+
+
+class XRangeCommand(Command):
+    """XRANGE Command used to fetch the entries of a stream between two IDs"""
+
+    name = "XRANGE"
+    min_args = 3
+    max_args = 5
+    description = "Return the entries of a stream with IDs between start and end: XRANGE key start end [COUNT n]."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        count = None
+        if len(args) > 3:
+            if len(args) != 5 or args[3].upper() != "COUNT":
+                return f"ERROR: Invalid option '{args[3]}'"
+            try:
+                count = int(args[4])
+            except ValueError:
+                return "ERROR: count must be an integer"
+
+        start = self.parse_bound(args[1], 0)
+        end = self.parse_bound(args[2], (1 << 64) - 1)
+        if start is False or end is False:
+            return "ERROR: Invalid stream ID specified as stream command argument"
+
+        stream, error = self.lookup_typed(args[0], Stream)
+        if error:
+            return error
+        if stream is None:
+            return format_list([])
+
+        return format_entries(stream.range(start, end, count))
+
+    @staticmethod
+    def parse_bound(text: str, default_seq: int) -> Union[StreamID, None, bool]:
+        """
+        Parses a range bound: - or +, an ID, or an ID prefixed with ( to exclude it.
+
+        Returns:
+            The inclusive bound, None for an open end or False if the bound is invalid
+        """
+        if text in ("-", "+"):
+            return None
+
+        exclusive = text.startswith("(")
+        entry_id = parse_id(text[1:] if exclusive else text, default_seq)
+        if entry_id is None:
+            return False
+        if not exclusive:
+            return entry_id
+
+        if default_seq:
+            # An exclusive end is the ID just before it
+            ms, seq = entry_id
+            if seq:
+                return ms, seq - 1
+            return (ms - 1, default_seq) if ms else False
+
+        bound = next_id(entry_id)
+        return bound if bound is not None else False
+
+
+class XReadCommand(Command):
+    """XREAD Command used to fetch the entries added to streams after given IDs"""
+
+    name = "XREAD"
+    min_args = 3
+    description = "Return the entries of streams with IDs greater than the given ones: XREAD [COUNT n] STREAMS key... id..."
+
+    def execute(self, args: List[str]) -> str:
+        error = self.validate_args(args)
+
+        if error:
+            return error
+
+        count = None
+        i = 0
+        if args[0].upper() == "COUNT":
+            try:
+                count = int(args[1])
+            except ValueError:
+                return "ERROR: count must be an integer"
+            i = 2
+
+        if i >= len(args) or args[i].upper() != "STREAMS":
+            return "ERROR: XREAD requires STREAMS followed by keys and IDs"
+
+        names = args[i + 1:]
+        if not names or len(names) % 2:
+            return "ERROR: XREAD requires an ID for every stream"
+
+        half = len(names) // 2
+        keys, ids = names[:half], names[half:]
+
+        replies = []
+        for key, text in zip(keys, ids):
+            stream, error = self.lookup_typed(key, Stream)
+            if error:
+                return error
+
+            if text == "$":
+                # Only entries added from now on, which a non blocking read never sees
+                continue
+
+            entry_id = parse_id(text)
+            if entry_id is None:
+                return "ERROR: Invalid stream ID specified as stream command argument"
+            if stream is None:
+                continue
+
+            start = next_id(entry_id)
+            entries = stream.range(start, None, count) if start is not None else []
+            if entries:
+                nested = format_entries(entries).replace("\n", "\n   ")
+                replies.append(f"1) {key}\n2) {nested}".replace("\n", "\n   "))
+
+        return format_list(replies)
+
+
+class CommandFactory:
+    """Factory for creating and registering all available commands."""
+    
+    @staticmethod
+    def create_all_commands() -> List[Type[Command]]:
+        """Get a list of all available command classes."""
+        return [
+            SetCommand,
+            GetCommand,
+            MGetCommand,
+            MSetCommand,
+            MSetNXCommand,
+            DelCommand,
+            ExistsCommand,
+            ExpireCommand,
+            TtlCommand,
+            
+            AppendCommand,
+            IncrCommand,
+            DecrCommand,
+            IncrByCommand,
+            DecrByCommand,
+            IncrByFloatCommand,
+            KeysCommand,
+            ScanCommand,
+            FlushDBCommand,
+            InfoCommand,
+            SlowlogCommand,
+            
+            MultiCommand,
+            ExecCommand,
+            DiscardCommand,
+            WatchCommand,
+            UnwatchCommand,
+
+            ZAddCommand,
+            ZRemCommand,
+            ZIncrByCommand,
+            ZScoreCommand,
+            ZCardCommand,
+            ZCountCommand,
+            ZRankCommand,
+            ZRevRankCommand,
+            ZRangeCommand,
+            ZRevRangeCommand,
+            ZRangeByScoreCommand,
+            ZRevRangeByScoreCommand,
+            ZScanCommand,
+
+            LPushCommand,
+            RPushCommand,
+            LPopCommand,
+            RPopCommand,
+            LRangeCommand,
+            LIndexCommand,
+            LLenCommand,
+
+            HSetCommand,
+            HGetCommand,
+            HMGetCommand,
+            HGetAllCommand,
+            HIncrByCommand,
+            HDelCommand,
+            HLenCommand,
+            HScanCommand,
+
+            SAddCommand,
+            SRemCommand,
+            SIsMemberCommand,
+            SMembersCommand,
+            SCardCommand,
+            SInterCommand,
+            SUnionCommand,
+            SDiffCommand,
+            SScanCommand,
+
+            PFAddCommand,
+            PFCountCommand,
+            PFMergeCommand,
+
+            SetBitCommand,
+            GetBitCommand,
+            BitCountCommand,
+            BitPosCommand,
+            BitOpCommand,
+
+            BFReserveCommand,
+            BFAddCommand,
+            BFMAddCommand,
+            BFExistsCommand,
+            BFMExistsCommand,
+
+            XAddCommand,
+            XLenCommand,
+            XRangeCommand,
+            XReadCommand,
         ]
\ No newline at end of file
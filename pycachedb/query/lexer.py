@@ -1,8 +1,9 @@
+import re
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Dict, Callable, Union, FrozenSet
 
 class TokenType(Enum):
-    
+
     """Enum class representing different types of tokens in the query language"""
     COMMAND = 1
     IDENTIFIER = 2
@@ -13,7 +14,9 @@ class TokenType(Enum):
 
 
 class Token:
-    
+
+    __slots__ = ("type", "value", "position")
+
     def __init__(
         self,
         token_type: TokenType,
@@ -31,9 +34,298 @@ class Token:
         self.type = token_type
         self.value = value
         self.position = position
-    
+
     def __str__(self) -> str:
         return f"Token({self.type}, '{self.value}', pos={self.position})"
-    
+
     def __repr__(self) -> str:
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+class LexerError(ValueError):
+    """Raised when a query cannot be tokenized"""
+
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+
+# Option keywords that are tokenized as flags, matched case-insensitively
+FLAGS: FrozenSet[str] = frozenset({
+    "EX", "PX", "NX", "XX", "CH", "GT", "LT",
+    "WITHSCORES", "LIMIT", "MATCH", "COUNT", "TYPE",
+})
+
+# The scanner is shared between str queries and memoryviews over raw bytes, so the
+# character classes exist both as str and as bytes. The compiled searches are only
+# used to jump to the next delimiter at C speed, they never backtrack.
+_STR_WHITESPACE = frozenset(" \t\r\n")
+_STR_QUOTES = frozenset("\"'")
+_STR_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "\"": "\"", "'": "'"}
+_STR_WORD_END = re.compile("[ \t\r\n]").search
+_STR_STRING_STOP = {"\"": re.compile('["\\\\]').search, "'": re.compile("['\\\\]").search}
+
+_BYTE_WHITESPACE = frozenset(b" \t\r\n")
+_BYTE_QUOTES = frozenset(b"\"'")
+_BYTE_ESCAPES = {ord(key): value for key, value in _STR_ESCAPES.items()}
+_BYTE_WORD_END = re.compile(b"[ \t\r\n]").search
+_BYTE_STRING_STOP = {ord("\""): re.compile(b'["\\\\]').search, ord("'"): re.compile(b"['\\\\]").search}
+
+_NUMBER_START = frozenset("0123456789+-.")
+
+
+def _is_number(word: str) -> bool:
+    """Checks whether an unquoted word is an integer or decimal literal"""
+    if word[0] not in _NUMBER_START:
+        return False
+
+    digits = word[1:] if word[0] in "+-" else word
+    return digits.replace(".", "", 1).isdigit()
+
+
+def _utf8_width(lead: int) -> int:
+    """Returns the length of the UTF-8 sequence starting with a lead byte"""
+    if lead < 0xC0:
+        return 1
+    if lead < 0xE0:
+        return 2
+    if lead < 0xF0:
+        return 3
+    return 4
+
+
+def _decode_bytes(view: memoryview) -> str:
+    """Decodes a slice of a byte buffer without an intermediate bytes copy"""
+    return str(view, "utf-8")
+
+
+class Lexer:
+    """
+    Single-pass scanner turning queries into tokens.
+
+    The query is walked once with an index that only moves forward. Unquoted words
+    and quoted strings without escapes are cut out with a single slice after jumping
+    to their end delimiter, only strings containing backslash escapes are assembled
+    piece by piece. The first word becomes the
+    COMMAND token and every token list ends with an END token.
+    """
+
+    def tokenize(self, query: str) -> List[Token]:
+        """
+        Tokenizes a query string.
+
+        Args:
+            query: The query to tokenize
+
+        Returns:
+            List of tokens ending with an END token
+
+        Raises:
+            LexerError: If a quoted string is not terminated
+        """
+        return self._scan(
+            query,
+            _STR_WHITESPACE,
+            _STR_QUOTES,
+            _STR_ESCAPES,
+            _STR_WORD_END,
+            _STR_STRING_STOP,
+            None
+        )
+
+    def tokenize_buffer(self, buffer: Union[memoryview, bytes, bytearray]) -> List[Token]:
+        """
+        Tokenizes a query straight from a UTF-8 byte buffer.
+
+        Tokens are decoded from memoryview slices of the buffer, so the query is
+        never copied into an intermediate string. Positions are byte offsets.
+
+        Args:
+            buffer: The raw query bytes, typically a slice of a socket buffer
+
+        Returns:
+            List of tokens ending with an END token
+
+        Raises:
+            LexerError: If a quoted string is not terminated
+        """
+        if not isinstance(buffer, memoryview):
+            buffer = memoryview(buffer)
+
+        return self._scan(
+            buffer,
+            _BYTE_WHITESPACE,
+            _BYTE_QUOTES,
+            _BYTE_ESCAPES,
+            _BYTE_WORD_END,
+            _BYTE_STRING_STOP,
+            _decode_bytes
+        )
+
+    def _scan(
+        self,
+        source: Union[str, memoryview],
+        whitespace: FrozenSet,
+        quotes: FrozenSet,
+        escapes: Dict,
+        word_end: Callable,
+        string_stop: Dict,
+        decode: Optional[Callable[[memoryview], str]]
+    ) -> List[Token]:
+        """
+        Scans the source once and emits the tokens.
+
+        Args:
+            source: The query as a str or a memoryview of bytes
+            whitespace: Characters separating tokens
+            quotes: Characters opening and closing strings
+            escapes: Mapping from the character after a backslash to its replacement
+            word_end: Finds the next whitespace from a position
+            string_stop: Per quote character, finds the next closing quote or backslash
+            decode: Converts a slice of source to str, None when source is a str
+
+        Returns:
+            List of tokens ending with an END token
+        """
+        tokens: List[Token] = []
+        append = tokens.append
+        length = len(source)
+        position = 0
+        # Enum members are class attribute lookups, binding them locally is noticeably faster
+        make_token = Token
+        STRING, COMMAND, NUMBER, FLAG, IDENTIFIER = (
+            TokenType.STRING, TokenType.COMMAND, TokenType.NUMBER, TokenType.FLAG, TokenType.IDENTIFIER
+        )
+
+        while True:
+            # Skipping the whitespace between tokens
+            while position < length and source[position] in whitespace:
+                position += 1
+
+            if position >= length:
+                break
+
+            start = position
+            quote = source[position]
+
+            if quote in quotes:
+                stop = string_stop[quote]
+                position += 1
+                parts: Optional[List[str]] = None
+
+                while True:
+                    match = stop(source, position)
+                    if match is None:
+                        raise LexerError("Unterminated string", start)
+
+                    end = match.start()
+                    piece = source[position:end]
+                    value = decode(piece) if decode else piece
+
+                    if source[end] == quote:
+                        break
+
+                    # Escapes are rare, the parts list only exists once one is seen
+                    if parts is None:
+                        parts = []
+                    parts.append(value)
+
+                    if end + 1 >= length:
+                        raise LexerError("Unterminated string", start)
+
+                    escaped = source[end + 1]
+                    replacement = escapes.get(escaped)
+                    width = 1
+                    if replacement is None:
+                        # Unknown escapes keep the character as is, a whole UTF-8 sequence in a buffer
+                        if decode:
+                            width = _utf8_width(escaped)
+                        piece = source[end + 1:end + 1 + width]
+                        replacement = decode(piece) if decode else piece
+                    parts.append(replacement)
+                    position = end + 1 + width
+
+                if parts is not None:
+                    parts.append(value)
+                    value = "".join(parts)
+
+                position = end + 1
+                append(make_token(STRING, value, start))
+                continue
+
+            match = word_end(source, position)
+            position = match.start() if match is not None else length
+
+            piece = source[start:position]
+            word = decode(piece) if decode else piece
+
+            if not tokens:
+                append(make_token(COMMAND, word, start))
+            elif word[0] in _NUMBER_START and _is_number(word):
+                append(make_token(NUMBER, word, start))
+            elif word.upper() in FLAGS:
+                append(make_token(FLAG, word, start))
+            else:
+                append(make_token(IDENTIFIER, word, start))
+
+        append(Token(TokenType.END, "", length))
+        return tokens
+
+
+class StreamLexer:
+    """
+    Incremental lexer for newline delimited queries arriving in chunks.
+
+    Received bytes are appended to an internal buffer. Every complete line is
+    tokenized in place through a memoryview and consumed, while a trailing partial
+    line is kept until the rest of it arrives. A malformed line is consumed too,
+    its error takes its place among the queries so the lines around it still run.
+    """
+
+    def __init__(self) -> None:
+        self.lexer = Lexer()
+        self.buffer = bytearray()
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> List[Union[List[Token], LexerError]]:
+        """
+        Adds received bytes and tokenizes every completed query.
+
+        Args:
+            data: Bytes read from the socket
+
+        Returns:
+            List with one entry per complete non-empty line, in order: its tokens,
+            or the LexerError of a line that could not be tokenized
+        """
+        buffer = self.buffer
+        buffer += data
+        queries: List[Union[List[Token], LexerError]] = []
+        consumed = 0
+
+        with memoryview(buffer) as view:
+            while True:
+                end = buffer.find(b"\n", consumed)
+                if end == -1:
+                    break
+
+                line_end = end - 1 if end > consumed and buffer[end - 1] == 13 else end
+                line_start = consumed
+                consumed = end + 1
+
+                try:
+                    with view[line_start:line_end] as line:
+                        tokens = self.lexer.tokenize_buffer(line)
+                except LexerError as error:
+                    # The traceback holds frames that still reference slices of the view
+                    queries.append(error.with_traceback(None))
+                    continue
+                except UnicodeDecodeError as error:
+                    queries.append(LexerError("Invalid UTF-8", error.start))
+                    continue
+
+                if len(tokens) > 1:
+                    queries.append(tokens)
+
+        # The view has to be released before the buffer can shrink
+        del buffer[:consumed]
+        return queries
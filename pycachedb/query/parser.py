@@ -0,0 +1,297 @@
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Union, Callable, Any, Optional
+
+from pycachedb.query.commands import Command, CommandRegistry
+from pycachedb.query.lexer import Lexer, LexerError, TokenType
+
+# Unquoted placeholder marking a parameter in a prepared query, a quoted '?' stays literal
+PLACEHOLDER = "?"
+
+class ParseError(ValueError):
+    """Raised when a query cannot be turned into a command call"""
+
+
+class PreparedCommand:
+    """
+    A parameterized query resolved once to a command and a validated argument layout.
+
+    Running it fills the parameters into a copy of the template and calls the
+    runner the command returned from prepare, so no lexing, dispatch or option
+    parsing happens per call.
+    """
+
+    __slots__ = ("command", "template", "fields", "param_count", "runner", "dispatch")
+
+    def __init__(
+        self,
+        command: Command,
+        template: List[str],
+        fields: List[Tuple[int, Optional[List[str]]]],
+        runner: Callable[[List[str]], str],
+        dispatch: Callable[[Command, List[str], Callable[[List[str]], str]], str]
+    ) -> None:
+        """
+        Initializes the prepared command.
+
+        Args:
+            command: The resolved command
+            template: Argument list as written in the query
+            fields: For every argument holding placeholders, its index and the literal
+                pieces around the placeholders, None when the argument is a bare ?
+            runner: Callable executing a filled in argument list
+            dispatch: Routes a run through the database, e.g. to queue it in a transaction
+        """
+        self.command = command
+        self.template = template
+        self.fields = fields
+        self.param_count = sum(1 if pieces is None else len(pieces) - 1 for _, pieces in fields)
+        self.runner = runner
+        self.dispatch = dispatch
+
+    def run(self, *params: Any) -> str:
+        """
+        Executes the command with the given parameters.
+
+        Args:
+            params: One value per placeholder, in query order
+
+        Returns:
+            The reply of the command
+        """
+        if len(params) != self.param_count:
+            return f"ERROR: Expected {self.param_count} parameter(s), got {len(params)}"
+
+        args = self.template.copy()
+        position = 0
+
+        for index, pieces in self.fields:
+            if pieces is None:
+                param = params[position]
+                args[index] = param if param.__class__ is str else str(param)
+                position += 1
+                continue
+
+            if len(pieces) == 2:
+                # One placeholder embedded in a word, e.g. user:?
+                args[index] = f"{pieces[0]}{params[position]}{pieces[1]}"
+                position += 1
+                continue
+
+            # Several placeholders in one word are joined with the literal pieces
+            parts = [pieces[0]]
+            for piece in pieces[1:]:
+                parts.append(str(params[position]))
+                parts.append(piece)
+                position += 1
+            args[index] = "".join(parts)
+
+        return self.dispatch(self.command, args, self.runner)
+
+
+class Parser:
+    """
+    Turns query strings into dispatched Command.execute calls.
+
+    The command name is resolved with a single lookup in the registry's dict of
+    command instances. Parsed queries are kept in a small LRU keyed by the raw
+    query string, so a repeated query skips lexing and dispatch entirely. Queries
+    without quotes or whitespace other than spaces are split at C speed instead
+    of going through the lexer.
+    """
+
+    def __init__(self, registry: CommandRegistry, cache_size: int = 1024) -> None:
+        """
+        Initializes the parser.
+
+        Args:
+            registry: The registry holding the command instances to dispatch to
+            cache_size: Number of parsed queries to remember, 0 disables the cache
+        """
+        self.lexer = Lexer()
+        self.registry = registry
+        # Command names are registered upper case, so this is the whole dispatch table
+        self.dispatch: Dict[str, Command] = registry.commands
+        self.cache_size = cache_size
+        # OrderedDict keeps the recency order in C, the query string is its own key
+        self.cache: "OrderedDict[str, Tuple[Command, List[str]]]" = OrderedDict()
+
+    def parse(self, query: str) -> Tuple[Command, List[str]]:
+        """
+        Resolves a query to its command and argument list.
+
+        The returned argument list may be shared with later identical queries, so
+        callers must treat it as read only.
+
+        Args:
+            query: The query to parse
+
+        Returns:
+            Tuple of (command, args)
+
+        Raises:
+            ParseError: If the query is empty, malformed or names an unknown command
+        """
+        cache = self.cache
+        parsed = cache.get(query)
+
+        if parsed is not None:
+            cache.move_to_end(query)
+            return parsed
+
+        if "'" in query or '"' in query or "\t" in query or "\n" in query or "\r" in query:
+            try:
+                tokens = self.lexer.tokenize(query)
+            except LexerError as error:
+                raise ParseError(str(error)) from None
+            words = [token.value for token in tokens[:-1]]
+        else:
+            # Without quotes or other whitespace the lexer would only split on spaces
+            words = query.split(" ")
+            if "" in words:
+                words = [word for word in words if word]
+
+        if not words:
+            raise ParseError("Empty query")
+
+        name = words[0]
+        command = self.dispatch.get(name)
+        if command is None:
+            command = self.dispatch.get(name.upper())
+            if command is None:
+                raise ParseError(f"Unknown command '{name}'")
+
+        parsed = (command, words[1:])
+
+        if self.cache_size > 0:
+            cache[query] = parsed
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+        return parsed
+
+    def parse_many(self, queries: List[str]) -> List[Union[Tuple[Command, List[str]], ParseError]]:
+        """
+        Parses a batch of queries in one call.
+
+        Bulk queries are usually one-off, so they neither populate nor reorder
+        the parse cache. Queries that fail to parse yield their ParseError in
+        place instead of raising, so one bad query does not abort the batch.
+
+        Args:
+            queries: The queries to parse
+
+        Returns:
+            A (command, args) tuple or a ParseError for every query, in order
+        """
+        dispatch = self.dispatch
+        cache_get = self.cache.get
+        parsed: List[Union[Tuple[Command, List[str]], ParseError]] = []
+        append = parsed.append
+
+        for query in queries:
+            cached = cache_get(query)
+            if cached is not None:
+                append(cached)
+                continue
+
+            if "'" in query or '"' in query or "\t" in query or "\n" in query or "\r" in query:
+                try:
+                    tokens = self.lexer.tokenize(query)
+                except LexerError as error:
+                    append(ParseError(str(error)))
+                    continue
+                words = [token.value for token in tokens[:-1]]
+            else:
+                words = query.split(" ")
+                if "" in words:
+                    words = [word for word in words if word]
+
+            if not words:
+                append(ParseError("Empty query"))
+                continue
+
+            command = dispatch.get(words[0])
+            if command is None:
+                command = dispatch.get(words[0].upper())
+                if command is None:
+                    append(ParseError(f"Unknown command '{words[0]}'"))
+                    continue
+
+            append((command, words[1:]))
+
+        return parsed
+
+    def prepare(
+        self,
+        query: str,
+        dispatch: Callable[[Command, List[str], Callable[[List[str]], str]], str]
+    ) -> PreparedCommand:
+        """
+        Parses a query containing ? placeholders into a reusable prepared command.
+
+        Args:
+            query: The parameterized query, e.g. "SET session:? ? EX ?"
+            dispatch: Routes each run through the database
+
+        Returns:
+            The prepared command
+
+        Raises:
+            ParseError: If the query is malformed, names an unknown command, or the
+                command rejects the argument layout
+        """
+        try:
+            tokens = self.lexer.tokenize(query)
+        except LexerError as error:
+            raise ParseError(str(error)) from None
+
+        if len(tokens) == 1:
+            raise ParseError("Empty query")
+
+        if tokens[0].value == PLACEHOLDER:
+            raise ParseError("The command name cannot be a parameter")
+
+        name = tokens[0].value
+        command = self.dispatch.get(name.upper())
+        if command is None:
+            raise ParseError(f"Unknown command '{name}'")
+
+        # The last token is END, everything between it and the command is an argument
+        arguments = tokens[1:-1]
+        template = [token.value for token in arguments]
+        fields: List[Tuple[int, Optional[List[str]]]] = []
+
+        for index, token in enumerate(arguments):
+            if token.type is TokenType.STRING or PLACEHOLDER not in token.value:
+                continue
+            if token.value == PLACEHOLDER:
+                fields.append((index, None))
+            else:
+                fields.append((index, token.value.split(PLACEHOLDER)))
+
+        runner, error = command.prepare(template, [index for index, _ in fields])
+        if error:
+            raise ParseError(error[len("ERROR: "):] if error.startswith("ERROR: ") else error)
+
+        return PreparedCommand(command, template, fields, runner, dispatch)
+
+    def execute(self, query: str) -> str:
+        """
+        Parses a query and executes the resulting command.
+
+        Args:
+            query: The query to execute
+
+        Returns:
+            The command's reply, or an error message if the query could not be parsed
+        """
+        try:
+            command, args = self.parse(query)
+        except ParseError as error:
+            return f"ERROR: {error}"
+
+        return command.execute(args)
+
+    def clear_cache(self) -> None:
+        """Forgets all parsed queries"""
+        self.cache.clear()
@@ -0,0 +1,446 @@
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Number of collections whose scan index is kept, the least recently scanned one is dropped
+MAX_SCAN_INDEXES = 64
+
+# Stale entries a key index tolerates beyond its live keys before it is compacted
+KEY_INDEX_SLACK = 32
+
+# A collection cursor packs the id of its index in the high bits and a sequence number in the low bits
+CURSOR_OFFSET_BITS = 32
+CURSOR_OFFSET_MASK = (1 << CURSOR_OFFSET_BITS) - 1
+
+_GLOB_SPECIAL = frozenset("*?[\\")
+
+
+class GlobPattern:
+    """
+    A glob pattern compiled once into the cheapest matcher that can decide it.
+
+    Patterns without wildcards compare for equality and patterns of the form
+    prefix* only check the prefix. Everything else is matched with a regex, but
+    the literal prefix in front of the first wildcard is checked first, so most
+    non-matching keys are rejected without running the regex.
+
+    Supports *, ?, [abc], [a-z], [^abc] and backslash escapes.
+    """
+
+    __slots__ = ("pattern", "prefix", "match_all", "match")
+
+    def __init__(self, pattern: str) -> None:
+        """
+        Compiles the pattern.
+
+        Args:
+            pattern: The glob pattern
+        """
+        self.pattern = pattern
+        regex, prefix, literal = _translate(pattern)
+        self.prefix = prefix
+        self.match_all = regex == ".*"
+
+        self.match: Callable[[str], bool]
+        if literal:
+            self.match = prefix.__eq__
+        elif regex == re.escape(prefix) + ".*":
+            self.match = lambda key: key.startswith(prefix)
+        else:
+            fullmatch = re.compile(regex, re.DOTALL).fullmatch
+            self.match = lambda key: key.startswith(prefix) and fullmatch(key) is not None
+
+    def filter(self, keys: List[str]) -> List[str]:
+        """
+        Selects the matching keys.
+
+        Args:
+            keys: The keys to test
+
+        Returns:
+            The matching keys, in order
+        """
+        if self.match_all:
+            return list(keys)
+
+        return list(filter(self.match, keys))
+
+
+def _translate(pattern: str) -> Tuple[str, str, bool]:
+    """
+    Translates a glob pattern into a regex.
+
+    Returns:
+        Tuple of (regex, literal prefix, whether the pattern has no wildcards)
+    """
+    parts: List[str] = []
+    prefix: Optional[str] = None
+    literal_chars: List[str] = []
+    i = 0
+    length = len(pattern)
+
+    while i < length:
+        char = pattern[i]
+
+        if char == "\\":
+            # A trailing backslash matches itself
+            escaped = pattern[i + 1] if i + 1 < length else char
+            literal_chars.append(escaped)
+            parts.append(re.escape(escaped))
+            i += 2
+            continue
+
+        if char not in _GLOB_SPECIAL:
+            literal_chars.append(char)
+            parts.append(re.escape(char))
+            i += 1
+            continue
+
+        if char == "[":
+            end = _class_end(pattern, i + 1)
+            if end == -1:
+                # An unclosed bracket is matched literally
+                literal_chars.append(char)
+                parts.append(re.escape(char))
+                i += 1
+                continue
+            class_regex = _translate_class(pattern[i + 1:end])
+        else:
+            class_regex = None
+
+        if prefix is None:
+            prefix = "".join(literal_chars)
+
+        if char == "*":
+            # Consecutive stars match the same as one
+            if not parts or parts[-1] != ".*":
+                parts.append(".*")
+            i += 1
+        elif char == "?":
+            parts.append(".")
+            i += 1
+        else:
+            parts.append(class_regex)
+            i = end + 1
+
+    if prefix is None:
+        return "".join(parts), "".join(literal_chars), True
+
+    return "".join(parts), prefix, False
+
+
+def _class_end(pattern: str, start: int) -> int:
+    """Finds the closing bracket of a character class, -1 if there is none"""
+    i = start
+    if i < len(pattern) and pattern[i] in "^!":
+        i += 1
+
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+            continue
+        if pattern[i] == "]":
+            return i
+        i += 1
+
+    return -1
+
+
+def _translate_class(body: str) -> str:
+    """Translates the inside of a [...] character class"""
+    negate = body[:1] in ("^", "!")
+    if negate:
+        body = body[1:]
+
+    items: List[str] = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "\\" and i + 1 < len(body):
+            char = body[i + 1]
+            i += 1
+
+        if i + 2 < len(body) and body[i + 1] == "-":
+            end = body[i + 2]
+            low, high = min(char, end), max(char, end)
+            items.append(f"{re.escape(low)}-{re.escape(high)}")
+            i += 3
+        else:
+            items.append(re.escape(char))
+            i += 1
+
+    if not items:
+        # An empty class matches nothing, a negated empty class any character
+        return "." if negate else "(?!)"
+
+    return f"[{'^' if negate else ''}{''.join(items)}]"
+
+
+@lru_cache(maxsize=256)
+def compile_glob(pattern: str) -> GlobPattern:
+    """
+    Compiles a glob pattern, reusing the compiled form of recently seen patterns.
+
+    Args:
+        pattern: The glob pattern
+
+    Returns:
+        The compiled pattern
+    """
+    return GlobPattern(pattern)
+
+
+class KeyIndex:
+    """
+    Insertion ordered index of a keyspace, giving SCAN stateless cursors.
+
+    A key gets an increasing sequence number when it is created and the index
+    lists the keys in that order. A cursor is the sequence number to resume
+    from, found by bisection, so starting an iteration copies nothing and a
+    call looks at count entries. Deleted keys are left in place and skipped,
+    and once most of the index is stale it is compacted, which keeps the order,
+    so no cursor is ever invalidated however many iterations are running.
+
+    Keys present for the whole iteration are returned exactly once, keys
+    created meanwhile are returned too since they come after every cursor.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        """
+        Initializes an empty index.
+
+        Args:
+            data: The keyspace, a key is live while it is in it
+        """
+        self.data = data
+        self.seqs: List[int] = []
+        self.keys: List[str] = []
+        # Sequence number of the latest entry of every indexed key, older entries are stale
+        self.key_seqs: Dict[str, int] = {}
+        self.next_seq = 1
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str) -> None:
+        """Appends a key that was just created"""
+        seq = self.next_seq
+        self.next_seq += 1
+        self.seqs.append(seq)
+        self.keys.append(key)
+        self.key_seqs[key] = seq
+
+        if len(self.keys) > 2 * len(self.data) + KEY_INDEX_SLACK:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drops the entries of deleted and recreated keys, keeping the order of the others"""
+        data, key_seqs = self.data, self.key_seqs
+        live = [
+            (seq, key) for seq, key in zip(self.seqs, self.keys)
+            if key in data and key_seqs[key] == seq
+        ]
+        self.seqs = [seq for seq, _ in live]
+        self.keys = [key for _, key in live]
+        self.key_seqs = {key: seq for seq, key in live}
+
+    def scan(self, cursor: int, count: int) -> Tuple[int, List[str]]:
+        """
+        Returns the live keys among the next count entries.
+
+        Args:
+            cursor: 0 to start an iteration, otherwise the cursor of the previous call
+            count: Number of entries to look at
+
+        Returns:
+            Tuple of (next cursor, keys), the next cursor is 0 once the iteration is done
+
+        Raises:
+            ValueError: If the cursor was never handed out
+        """
+        if cursor >= self.next_seq:
+            raise ValueError("Invalid cursor")
+
+        start = bisect_left(self.seqs, cursor)
+        end = start + count
+        data, key_seqs = self.data, self.key_seqs
+        keys = [
+            key for seq, key in zip(self.seqs[start:end], self.keys[start:end])
+            if key in data and key_seqs[key] == seq
+        ]
+
+        return (self.seqs[end] if end < len(self.seqs) else 0), keys
+
+    def clear(self) -> None:
+        """Drops every entry, sequence numbers keep increasing so old cursors stay valid"""
+        self.seqs.clear()
+        self.keys.clear()
+        self.key_seqs.clear()
+
+
+class CollectionIndex:
+
+    __slots__ = ("index_id", "source", "seqs", "elements", "next_seq")
+
+    def __init__(self, index_id: int, source: Any, elements: List[Any]) -> None:
+        """
+        Initializes an index listing the elements of a collection.
+
+        Args:
+            index_id: Identifier of the index, packed into its cursors
+            source: The collection indexed
+            elements: Its elements, numbered in this order
+        """
+        self.index_id = index_id
+        self.source = source
+        self.elements = elements
+        self.seqs = list(range(1, len(elements) + 1))
+        self.next_seq = len(elements) + 1
+
+    def refresh(self, elements: List[Any]) -> None:
+        """
+        Brings the index up to date, dropping removed elements and appending new ones.
+
+        The remaining elements keep their sequence numbers and order, so the
+        cursors handed out before stay valid.
+
+        Args:
+            elements: The current elements of the collection
+        """
+        current = set(elements)
+        kept = [(seq, element) for seq, element in zip(self.seqs, self.elements) if element in current]
+        known = {element for _, element in kept}
+        added = [element for element in elements if element not in known]
+
+        self.seqs = [seq for seq, _ in kept] + list(range(self.next_seq, self.next_seq + len(added)))
+        self.elements = [element for _, element in kept] + added
+        self.next_seq += len(added)
+
+
+class ScanCursors:
+    """
+    Gives SCAN style iterations over collections resumable cursors.
+
+    A collection being scanned gets an index listing its elements under
+    increasing sequence numbers, shared by every iteration over it. A cursor
+    packs the id of the index in the high bits and the sequence number to
+    resume from in the low bits, so an iteration keeps no state of its own and
+    any number of them can run at once. Starting an iteration brings the index
+    up to date, which keeps the order of the remaining elements, so running
+    cursors stay valid. Elements present for the whole iteration are returned
+    exactly once, elements added meanwhile may be missed and callers filter out
+    elements removed meanwhile. Collections that fit in a single reply are
+    returned without an index.
+
+    At most max_indexes collections are indexed, the least recently scanned one
+    is dropped. A cursor of a dropped index restarts its iteration, which may
+    return elements again but never misses one.
+    """
+
+    def __init__(self, max_indexes: int = MAX_SCAN_INDEXES) -> None:
+        """
+        Initializes the cursor registry.
+
+        Args:
+            max_indexes: Number of collections whose index is kept
+        """
+        self.max_indexes = max_indexes
+        self.indexes: "OrderedDict[int, CollectionIndex]" = OrderedDict()
+        # Index id of every indexed collection, by the id() of the collection
+        self.by_source: Dict[int, int] = {}
+        self.next_index = 1
+
+    def scan(
+        self,
+        source: Any,
+        cursor: int,
+        count: int,
+        snapshot: Callable[[], List[Any]]
+    ) -> Tuple[int, List[Any]]:
+        """
+        Returns the next batch of an iteration.
+
+        Args:
+            source: The collection being iterated, a cursor is only valid for its own collection
+            cursor: 0 to start an iteration, otherwise the cursor of the previous call
+            count: Number of elements to return
+            snapshot: Lists the elements of source, called when an iteration starts or restarts
+
+        Returns:
+            Tuple of (next cursor, elements), the next cursor is 0 once the iteration is done
+
+        Raises:
+            ValueError: If the cursor was never handed out or belongs to another collection
+        """
+        position = 0
+
+        if cursor == 0:
+            index = self._start(source, count, snapshot)
+        else:
+            index_id, seq = cursor >> CURSOR_OFFSET_BITS, cursor & CURSOR_OFFSET_MASK
+            if index_id >= self.next_index:
+                raise ValueError("Invalid cursor")
+
+            index = self.indexes.get(index_id)
+            if index is None:
+                # The index was dropped, the iteration starts over
+                index = self._start(source, count, snapshot)
+            elif index.source is not source:
+                raise ValueError("Invalid cursor")
+            else:
+                self.indexes.move_to_end(index_id)
+                position = bisect_left(index.seqs, seq)
+
+        if isinstance(index, list):
+            return 0, index
+
+        end = position + count
+        batch = index.elements[position:end]
+        if end >= len(index.elements):
+            return 0, batch
+
+        return (index.index_id << CURSOR_OFFSET_BITS) | index.seqs[end], batch
+
+    def _start(
+        self,
+        source: Any,
+        count: int,
+        snapshot: Callable[[], List[Any]]
+    ) -> Union[CollectionIndex, List[Any]]:
+        """Returns the up to date index of a collection, or its elements if they fit in one reply"""
+        elements = snapshot()
+        index_id = self.by_source.get(id(source))
+        index = self.indexes.get(index_id) if index_id is not None else None
+
+        if index is not None and index.next_seq + len(elements) <= CURSOR_OFFSET_MASK:
+            index.refresh(elements)
+            self.indexes.move_to_end(index_id)
+            return index
+
+        if len(elements) <= count:
+            return elements
+
+        if index is not None:
+            # Sequence numbers ran out, the collection gets a new index
+            self._drop(index_id)
+
+        index = CollectionIndex(self.next_index, source, elements)
+        self.next_index += 1
+        self.indexes[index.index_id] = index
+        self.by_source[id(source)] = index.index_id
+        if len(self.indexes) > self.max_indexes:
+            self._drop(next(iter(self.indexes)))
+
+        return index
+
+    def _drop(self, index_id: int) -> None:
+        """Forgets an index"""
+        index = self.indexes.pop(index_id)
+        del self.by_source[id(index.source)]
+
+    def clear(self) -> None:
+        """Drops every index"""
+        self.indexes.clear()
+        self.by_source.clear()
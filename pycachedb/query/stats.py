@@ -0,0 +1,271 @@
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+# Percentiles reported per command in the COMMANDSTATS section of INFO
+PERCENTILES = (50.0, 99.0, 99.9)
+
+# Slow log entries keep at most this many arguments, each cut to this many characters
+SLOWLOG_MAX_ARGS = 32
+SLOWLOG_ARG_MAX_LENGTH = 128
+
+# Latencies below this many microseconds get a bucket each, above it every power of two
+# is split into SUB_BUCKETS buckets, so a bucket is never more than 1/8 wider than its value
+LINEAR_BUCKETS = 16
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+def _bucket(usec: int) -> int:
+    """Maps a latency in microseconds to its histogram bucket"""
+    if usec < LINEAR_BUCKETS:
+        return usec
+
+    shift = usec.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (usec >> shift)
+
+
+def _bucket_upper_bound(bucket: int) -> int:
+    """Largest latency in microseconds that falls into a bucket"""
+    if bucket < LINEAR_BUCKETS:
+        return bucket
+
+    shift = bucket // SUB_BUCKETS - 1
+    mantissa = bucket - shift * SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class CommandStat:
+    """
+    Call count, total time and a latency histogram for one command.
+
+    Latencies are counted in log-linear buckets, so recording is a dict increment
+    and percentiles are read off the histogram without keeping any samples.
+    """
+
+    __slots__ = ("calls", "usec", "histogram")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.usec = 0
+        self.histogram: Dict[int, int] = {}
+
+    def record(self, usec: int, calls: int = 1) -> None:
+        """
+        Adds calls that took usec microseconds each.
+
+        Args:
+            usec: Latency of a single call
+            calls: Number of calls with that latency
+        """
+        self.calls += calls
+        self.usec += usec * calls
+        bucket = _bucket(usec)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + calls
+
+    def percentile(self, percent: float) -> int:
+        """
+        Estimates a latency percentile.
+
+        Args:
+            percent: The percentile to compute, between 0 and 100
+
+        Returns:
+            Upper bound in microseconds of the bucket holding the percentile
+        """
+        if not self.calls:
+            return 0
+
+        target = self.calls * percent / 100
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= target:
+                return _bucket_upper_bound(bucket)
+
+        return _bucket_upper_bound(max(self.histogram))
+
+    def __str__(self) -> str:
+        parts = [
+            f"calls={self.calls}",
+            f"usec={self.usec}",
+            f"usec_per_call={self.usec / self.calls if self.calls else 0:.2f}",
+        ]
+        parts.extend(f"p{percent:g}={self.percentile(percent)}" for percent in PERCENTILES)
+        return ",".join(parts)
+
+
+class SlowLogEntry:
+
+    __slots__ = ("id", "timestamp", "duration", "command", "args")
+
+    def __init__(
+        self,
+        entry_id: int,
+        timestamp: int,
+        duration: int,
+        command: str,
+        args: List[str]
+    ) -> None:
+        """
+        Initializes a slow log entry.
+
+        Args:
+            entry_id: Unique, increasing id of the entry
+            timestamp: Unix time in seconds when the command ran
+            duration: Execution time in microseconds
+            command: The command name
+            args: The arguments, already truncated
+        """
+        self.id = entry_id
+        self.timestamp = timestamp
+        self.duration = duration
+        self.command = command
+        self.args = args
+
+    def __str__(self) -> str:
+        query = " ".join([self.command] + self.args)
+        return f"id={self.id} time={self.timestamp} duration={self.duration}us command={query}"
+
+
+class SlowLog:
+    """
+    Bounded log of the commands that ran longer than a threshold.
+
+    The entries live in a deque with a maximum length, so once the log is full
+    every new entry drops the oldest one in O(1).
+    """
+
+    def __init__(self, threshold: int = 10000, max_len: int = 128) -> None:
+        """
+        Initializes the slow log.
+
+        Args:
+            threshold: Minimum duration in microseconds to log, 0 logs everything and
+                a negative value disables the log
+            max_len: Number of entries kept
+        """
+        self.threshold = threshold
+        self.entries: Deque[SlowLogEntry] = deque(maxlen=max_len)
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, command: str, args: List[str], duration: int) -> None:
+        """
+        Logs a command if it was slow enough.
+
+        Args:
+            command: The command name
+            args: Its arguments
+            duration: Execution time in microseconds
+        """
+        if self.threshold < 0 or duration < self.threshold:
+            return
+
+        self.entries.appendleft(SlowLogEntry(
+            self.next_id,
+            int(time.time()),
+            duration,
+            command,
+            self._truncate(args)
+        ))
+        self.next_id += 1
+
+    @staticmethod
+    def _truncate(args: List[str]) -> List[str]:
+        """Limits the number and length of the logged arguments"""
+        logged = []
+
+        for arg in args[:SLOWLOG_MAX_ARGS]:
+            arg = str(arg)
+            if len(arg) > SLOWLOG_ARG_MAX_LENGTH:
+                arg = f"{arg[:SLOWLOG_ARG_MAX_LENGTH]}... ({len(arg) - SLOWLOG_ARG_MAX_LENGTH} more characters)"
+            logged.append(arg)
+
+        if len(args) > SLOWLOG_MAX_ARGS:
+            logged.append(f"... ({len(args) - SLOWLOG_MAX_ARGS} more arguments)")
+
+        return logged
+
+    def get(self, count: Optional[int] = 10) -> List[SlowLogEntry]:
+        """
+        Fetches the most recent entries.
+
+        Args:
+            count: Maximum number of entries, None for all of them
+
+        Returns:
+            Entries from newest to oldest
+        """
+        if count is None or count >= len(self.entries):
+            return list(self.entries)
+
+        return [self.entries[i] for i in range(count)]
+
+    def reset(self) -> None:
+        """Removes every entry"""
+        self.entries.clear()
+
+
+class CommandStats:
+    """
+    Per-command latency statistics plus the slow log.
+
+    The database only calls into this object while stats are enabled, so with
+    stats disabled command execution is not timed at all.
+    """
+
+    def __init__(self, slowlog_threshold: int = 10000, slowlog_max_len: int = 128) -> None:
+        """
+        Initializes empty statistics.
+
+        Args:
+            slowlog_threshold: Minimum duration in microseconds for the slow log
+            slowlog_max_len: Number of slow log entries kept
+        """
+        self.commands: Dict[str, CommandStat] = {}
+        self.slowlog = SlowLog(slowlog_threshold, slowlog_max_len)
+
+    def record(self, command: str, args: List[str], elapsed_ns: int, calls: int = 1) -> None:
+        """
+        Records the execution of a command.
+
+        Args:
+            command: The command name
+            args: The arguments of the call, for batches those of the first call
+            elapsed_ns: Total execution time in nanoseconds
+            calls: Number of calls executed in that time, more than one for batches
+        """
+        usec = elapsed_ns // (1000 * calls)
+
+        stat = self.commands.get(command)
+        if stat is None:
+            stat = self.commands[command] = CommandStat()
+
+        # This runs after every command, so CommandStat.record is inlined here
+        stat.calls += calls
+        stat.usec += usec * calls
+        bucket = usec if usec < LINEAR_BUCKETS else _bucket(usec)
+        histogram = stat.histogram
+        histogram[bucket] = histogram.get(bucket, 0) + calls
+
+        if usec >= self.slowlog.threshold >= 0:
+            self.slowlog.add(command, args, usec)
+
+    def info(self) -> Dict[str, str]:
+        """
+        Builds the COMMANDSTATS section of INFO.
+
+        Returns:
+            Mapping of cmdstat_<name> to the statistics of that command
+        """
+        return {
+            f"cmdstat_{name.lower()}": str(stat)
+            for name, stat in sorted(self.commands.items())
+        }
+
+    def reset(self) -> None:
+        """Forgets every command statistic, the slow log is kept"""
+        self.commands.clear()
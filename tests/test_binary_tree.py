@@ -0,0 +1,206 @@
+import random
+import unittest
+
+from pycachedb.data_structures.binary_tree import TreeNode, BinaryTree
+
+class TestBinaryTree(unittest.TestCase):
+    """Test cases for the BinaryTree class"""
+
+    def setUp(self):
+        """Set up a new BinaryTree for each test"""
+        self.tree = BinaryTree()
+
+    def assert_avl(self, node):
+        """Checks the AVL invariant and cached heights, returning the subtree height"""
+        if node is None:
+            return 0
+        left = self.assert_avl(node.left)
+        right = self.assert_avl(node.right)
+        self.assertLessEqual(abs(left - right), 1)
+        self.assertEqual(node.height, 1 + max(left, right))
+        if node.left:
+            self.assertLess(node.left.key, node.key)
+        if node.right:
+            self.assertGreater(node.right.key, node.key)
+        self.assertEqual(
+            node.count,
+            1 + (node.left.count if node.left else 0) + (node.right.count if node.right else 0)
+        )
+        return node.height
+
+    def test_initialization(self):
+        """Test that a BinaryTree is properly initialized"""
+        self.assertIsNone(self.tree.root)
+        self.assertEqual(self.tree.size, 0)
+
+    def test_insert_search(self):
+        """Test basic insert and search operations"""
+        self.tree.insert(5, "five")
+        self.tree.insert(3, "three")
+        self.tree.insert(8, "eight")
+
+        self.assertEqual(self.tree.size, 3)
+        self.assertEqual(self.tree.search(3), "three")
+        self.assertEqual(self.tree.search(8), "eight")
+        self.assertIsNone(self.tree.search(4))
+
+    def test_insert_update_existing(self):
+        """Test that inserting an existing key updates the value without growing"""
+        self.tree.insert("a", 1)
+        self.tree.insert("a", 2)
+
+        self.assertEqual(self.tree.size, 1)
+        self.assertEqual(self.tree.search("a"), 2)
+
+    def test_sequential_inserts_stay_balanced(self):
+        """Test that monotonically increasing keys do not degrade the tree"""
+        for i in range(5000):
+            self.tree.insert(i, i)
+
+        self.assertEqual(self.tree.size, 5000)
+        self.assertLessEqual(self.tree.root.height, 18)
+        self.assert_avl(self.tree.root)
+        self.assertEqual(self.tree.search(4321), 4321)
+
+    def test_delete(self):
+        """Test deleting leaf, single child and two children nodes"""
+        for key in [50, 30, 70, 20, 40, 60, 80, 35]:
+            self.tree.insert(key, str(key))
+
+        self.assertTrue(self.tree.delete(20))
+        self.assertTrue(self.tree.delete(40))
+        self.assertTrue(self.tree.delete(50))
+        self.assertFalse(self.tree.delete(50))
+
+        self.assertEqual(self.tree.size, 5)
+        for key in [20, 40, 50]:
+            self.assertIsNone(self.tree.search(key))
+        for key in [30, 35, 60, 70, 80]:
+            self.assertEqual(self.tree.search(key), str(key))
+        self.assert_avl(self.tree.root)
+
+    def test_random_operations(self):
+        """Test a random mix of inserts and deletes against a dict"""
+        rng = random.Random(7)
+        expected = {}
+
+        for _ in range(3000):
+            key = rng.randrange(500)
+            if rng.random() < 0.6:
+                self.tree.insert(key, key * 2)
+                expected[key] = key * 2
+            else:
+                self.assertEqual(self.tree.delete(key), key in expected)
+                expected.pop(key, None)
+
+        self.assertEqual(self.tree.size, len(expected))
+        self.assert_avl(self.tree.root)
+        for key in range(500):
+            self.assertEqual(self.tree.search(key), expected.get(key))
+
+    def test_ordered_iteration(self):
+        """Test that iteration yields keys in ascending order"""
+        keys = list(range(100))
+        random.Random(3).shuffle(keys)
+        for key in keys:
+            self.tree.insert(key, -key)
+
+        self.assertEqual(list(self.tree), list(range(100)))
+        self.assertEqual(len(self.tree), 100)
+        self.assertIn(42, self.tree)
+        self.assertNotIn(100, self.tree)
+
+    def test_range(self):
+        """Test inclusive range scans in both directions"""
+        for key in range(0, 100, 2):
+            self.tree.insert(key, str(key))
+
+        self.assertEqual([k for k, _ in self.tree.range(11, 20)], [12, 14, 16, 18, 20])
+        self.assertEqual([k for k, _ in self.tree.range(11, 20, reverse=True)], [20, 18, 16, 14, 12])
+        self.assertEqual([k for k, _ in self.tree.range(None, 4)], [0, 2, 4])
+        self.assertEqual([k for k, _ in self.tree.range(95)], [96, 98])
+        self.assertEqual([k for k, _ in self.tree.range(95, reverse=True)], [98, 96])
+        self.assertEqual(list(self.tree.range(50, 40)), [])
+        self.assertEqual(next(self.tree.range(7)), (8, "8"))
+
+    def test_range_is_lazy(self):
+        """Test that a range scan only keeps a root-to-leaf stack"""
+        for i in range(10000):
+            self.tree.insert(i, i)
+
+        scan = self.tree.range(5000)
+        self.assertEqual([next(scan) for _ in range(3)], [(5000, 5000), (5001, 5001), (5002, 5002)])
+        self.assertLessEqual(len(scan.gi_frame.f_locals["stack"]), self.tree.root.height)
+
+    def test_min_max_floor_ceiling(self):
+        """Test the nearest key lookups"""
+        self.assertIsNone(self.tree.min())
+        self.assertIsNone(self.tree.max())
+
+        for key in [10, 20, 30]:
+            self.tree.insert(key, key)
+
+        self.assertEqual(self.tree.min(), (10, 10))
+        self.assertEqual(self.tree.max(), (30, 30))
+        self.assertEqual(self.tree.floor(25), (20, 20))
+        self.assertEqual(self.tree.floor(20), (20, 20))
+        self.assertIsNone(self.tree.floor(5))
+        self.assertEqual(self.tree.ceiling(25), (30, 30))
+        self.assertIsNone(self.tree.ceiling(31))
+
+    def test_rank_select(self):
+        """Test order statistics after inserts and deletes"""
+        for key in range(0, 200, 2):
+            self.tree.insert(key, key)
+        for key in range(0, 200, 8):
+            self.tree.delete(key)
+
+        remaining = sorted(k for k in range(0, 200, 2) if k % 8)
+        self.assert_avl(self.tree.root)
+        for index, key in enumerate(remaining):
+            self.assertEqual(self.tree.rank(key), index)
+            self.assertEqual(self.tree.select(index), (key, key))
+        self.assertEqual(self.tree.rank(3), 1)
+        self.assertEqual(self.tree.rank(1000), len(remaining))
+        self.assertEqual(self.tree.select(-1), (remaining[-1], remaining[-1]))
+        with self.assertRaises(IndexError):
+            self.tree.select(len(remaining))
+
+    def test_from_sorted(self):
+        """Test that bulk loading builds a perfectly balanced tree"""
+        tree = BinaryTree.from_sorted((i, str(i)) for i in range(1023))
+
+        self.assertEqual(tree.size, 1023)
+        self.assertEqual(tree.root.height, 10)
+        self.assert_avl(tree.root)
+        self.assertEqual(tree.select(500), (500, "500"))
+
+        tree.insert(2000, "2000")
+        self.assertEqual(tree.max(), (2000, "2000"))
+        self.assertEqual(BinaryTree.from_sorted([]).size, 0)
+
+    def test_merge(self):
+        """Test merging two trees, with the other tree winning on equal keys"""
+        for key in range(0, 20, 2):
+            self.tree.insert(key, "left")
+        other = BinaryTree.from_sorted((key, "right") for key in range(0, 30, 3))
+
+        self.tree.merge(other)
+
+        expected = {key: "left" for key in range(0, 20, 2)}
+        expected.update({key: "right" for key in range(0, 30, 3)})
+        self.assertEqual(list(self.tree.items()), sorted(expected.items()))
+        self.assertEqual(self.tree.size, len(expected))
+        self.assert_avl(self.tree.root)
+
+    def test_clear(self):
+        """Test clearing the tree"""
+        self.tree.insert(1, "one")
+        self.tree.clear()
+
+        self.assertIsNone(self.tree.root)
+        self.assertEqual(self.tree.size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
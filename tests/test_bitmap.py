@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from pycachedb.data_structures import bitmap as bitmap_module
+from pycachedb.data_structures.bitmap import Bitmap, bitop
+
+def reference_bits(data):
+    """Lists the bits of some bytes, the most significant bit of each byte first"""
+    return [(byte >> (7 - i)) & 1 for byte in data for i in range(8)]
+
+
+class TestBitmap(unittest.TestCase):
+    """Test cases for the Bitmap class and bitop"""
+
+    def setUp(self):
+        """Use tiny chunks so the chunked paths are exercised on small bitmaps"""
+        self.chunk_size = bitmap_module.CHUNK_SIZE
+        bitmap_module.CHUNK_SIZE = 3
+
+    def tearDown(self):
+        bitmap_module.CHUNK_SIZE = self.chunk_size
+
+    def test_get_set(self):
+        """Test setting bits grows the bitmap and returns the previous bit"""
+        bitmap = Bitmap()
+
+        self.assertEqual(bitmap.set_bit(7, 1), 0)
+        self.assertEqual(bitmap.set_bit(7, 1), 1)
+        self.assertEqual(bitmap.set_bit(20, 1), 0)
+        self.assertEqual(bytes(bitmap.data), b"\x01\x00\x08")
+        self.assertEqual(bitmap.get_bit(20), 1)
+        self.assertEqual(bitmap.get_bit(21), 0)
+        self.assertEqual(bitmap.get_bit(1000), 0)
+
+        self.assertEqual(bitmap.set_bit(7, 0), 1)
+        self.assertEqual(bitmap.data[0], 0)
+
+    def test_string_round_trip(self):
+        """Test strings are bitmaps of their bytes and read back unchanged"""
+        bitmap = Bitmap.from_string("a")
+        self.assertEqual(bitmap.count(0, 7), 3)
+
+        bitmap.set_bit(6, 1)
+        self.assertEqual(str(bitmap), "c")
+
+        bitmap.set_bit(8, 1)
+        self.assertEqual(str(Bitmap.from_string(str(bitmap))).encode("utf-8", "surrogateescape"), b"c\x80")
+
+    def test_count_and_position(self):
+        """Test counting and searching any bit range against a bit by bit reference"""
+        rng = random.Random(3)
+        data = bytes(rng.choice([0, 255, rng.randrange(256)]) for _ in range(20))
+        bitmap = Bitmap(data)
+        bits = reference_bits(data)
+
+        for _ in range(300):
+            start = rng.randrange(len(bits))
+            end = rng.randrange(start, len(bits))
+            self.assertEqual(bitmap.count(start, end), sum(bits[start:end + 1]))
+
+            for bit in (0, 1):
+                expected = next((i for i in range(start, end + 1) if bits[i] == bit), -1)
+                self.assertEqual(bitmap.position(bit, start, end), expected)
+
+    def test_bitop(self):
+        """Test combining bitmaps of different lengths pads the shorter ones with zeros"""
+        first = b"\xf0\x0f\xff\x01\x02"
+        second = b"\x3c\xff"
+
+        self.assertEqual(bytes(bitop("AND", [first, second])), b"\x30\x0f\x00\x00\x00")
+        self.assertEqual(bytes(bitop("OR", [first, second])), b"\xfc\xff\xff\x01\x02")
+        self.assertEqual(bytes(bitop("XOR", [first, second, b""])), b"\xcc\xf0\xff\x01\x02")
+        self.assertEqual(bytes(bitop("NOT", [first])), b"\x0f\xf0\x00\xfe\xfd")
+        self.assertEqual(bytes(bitop("OR", [b"", b""])), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from pycachedb.data_structures.bloom_filter import BloomFilter, check_parameters
+
+class TestBloomFilter(unittest.TestCase):
+    """Test cases for the BloomFilter class"""
+
+    def test_membership(self):
+        """Test added elements are always found and adding twice is reported"""
+        bloom = BloomFilter(0.01, 100)
+
+        self.assertTrue(bloom.add("apple"))
+        self.assertFalse(bloom.add("apple"))
+        self.assertIn("apple", bloom)
+        self.assertNotIn("pear", bloom)
+        self.assertEqual(len(bloom), 1)
+
+    def test_false_positive_rate(self):
+        """Test the false positive rate stays near the target once full"""
+        bloom = BloomFilter(0.01, 5000)
+        for i in range(5000):
+            bloom.add(f"key:{i}")
+
+        self.assertEqual(len(bloom.layers), 1)
+        false_positives = sum(f"other:{i}" in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+    def test_scaling(self):
+        """Test a full filter adds larger layers and keeps every element and its error rate"""
+        bloom = BloomFilter(0.01, 100, expansion=2)
+        for i in range(2000):
+            bloom.add(f"key:{i}")
+
+        self.assertEqual([layer.capacity for layer in bloom.layers], [100, 200, 400, 800, 1600])
+        self.assertEqual(bloom.capacity, 3100)
+        self.assertTrue(all(f"key:{i}" in bloom for i in range(2000)))
+
+        false_positives = sum(f"other:{i}" in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+        # A few bits per element instead of a set entry each
+        self.assertLess(bloom.memory_usage(), 2000 * 4)
+
+    def test_non_scaling(self):
+        """Test a non scaling filter refuses elements once full"""
+        bloom = BloomFilter(0.01, 10, scaling=False)
+        added = 0
+        with self.assertRaises(ValueError):
+            for i in range(100):
+                added += bloom.add(f"key:{i}")
+
+        self.assertEqual(len(bloom.layers), 1)
+        self.assertEqual(added, 10)
+
+    def test_invalid_parameters(self):
+        """Test the error rate, capacity and expansion are checked"""
+        invalid = (
+            (0, 10, 2), (1, 10, 2), (0.01, 0, 2), (0.01, 10, 0),
+            (0.0001, 100000000000, 2), (0.01, 10, 100000), (1e-300, 1 << 30, 2)
+        )
+        for error_rate, capacity, expansion in invalid:
+            with self.assertRaises(ValueError):
+                BloomFilter(error_rate, capacity, expansion)
+
+        self.assertEqual(check_parameters(0.01, 1000, 2), len(BloomFilter(0.01, 1000).layers[0].bits))
+
+
+if __name__ == "__main__":
+    unittest.main()
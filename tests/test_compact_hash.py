@@ -0,0 +1,63 @@
+import unittest
+
+from pycachedb.data_structures.compact_hash import CompactHash
+
+class TestCompactHash(unittest.TestCase):
+    """Test cases for the CompactHash class"""
+
+    def setUp(self):
+        """Set up a hash that converts past four fields"""
+        self.fields = CompactHash(max_entries=4, max_value=10)
+
+    def test_set_get_delete(self):
+        """Test field operations in the compact encoding"""
+        self.assertTrue(self.fields.set("name", "ann"))
+        self.assertTrue(self.fields.set("ann", "name"))
+        self.assertFalse(self.fields.set("name", "bob"))
+
+        self.assertEqual(self.fields.encoding, "listpack")
+        self.assertEqual(len(self.fields), 2)
+        self.assertEqual(self.fields.get("name"), "bob")
+        # A value equal to a field name is not mistaken for the field
+        self.assertEqual(self.fields.get("ann"), "name")
+        self.assertIsNone(self.fields.get("bob"))
+        self.assertEqual(self.fields.items(), [("name", "bob"), ("ann", "name")])
+
+        self.assertTrue(self.fields.delete("name"))
+        self.assertFalse(self.fields.delete("name"))
+        self.assertNotIn("name", self.fields)
+        self.assertEqual(list(self.fields), ["ann"])
+
+        self.fields.delete("ann")
+        self.assertEqual(self.fields.element_bytes, 0)
+
+    def test_conversion(self):
+        """Test that too many fields or a long value convert the hash to a dict"""
+        for i in range(4):
+            self.fields.set(f"f{i}", str(i))
+        self.assertEqual(self.fields.encoding, "listpack")
+
+        self.fields.set("f4", "4")
+        self.assertEqual(self.fields.encoding, "hashtable")
+        self.assertEqual(self.fields.items(), [(f"f{i}", str(i)) for i in range(5)])
+
+        long_value = CompactHash(max_entries=4, max_value=10)
+        long_value.set("a", "1")
+        long_value.set("b", "x" * 11)
+        self.assertEqual(long_value.encoding, "hashtable")
+        self.assertEqual(long_value.get("a"), "1")
+
+    def test_memory_usage(self):
+        """Test that the compact encoding is smaller than a dict for small hashes"""
+        compact = CompactHash()
+        large = CompactHash(max_entries=0)
+        for i in range(20):
+            compact.set(f"field{i}", "value")
+            large.set(f"field{i}", "value")
+
+        self.assertEqual(large.encoding, "hashtable")
+        self.assertLess(compact.memory_usage(), large.memory_usage())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from pycachedb.data_structures.compact_set import CompactSet, difference, intersection, union
+from pycachedb.integers import parse_int
+
+def make_set(members, max_intset_entries=512):
+    """Builds a set from an iterable of members"""
+    compact = CompactSet(max_intset_entries)
+    for member in members:
+        compact.add(str(member))
+    return compact
+
+
+class TestCompactSet(unittest.TestCase):
+    """Test cases for the CompactSet class and the set algebra"""
+
+    def test_parse_int(self):
+        """Test that only canonical 64 bit integers use the integer encoding"""
+        self.assertEqual(parse_int("42"), 42)
+        self.assertEqual(parse_int("-7"), -7)
+        self.assertEqual(parse_int(str(2 ** 63 - 1)), 2 ** 63 - 1)
+
+        for member in ("", "007", "+1", "1_000", " 1", "1.0", "abc", str(2 ** 63)):
+            self.assertIsNone(parse_int(member), member)
+
+    def test_intset(self):
+        """Test the integer encoding keeps members sorted and unique"""
+        compact = make_set([5, 1, 3, 1])
+
+        self.assertEqual(compact.encoding, "intset")
+        self.assertEqual(list(compact), ["1", "3", "5"])
+        self.assertIn("3", compact)
+        self.assertNotIn("03", compact)
+        self.assertNotIn("x", compact)
+
+        self.assertTrue(compact.remove("3"))
+        self.assertFalse(compact.remove("3"))
+        self.assertFalse(compact.remove("x"))
+        self.assertEqual(len(compact), 2)
+
+    def test_conversion(self):
+        """Test that a string member or too many members convert to a hash set"""
+        compact = make_set([1, 2])
+        self.assertTrue(compact.add("tag"))
+        self.assertEqual(compact.encoding, "hashtable")
+        self.assertEqual(sorted(compact), ["1", "2", "tag"])
+        self.assertFalse(compact.add("1"))
+
+        large = make_set(range(5), max_intset_entries=4)
+        self.assertEqual(large.encoding, "hashtable")
+        self.assertEqual(len(large), 5)
+        self.assertLess(make_set(range(500)).memory_usage(), make_set(range(500), 0).memory_usage())
+
+    def test_algebra(self):
+        """Test intersection, union and difference across both encodings"""
+        evens = make_set(range(0, 1000, 2), max_intset_entries=1000)
+        threes = make_set(range(0, 1000, 3), max_intset_entries=1000)
+        few = make_set([0, 6, 7, 12])
+        tags = make_set(["6", "12", "red"])
+
+        self.assertEqual(intersection([evens, threes, few]), ["0", "6", "12"])
+        self.assertEqual(sorted(intersection([evens, tags])), ["12", "6"])
+        self.assertEqual(len(intersection([evens, threes])), 167)
+        self.assertEqual(intersection([evens, CompactSet()]), [])
+
+        self.assertEqual(union([few, make_set([1, 7])]), ["0", "1", "6", "7", "12"])
+        self.assertEqual(sorted(union([few, tags])), ["0", "12", "6", "7", "red"])
+
+        self.assertEqual(difference(few, [evens]), ["7"])
+        self.assertEqual(difference(tags, [few, evens]), ["red"])
+        self.assertEqual(sorted(difference(few, [tags])), ["0", "7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
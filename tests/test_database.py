@@ -0,0 +1,761 @@
+import unittest
+
+from pycachedb import PyCacheDB
+from pycachedb.database import OOM_ERROR
+from pycachedb.query.parser import ParseError
+
+class TestPyCacheDB(unittest.TestCase):
+    """Test cases for executing queries against PyCacheDB"""
+
+    def setUp(self):
+        """Set up a new database for each test"""
+        self.db = PyCacheDB()
+
+    def test_set_get_delete(self):
+        """Test the basic string commands"""
+        self.assertEqual(self.db.execute("SET user:1 'John Doe'"), "OK")
+        self.assertEqual(self.db.execute("GET user:1"), "John Doe")
+        self.assertEqual(self.db.execute("EXISTS user:1 user:2"), "1")
+        self.assertEqual(self.db.execute("DEL user:1 user:2"), "1")
+        self.assertEqual(self.db.execute("GET user:1"), "Not Found")
+
+    def test_set_options(self):
+        """Test the NX and XX conditions"""
+        self.assertEqual(self.db.execute("SET k v XX"), "Not Found")
+        self.assertEqual(self.db.execute("SET k v NX"), "OK")
+        self.assertEqual(self.db.execute("SET k w NX"), "Not Found")
+        self.assertEqual(self.db.execute("SET k w XX"), "OK")
+        self.assertEqual(self.db.execute("GET k"), "w")
+        self.assertEqual(self.db.execute("SET k v NX XX"), "ERROR: NX and XX options cannot be used together")
+
+    def test_expiry(self):
+        """Test TTLs and lazy expiry"""
+        self.db.execute("SET session abc EX 100")
+        self.assertEqual(self.db.execute("TTL session"), "100")
+        self.assertEqual(self.db.execute("TTL missing"), "-2")
+
+        self.db.execute("SET plain value")
+        self.assertEqual(self.db.execute("TTL plain"), "-1")
+
+        self.db.execute("EXPIRE plain 0")
+        self.assertEqual(self.db.execute("GET plain"), "Not Found")
+        self.assertEqual(self.db.execute("EXPIRE plain 10"), "0")
+
+    def test_append_and_keys(self):
+        """Test APPEND and KEYS"""
+        self.assertEqual(self.db.execute("APPEND greeting Hello"), "5")
+        self.assertEqual(self.db.execute("APPEND greeting ', World'"), "12")
+        self.assertEqual(self.db.execute("GET greeting"), "Hello, World")
+
+        # Bitmaps grow by the bytes appended, collections are refused untouched
+        self.db.execute("SETBIT flags 1 1")
+        self.assertEqual(self.db.execute("APPEND flags A"), "2")
+        self.assertEqual(self.db.execute("GET flags"), "@A")
+
+        self.db.execute("RPUSH list a b")
+        self.db.execute("HSET hash f v")
+        self.db.execute("SADD set m")
+        self.db.execute("ZADD zset 1 m")
+        self.db.execute("PFADD hll a")
+        self.db.execute("BF.ADD bloom a")
+        self.db.execute("XADD stream 1-1 f v")
+        for key in ("list", "hash", "set", "zset", "hll", "bloom", "stream"):
+            self.assertTrue(self.db.execute(f"APPEND {key} x").startswith("ERROR: WRONGTYPE"), key)
+        self.assertEqual(self.db.execute("LRANGE list 0 -1"), "1) a\n2) b")
+        self.assertEqual(self.db.execute("HGET hash f"), "v")
+
+        self.db.execute("SET user:1 a")
+        self.db.execute("SET user:2 b")
+        self.assertEqual(self.db.execute("KEYS user:*"), "1) user:1\n2) user:2")
+        self.assertEqual(self.db.execute("KEYS nothing*"), "Not Found")
+
+        self.assertEqual(self.db.execute("FLUSHDB"), "OK")
+        self.assertEqual(self.db.execute("KEYS *"), "Not Found")
+
+    def test_sorted_set_commands(self):
+        """Test the sorted set commands end to end"""
+        self.assertEqual(self.db.execute("ZADD board 100 alice 80 bob 90 carol"), "3")
+        self.assertEqual(self.db.execute("ZADD board CH 85 bob 70 dave"), "2")
+        self.assertEqual(self.db.execute("ZRANGE board 0 1"), "1) dave\n2) bob")
+        self.assertEqual(self.db.execute("ZREVRANGE board 0 0 WITHSCORES"), "1) alice\n2) 100")
+        self.assertEqual(self.db.execute("ZRANK board carol"), "2")
+        self.assertEqual(self.db.execute("ZREVRANK board carol"), "1")
+        self.assertEqual(self.db.execute("ZRANGEBYSCORE board (80 +inf LIMIT 1 5"), "1) carol\n2) alice")
+        self.assertEqual(self.db.execute("ZREVRANGEBYSCORE board 90 -inf"), "1) carol\n2) bob\n3) dave")
+        self.assertEqual(self.db.execute("ZCOUNT board 80 90"), "2")
+        self.assertEqual(self.db.execute("ZINCRBY board 2.5 dave"), "72.5")
+        self.assertEqual(self.db.execute("ZSCORE board dave"), "72.5")
+        self.assertEqual(self.db.execute("ZINCRBY board nan dave"), "ERROR: Increment must be a valid float")
+        self.assertEqual(self.db.execute("ZADD board inf erin"), "1")
+        self.assertEqual(self.db.execute("ZINCRBY board -inf erin"), "ERROR: Resulting score is not a number (NaN)")
+        self.assertEqual(self.db.execute("ZSCORE board erin"), "inf")
+        self.assertEqual(self.db.execute("ZREM board erin"), "1")
+        self.assertEqual(self.db.execute("ZREM board alice bob carol dave"), "4")
+        self.assertEqual(self.db.execute("EXISTS board"), "0")
+
+    def test_wrong_type(self):
+        """Test that commands refuse keys holding another data type"""
+        self.db.execute("SET name value")
+        self.db.execute("ZADD board 1 a")
+
+        self.assertTrue(self.db.execute("ZADD name 1 a").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("GET board").startswith("ERROR: WRONGTYPE"))
+
+    def test_transaction(self):
+        """Test queueing and executing a transaction"""
+        self.assertEqual(self.db.execute("MULTI"), "OK")
+        self.assertEqual(self.db.execute("MULTI"), "ERROR: Transaction already in progress")
+        self.assertEqual(self.db.execute("SET a 1"), "QUEUED")
+        self.assertEqual(self.db.execute("GET a"), "QUEUED")
+        self.assertEqual(self.db.execute("EXEC"), "1) OK\n2) 1")
+        self.assertEqual(self.db.execute("EXEC"), "ERROR: No transaction in progress")
+
+        self.db.execute("MULTI")
+        self.db.execute("SET b 1")
+        self.assertEqual(self.db.execute("DISCARD"), "OK")
+        self.assertEqual(self.db.execute("GET b"), "Not Found")
+
+    def test_transaction_queue_errors(self):
+        """Test that commands are validated when queued and errors abort EXEC"""
+        self.db.execute("MULTI")
+        self.assertEqual(self.db.execute("SET a 1"), "QUEUED")
+        self.assertEqual(self.db.execute("SET a 1 EX soon"), "ERROR: EX value must be an integer")
+        self.assertEqual(self.db.execute("NOPE"), "ERROR: Unknown command 'NOPE'")
+        self.assertEqual(
+            self.db.execute("EXEC"),
+            "ERROR: EXECABORT Transaction discarded because of previous errors"
+        )
+        self.assertEqual(self.db.execute("GET a"), "Not Found")
+
+        # A failed transaction does not leak into the next one
+        self.db.execute("MULTI")
+        self.db.execute("SET a 1")
+        self.assertEqual(self.db.execute("EXEC"), "1) OK")
+
+    def test_watch(self):
+        """Test check-and-set transactions with WATCH"""
+        self.db.execute("SET balance 10")
+
+        self.assertEqual(self.db.execute("WATCH balance"), "OK")
+        self.db.execute("MULTI")
+        self.assertEqual(self.db.execute("WATCH balance"), "ERROR: WATCH inside MULTI is not allowed")
+        self.db.execute("SET balance 20")
+        self.assertEqual(self.db.execute("EXEC"), "1) OK")
+
+        # A write between WATCH and EXEC aborts the transaction
+        self.db.execute("WATCH balance")
+        self.db.set("balance", "15")
+        self.db.execute("MULTI")
+        self.db.execute("SET balance 30")
+        self.assertEqual(self.db.execute("EXEC"), "(nil)")
+        self.assertEqual(self.db.execute("GET balance"), "15")
+
+        # EXEC released the watch, so the next transaction runs
+        self.db.set("balance", "16")
+        self.db.execute("MULTI")
+        self.db.execute("SET balance 30")
+        self.assertEqual(self.db.execute("EXEC"), "1) OK")
+
+        # In-place changes to collections count as modifications
+        self.db.execute("ZADD board 1 ann")
+        self.db.execute("WATCH board")
+        self.db.execute("ZINCRBY board 1 ann")
+        self.db.execute("MULTI")
+        self.assertEqual(self.db.execute("EXEC"), "(nil)")
+
+        # So does expiring
+        self.db.execute("SET session x EX 100")
+        self.db.execute("WATCH session")
+        self.db.expires["session"] = 0
+        self.db.execute("MULTI")
+        self.assertEqual(self.db.execute("EXEC"), "(nil)")
+
+        self.db.execute("WATCH balance other")
+        self.assertEqual(self.db.execute("UNWATCH"), "OK")
+        self.db.execute("DEL balance")
+        self.db.execute("MULTI")
+        self.assertEqual(self.db.execute("EXEC"), "(empty transaction)")
+        self.assertEqual(self.db.key_versions, {})
+
+    def test_execute_many(self):
+        """Test that pipelined replies match one-by-one execution"""
+        queries = [
+            "SET a 1", "SET b 2", "SET c 3 EX 100", "GET a", "GET b", "GET missing",
+            "ZADD z 1 m", "GET z", "NOPE", "DEL a", "GET a",
+            "MULTI", "SET d 4", "GET d", "EXEC", "GET d",
+        ]
+        reference = PyCacheDB()
+        expected = [reference.execute(query) for query in queries]
+
+        self.assertEqual(self.db.execute_many(queries), expected)
+        self.assertEqual(expected[-4:], ["QUEUED", "QUEUED", "1) OK\n2) 4", "4"])
+
+    def test_execute_iter_is_lazy(self):
+        """Test that execute_iter consumes a generator and streams replies"""
+        replies = self.db.execute_iter(f"SET key:{i} {i}" for i in range(3000))
+
+        self.assertEqual(next(replies), "OK")
+        self.assertEqual(sum(1 for _ in replies), 2999)
+        self.assertEqual(self.db.execute("GET key:2999"), "2999")
+
+    def test_eviction_policies(self):
+        """Test that the LRU and LFU policies evict once max_keys is reached"""
+        lru = PyCacheDB(eviction_policy="LRU", max_keys=3)
+        for key in "abc":
+            lru.execute(f"SET {key} 1")
+        lru.execute("GET a")
+        lru.execute("SET d 1")
+
+        self.assertEqual(sorted(lru.data), ["a", "c", "d"])
+        lru.execute("SET a 2")
+        self.assertEqual(len(lru.data), 3)
+
+        lfu = PyCacheDB(eviction_policy="lfu", max_keys=3)
+        lfu.execute("MSET a 1 b 1 c 1")
+        lfu.execute("GET a")
+        lfu.execute("GET c")
+        lfu.execute("ZADD z 1 m")
+        lfu.execute("SET e 1")
+
+        self.assertEqual(sorted(lfu.data), ["a", "c", "e"])
+        self.assertEqual(lfu.info("stats")["evicted_keys"], 2)
+
+        # Deleted and expired keys leave the policy too
+        lfu.execute("DEL a")
+        lfu.execute("SET c 1 EX 10")
+        lfu.expires["c"] = 0
+        self.assertEqual(lfu.execute("GET c"), "Not Found")
+        self.assertEqual(len(lfu.policy), 1)
+
+        with self.assertRaises(ValueError):
+            PyCacheDB(eviction_policy="FIFO")
+        with self.assertRaises(ValueError):
+            PyCacheDB(max_keys=10)
+
+    def test_counters(self):
+        """Test INCR and friends on native integer values"""
+        self.assertEqual(self.db.execute("INCR hits"), "1")
+        self.assertEqual(self.db.execute("INCRBY hits 41"), "42")
+        self.assertEqual(self.db.execute("DECR hits"), "41")
+        self.assertEqual(self.db.execute("DECRBY hits 50"), "-9")
+        self.assertEqual(self.db.execute("GET hits"), "-9")
+        self.assertIs(type(self.db.get("hits")), int)
+
+        # Counters keep their TTL
+        self.db.execute("SET limit:1 5 EX 100")
+        self.db.execute("INCR limit:1")
+        self.assertEqual(self.db.execute("TTL limit:1"), "100")
+
+        self.db.execute("SET big 9223372036854775807")
+        self.assertEqual(self.db.execute("INCR big"), "ERROR: Increment or decrement would overflow")
+        self.db.execute("SET name ann")
+        self.assertEqual(self.db.execute("INCR name"), "ERROR: Value is not an integer or out of range")
+        self.db.execute("SET padded 007")
+        self.assertEqual(self.db.execute("GET padded"), "007")
+        self.assertEqual(self.db.execute("INCR padded"), "ERROR: Value is not an integer or out of range")
+        self.assertEqual(self.db.execute("INCRBY hits x"), "ERROR: Increment must be an integer")
+        self.db.execute("ZADD board 1 a")
+        self.assertTrue(self.db.execute("INCR board").startswith("ERROR: WRONGTYPE"))
+
+        self.assertEqual(self.db.execute("INCRBYFLOAT price 10.5"), "10.5")
+        self.assertEqual(self.db.execute("INCRBYFLOAT price 0.5"), "11")
+        self.assertIs(type(self.db.get("price")), int)
+        self.assertEqual(self.db.execute("INCRBYFLOAT price -0.25"), "10.75")
+        self.assertEqual(self.db.execute("INCRBYFLOAT price inf"), "ERROR: Increment must be a valid float")
+        self.assertEqual(self.db.execute("INCRBYFLOAT name 1"), "ERROR: Value is not a valid float")
+
+        # Small integers share one object and are stored without per key value bytes
+        self.db.execute("MSET a 5000 b 5000")
+        self.assertIs(self.db.get("a"), self.db.get("b"))
+        self.db.flushdb()
+        self.db.execute("SET a 5000")
+        shared = self.db.used_memory
+        self.db.execute("SET a 'x'")
+        self.assertGreater(self.db.used_memory, shared)
+
+        self.db.execute("MULTI")
+        self.db.execute("INCR counter")
+        self.db.execute("INCR counter")
+        self.assertEqual(self.db.execute("EXEC"), "1) 1\n2) 2")
+
+    def test_list_commands(self):
+        """Test pushing, popping and reading lists"""
+        self.assertEqual(self.db.execute("RPUSH queue a b c"), "3")
+        self.assertEqual(self.db.execute("LPUSH queue z y"), "5")
+        self.assertEqual(self.db.execute("LRANGE queue 0 -1"), "1) y\n2) z\n3) a\n4) b\n5) c")
+        self.assertEqual(self.db.execute("LRANGE queue -2 10"), "1) b\n2) c")
+        self.assertEqual(self.db.execute("LINDEX queue -1"), "c")
+        self.assertEqual(self.db.execute("LINDEX queue 9"), "Not Found")
+        self.assertEqual(self.db.execute("LLEN queue"), "5")
+
+        self.assertEqual(self.db.execute("LPOP queue"), "y")
+        self.assertEqual(self.db.execute("RPOP queue 2"), "1) c\n2) b")
+        self.assertEqual(self.db.execute("LPOP queue 10"), "1) z\n2) a")
+        self.assertEqual(self.db.execute("EXISTS queue"), "0")
+        self.assertEqual(self.db.execute("LPOP queue"), "Not Found")
+        self.assertEqual(self.db.execute("LRANGE queue 0 -1"), "(empty list)")
+        self.assertEqual(self.db.used_memory, 0)
+
+        self.db.execute("SET name x")
+        self.assertTrue(self.db.execute("LPUSH name a").startswith("ERROR: WRONGTYPE"))
+        self.assertEqual(self.db.execute("LPOP name x"), "ERROR: count must be an integer")
+        self.assertEqual(self.db.execute("SCAN 0 TYPE list"), "1) 0\n2) (empty list)")
+
+        db = PyCacheDB(list_chunk_size=8, list_compress_depth=1)
+        db.execute_many([f"RPUSH jobs job:{i}:{'x' * 40}" for i in range(1000)])
+        self.assertEqual(db.execute("LINDEX jobs 500"), f"job:500:{'x' * 40}")
+        self.assertLess(db.used_memory, 1000 * 40)
+
+    def test_hash_commands(self):
+        """Test setting, reading, incrementing and scanning hash fields"""
+        self.assertEqual(self.db.execute("HSET user:1 name ann age 30"), "2")
+        self.assertEqual(self.db.execute("HSET user:1 age 31 city paris"), "1")
+        self.assertEqual(self.db.execute("HGET user:1 age"), "31")
+        self.assertEqual(self.db.execute("HGET user:1 zip"), "Not Found")
+        self.assertEqual(self.db.execute("HMGET user:1 name zip"), "1) ann\n2) Not Found")
+        self.assertEqual(self.db.execute("HGETALL user:1"), "1) name\n2) ann\n3) age\n4) 31\n5) city\n6) paris")
+        self.assertEqual(self.db.execute("HINCRBY user:1 age 2"), "33")
+        self.assertEqual(self.db.execute("HINCRBY user:1 visits -1"), "-1")
+        self.assertEqual(self.db.execute("HINCRBY user:1 name 1"), "ERROR: Hash value is not an integer")
+        self.assertEqual(self.db.execute("HINCRBY user:1 big 9223372036854775807"), "9223372036854775807")
+        self.assertEqual(self.db.execute("HINCRBY user:1 big 1"), "ERROR: Increment or decrement would overflow")
+        self.assertEqual(self.db.execute("HINCRBY fresh f -9223372036854775809"), "ERROR: Increment must be an integer")
+        self.assertEqual(self.db.execute("EXISTS fresh"), "0")
+
+        # Only canonical integers count, as for INCRBY
+        for increment in ("1_0", "+5", "' 5 '", "007"):
+            self.assertEqual(self.db.execute(f"HINCRBY user:1 age {increment}"), "ERROR: Increment must be an integer")
+        self.db.execute("HSET user:1 spaced ' 5 ' underscored 1_0")
+        self.assertEqual(self.db.execute("HINCRBY user:1 spaced 1"), "ERROR: Hash value is not an integer")
+        self.assertEqual(self.db.execute("HINCRBY user:1 underscored 1"), "ERROR: Hash value is not an integer")
+        self.assertEqual(self.db.execute("HDEL user:1 spaced underscored"), "2")
+        self.assertEqual(self.db.execute("HGET user:1 age"), "33")
+        self.assertEqual(self.db.execute("HGET user:1 big"), "9223372036854775807")
+        self.assertEqual(self.db.execute("HDEL user:1 big"), "1")
+        self.assertEqual(self.db.execute("HLEN user:1"), "4")
+        self.assertEqual(self.db.execute("SCAN 0 TYPE hash"), "1) 0\n2) 1) user:1")
+        self.assertEqual(self.db.execute("HSCAN user:1 0 MATCH c*"), "1) 0\n2) 1) city\n   2) paris")
+
+        self.assertEqual(self.db.execute("HDEL user:1 name age city visits zip"), "4")
+        self.assertEqual(self.db.execute("EXISTS user:1"), "0")
+        self.assertEqual(self.db.execute("HGETALL user:1"), "(empty list)")
+        self.assertEqual(self.db.execute("HMGET user:1 a b"), "1) Not Found\n2) Not Found")
+        self.assertEqual(self.db.used_memory, 0)
+
+        self.db.execute("SET name x")
+        self.assertTrue(self.db.execute("HSET name a 1").startswith("ERROR: WRONGTYPE"))
+        self.assertEqual(self.db.execute("HSET name a 1 b"), "ERROR: HSET requires field value pairs")
+
+        db = PyCacheDB(hash_max_compact_entries=2)
+        db.execute("HSET h a 1 b 2")
+        self.assertEqual(db.get("h").encoding, "listpack")
+        db.execute("HSET h c 3")
+        self.assertEqual(db.get("h").encoding, "hashtable")
+
+    def test_set_commands(self):
+        """Test adding, removing and combining sets"""
+        self.assertEqual(self.db.execute("SADD tag:a 3 1 2 1"), "3")
+        self.assertEqual(self.db.execute("SADD tag:b 2 3 4"), "3")
+        self.assertEqual(self.db.execute("SADD tag:c 3 red"), "2")
+        self.assertEqual(self.db.get("tag:a").encoding, "intset")
+        self.assertEqual(self.db.get("tag:c").encoding, "hashtable")
+
+        self.assertEqual(self.db.execute("SMEMBERS tag:a"), "1) 1\n2) 2\n3) 3")
+        self.assertEqual(self.db.execute("SISMEMBER tag:a 2"), "1")
+        self.assertEqual(self.db.execute("SISMEMBER tag:a 9"), "0")
+        self.assertEqual(self.db.execute("SCARD tag:c"), "2")
+        self.assertEqual(self.db.execute("SINTER tag:a tag:b"), "1) 2\n2) 3")
+        self.assertEqual(self.db.execute("SINTER tag:a tag:b tag:c"), "1) 3")
+        self.assertEqual(self.db.execute("SINTER tag:a missing"), "(empty list)")
+        self.assertEqual(self.db.execute("SUNION tag:a tag:b missing"), "1) 1\n2) 2\n3) 3\n4) 4")
+        self.assertEqual(self.db.execute("SDIFF tag:a tag:b missing"), "1) 1")
+        self.assertEqual(self.db.execute("SDIFF missing tag:a"), "(empty list)")
+        self.assertEqual(self.db.execute("SSCAN tag:b 0 MATCH 4"), "1) 0\n2) 1) 4")
+        self.assertEqual(self.db.execute("SCAN 0 TYPE set MATCH tag:a"), "1) 0\n2) 1) tag:a")
+
+        self.assertEqual(self.db.execute("SREM tag:a 1 2 3 4"), "3")
+        self.assertEqual(self.db.execute("EXISTS tag:a"), "0")
+
+        self.db.execute("SET name x")
+        self.assertTrue(self.db.execute("SADD name 1").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("SINTER tag:b name").startswith("ERROR: WRONGTYPE"))
+
+    def test_hyperloglog_commands(self):
+        """Test adding to, counting and merging HyperLogLogs"""
+        self.assertEqual(self.db.execute("PFADD visits:a"), "1")
+        self.assertEqual(self.db.execute("PFADD visits:a"), "0")
+        self.assertEqual(self.db.execute("PFADD visits:a u1 u2 u3"), "1")
+        self.assertEqual(self.db.execute("PFADD visits:a u2"), "0")
+        self.assertEqual(self.db.execute("PFADD visits:b u3 u4"), "1")
+
+        self.assertEqual(self.db.execute("PFCOUNT visits:a"), "3")
+        self.assertEqual(self.db.execute("PFCOUNT visits:a visits:b missing"), "4")
+        self.assertEqual(self.db.execute("PFCOUNT missing"), "0")
+
+        self.assertEqual(self.db.execute("PFMERGE visits:all visits:a visits:b"), "OK")
+        self.assertEqual(self.db.execute("PFCOUNT visits:all"), "4")
+        self.assertEqual(self.db.execute("PFCOUNT visits:a"), "3")
+        self.assertEqual(self.db.execute("SCAN 0 TYPE hyperloglog MATCH visits:all"), "1) 0\n2) 1) visits:all")
+
+        self.db.execute("SET name x")
+        self.assertTrue(self.db.execute("PFADD name u1").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("PFCOUNT visits:a name").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("PFMERGE name visits:a").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("PFMERGE visits:new name").startswith("ERROR: WRONGTYPE"))
+        self.assertEqual(self.db.execute("EXISTS visits:new"), "0")
+
+    def test_bitmap_commands(self):
+        """Test setting, counting, searching and combining bits of strings"""
+        self.assertEqual(self.db.execute("SETBIT active 7 1"), "0")
+        self.assertEqual(self.db.execute("SETBIT active 7 1"), "1")
+        self.assertEqual(self.db.execute("SETBIT active 17 1"), "0")
+        self.assertEqual(self.db.execute("GETBIT active 17"), "1")
+        self.assertEqual(self.db.execute("GETBIT active 100"), "0")
+        self.assertEqual(self.db.execute("GETBIT missing 3"), "0")
+
+        self.assertEqual(self.db.execute("BITCOUNT active"), "2")
+        self.assertEqual(self.db.execute("BITCOUNT active 1 -1"), "1")
+        self.assertEqual(self.db.execute("BITCOUNT active 8 17 BIT"), "1")
+        self.assertEqual(self.db.execute("BITCOUNT active 5 3"), "0")
+        self.assertEqual(self.db.execute("BITCOUNT missing"), "0")
+
+        self.assertEqual(self.db.execute("BITPOS active 1"), "7")
+        self.assertEqual(self.db.execute("BITPOS active 1 1"), "17")
+        self.assertEqual(self.db.execute("BITPOS active 0"), "0")
+        self.assertEqual(self.db.execute("BITPOS active 1 8 16 BIT"), "-1")
+        self.assertEqual(self.db.execute("BITPOS missing 0"), "0")
+        self.assertEqual(self.db.execute("BITPOS missing 1"), "-1")
+
+        # Strings are bitmaps of their bytes, and a bitmap reads back as a string
+        self.db.execute("SET letter a")
+        self.assertEqual(self.db.execute("BITCOUNT letter"), "3")
+        self.assertEqual(self.db.execute("SETBIT letter 6 1"), "0")
+        self.assertEqual(self.db.execute("GET letter"), "c")
+        self.assertEqual(self.db.execute("MGET letter active"), "1) c\n2) " + self.db.execute("GET active"))
+        self.assertEqual(self.db.execute("BITPOS letter 0"), "0")
+
+        self.db.execute("SETBIT zero 7 0")
+        self.assertEqual(self.db.execute("BITOP NOT full zero"), "1")
+        self.assertEqual(self.db.execute("BITPOS full 0"), "8")
+        self.assertEqual(self.db.execute("BITPOS full 0 0 0"), "-1")
+
+        self.assertEqual(self.db.execute("BITOP OR both active letter missing"), "3")
+        self.assertEqual(self.db.execute("BITCOUNT both"), "5")
+        self.assertEqual(self.db.execute("BITOP AND both active letter"), "3")
+        self.assertEqual(self.db.execute("BITCOUNT both"), "1")
+        self.assertEqual(self.db.execute("BITOP NOT inverse active"), "3")
+        self.assertEqual(self.db.execute("BITCOUNT inverse"), "22")
+        self.assertEqual(self.db.execute("BITOP OR nothing missing"), "0")
+        self.assertEqual(self.db.execute("EXISTS nothing"), "0")
+
+        self.assertTrue(self.db.execute("BITOP NOT x active letter").startswith("ERROR"))
+        self.assertTrue(self.db.execute("BITOP NAND x active").startswith("ERROR"))
+        self.assertTrue(self.db.execute("SETBIT active -1 1").startswith("ERROR"))
+        self.assertTrue(self.db.execute("SETBIT active 1 2").startswith("ERROR"))
+        self.assertTrue(self.db.execute("BITCOUNT active 1").startswith("ERROR"))
+
+        self.db.execute("ZADD z 1 m")
+        self.assertTrue(self.db.execute("SETBIT z 1 1").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("BITCOUNT z").startswith("ERROR: WRONGTYPE"))
+
+    def test_bloom_filter_commands(self):
+        """Test reserving, adding to and checking Bloom filters"""
+        self.assertEqual(self.db.execute("BF.RESERVE seen 0.001 1000 EXPANSION 4"), "OK")
+        self.assertEqual(self.db.execute("BF.RESERVE seen 0.01 10"), "ERROR: item exists")
+        self.assertEqual(self.db.execute("BF.ADD seen a"), "1")
+        self.assertEqual(self.db.execute("BF.ADD seen a"), "0")
+        self.assertEqual(self.db.execute("BF.MADD seen a b c"), "1) 0\n2) 1\n3) 1")
+        self.assertEqual(self.db.execute("BF.EXISTS seen b"), "1")
+        self.assertEqual(self.db.execute("BF.EXISTS seen z"), "0")
+        self.assertEqual(self.db.execute("BF.MEXISTS seen a z c"), "1) 1\n2) 0\n3) 1")
+        self.assertEqual(self.db.get("seen").expansion, 4)
+
+        # Missing filters contain nothing, BF.ADD creates one with the defaults
+        self.assertEqual(self.db.execute("BF.EXISTS missing a"), "0")
+        self.assertEqual(self.db.execute("BF.MEXISTS missing a b"), "1) 0\n2) 0")
+        self.assertEqual(self.db.execute("BF.ADD auto x"), "1")
+        self.assertEqual(self.db.get("auto").error_rate, 0.01)
+        self.assertEqual(self.db.execute("SCAN 0 TYPE bloom MATCH auto"), "1) 0\n2) 1) auto")
+
+        self.assertEqual(self.db.execute("BF.RESERVE small 0.01 2 NONSCALING"), "OK")
+        self.assertEqual(
+            self.db.execute("BF.MADD small a b c"),
+            "1) 1\n2) 1\n3) ERROR: non scaling filter is full"
+        )
+
+        self.assertTrue(self.db.execute("BF.RESERVE bad 2 100").startswith("ERROR"))
+        self.assertTrue(self.db.execute("BF.RESERVE bad 0.01 many").startswith("ERROR"))
+        self.assertTrue(self.db.execute("BF.RESERVE bad 0.01 100 FAST").startswith("ERROR"))
+        self.assertTrue(self.db.execute("BF.RESERVE bad 0.0001 100000000000").startswith("ERROR: capacity"))
+        self.assertTrue(self.db.execute("BF.RESERVE bad 0.01 100 EXPANSION 100000").startswith("ERROR: expansion"))
+        self.assertEqual(self.db.execute("EXISTS bad"), "0")
+
+        # The bit array has to fit in maxmemory before it is allocated
+        limited = PyCacheDB(maxmemory=100000)
+        self.assertEqual(limited.execute("BF.RESERVE big 0.001 1000000"), OOM_ERROR)
+        self.assertEqual(limited.execute("BF.RESERVE fits 0.01 1000"), "OK")
+        self.assertEqual(limited.execute("EXISTS big"), "0")
+        self.assertEqual(self.db.execute("EXISTS bad"), "0")
+
+        self.db.execute("SET name x")
+        self.assertTrue(self.db.execute("BF.ADD name a").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("BF.EXISTS name a").startswith("ERROR: WRONGTYPE"))
+
+    def test_stream_commands(self):
+        """Test appending to, ranging over, reading and trimming streams"""
+        self.assertEqual(self.db.execute("XADD events 1-1 user a"), "1-1")
+        self.assertEqual(self.db.execute("XADD events 1-* user b"), "1-2")
+        self.assertEqual(self.db.execute("XADD events 2 user c page home"), "2-0")
+        self.assertEqual(self.db.execute("XLEN events"), "3")
+        self.assertEqual(self.db.execute("XLEN missing"), "0")
+
+        self.assertEqual(
+            self.db.execute("XRANGE events (1-1 +"),
+            "1) 1) 1-2\n   2) 1) user\n      2) b\n"
+            "2) 1) 2-0\n   2) 1) user\n      2) c\n      3) page\n      4) home"
+        )
+        self.assertEqual(self.db.execute("XRANGE events - 1 COUNT 1"), "1) 1) 1-1\n   2) 1) user\n      2) a")
+        self.assertEqual(self.db.execute("XRANGE events 3 +"), "(empty list)")
+        self.assertEqual(self.db.execute("XRANGE missing - +"), "(empty list)")
+
+        self.assertEqual(
+            self.db.execute("XREAD COUNT 1 STREAMS events missing 1-1 0"),
+            "1) 1) events\n   2) 1) 1) 1-2\n         2) 1) user\n            2) b"
+        )
+        self.assertEqual(self.db.execute("XREAD STREAMS events $"), "(empty list)")
+
+        self.assertEqual(self.db.execute("XADD events MAXLEN 2 3-0 user d"), "3-0")
+        self.assertEqual(self.db.execute("XRANGE events - 2-0"), "1) 1) 2-0\n   2) 1) user\n      2) c\n      3) page\n      4) home")
+        self.assertEqual(self.db.execute("XADD events MAXLEN ~ 1 4-0 user e"), "4-0")
+        self.assertEqual(self.db.execute("SCAN 0 TYPE stream"), "1) 0\n2) 1) events")
+
+        error = "ERROR: The ID specified in XADD is equal or smaller than the target stream top item"
+        self.assertEqual(self.db.execute("XADD events 4-0 user f"), error)
+        self.assertEqual(self.db.execute("XADD fresh 0-0 user f"), error)
+        self.assertEqual(self.db.execute("EXISTS fresh"), "0")
+        self.assertTrue(self.db.execute("XADD events bad user f").startswith("ERROR"))
+        self.assertTrue(self.db.execute("XADD events * user").startswith("ERROR"))
+        self.assertTrue(self.db.execute("XADD events MAXLEN -1 * user f").startswith("ERROR"))
+        self.assertTrue(self.db.execute("XREAD STREAMS events").startswith("ERROR"))
+
+        self.db.execute("SET name x")
+        self.assertTrue(self.db.execute("XADD name * a b").startswith("ERROR: WRONGTYPE"))
+        self.assertTrue(self.db.execute("XRANGE name - +").startswith("ERROR: WRONGTYPE"))
+
+    def test_memory_accounting(self):
+        """Test that used_memory follows writes, overwrites, in place changes and deletes"""
+        self.assertEqual(self.db.used_memory, 0)
+
+        self.db.execute("SET a 1")
+        after_set = self.db.used_memory
+        self.assertGreater(after_set, 0)
+        self.db.execute("SET a 'a much longer value than before'")
+        self.assertGreater(self.db.used_memory, after_set)
+        self.db.execute("APPEND a xyz")
+
+        self.db.execute("ZADD z 1 m")
+        after_zadd = self.db.used_memory
+        self.db.execute("ZADD z 2 n 3 o")
+        self.assertGreater(self.db.used_memory, after_zadd)
+        self.db.execute("MSET b 1 c 2 z 3")
+        self.db.execute("SET d 1 EX 10")
+        self.db.expires["d"] = 0
+
+        self.assertEqual(self.db.execute("DEL a b c z d"), "4")
+        self.assertEqual(self.db.used_memory, 0)
+        self.assertEqual(self.db.sizes, {})
+
+        self.db.execute("ZADD z 1 m")
+        self.db.execute("ZREM z m")
+        self.assertEqual(self.db.used_memory, 0)
+
+        info = self.db.execute("INFO memory")
+        self.assertIn("used_memory: 0", info)
+        self.assertIn("maxmemory_policy: noeviction", info)
+
+    def test_maxmemory_policies(self):
+        """Test that write commands evict with the maxmemory policy once the limit is reached"""
+        lru = PyCacheDB(maxmemory=20000, maxmemory_policy="allkeys-lru")
+        lru.execute("SET hot 1")
+        for i in range(1000):
+            lru.execute("GET hot")
+            lru.execute(f"SET key:{i} {'x' * 50}")
+
+        self.assertLessEqual(lru.used_memory, 20000 + 200)
+        self.assertEqual(lru.execute("GET hot"), "1")
+        self.assertIn("key:999", lru.data)
+        self.assertGreater(lru.info("stats")["evicted_keys"], 800)
+
+        lfu = PyCacheDB(maxmemory=5000, maxmemory_policy="allkeys-lfu")
+        lfu.execute_many(["SET hot 1"] + ["GET hot"] * 5 + [f"SET key:{i} 1" for i in range(500)])
+        self.assertEqual(lfu.execute("GET hot"), "1")
+        self.assertLessEqual(lfu.used_memory, 5000 + 200)
+
+        volatile = PyCacheDB(maxmemory=30000, maxmemory_policy="volatile-ttl")
+        for i in range(100):
+            volatile.execute(f"SET keep:{i} 1")
+        for i in range(500):
+            volatile.execute(f"SET temp:{i} 1 EX {1000 - i}")
+
+        self.assertTrue(all(f"keep:{i}" in volatile.data for i in range(100)))
+        self.assertLess(len(volatile.expires), 500)
+
+        # Once only keys without a TTL are left, writes are refused
+        volatile.execute("DEL " + " ".join(volatile.expires))
+        volatile.execute_many([f"SET keep:{i} 1" for i in range(100, 300)])
+        self.assertTrue(volatile.execute("SET more 1").startswith("ERROR: OOM"))
+
+    def test_noeviction(self):
+        """Test that noeviction refuses writes but keeps serving reads and deletes"""
+        db = PyCacheDB(maxmemory=1000)
+        replies = db.execute_many([f"SET key:{i} {i}" for i in range(20)])
+
+        self.assertIn(OOM_ERROR, replies)
+        self.assertLessEqual(db.used_memory, 1000 + 200)
+        self.assertEqual(db.execute("GET key:0"), "0")
+        self.assertEqual(db.execute("ZADD z 1 m"), OOM_ERROR)
+        self.assertEqual(db.info("stats")["evicted_keys"], 0)
+
+        db.execute("MULTI")
+        self.assertEqual(db.execute("SET x 1"), OOM_ERROR)
+        self.assertTrue(db.execute("EXEC").startswith("ERROR: EXECABORT"))
+
+        db.execute("DEL key:0 key:1 key:2 key:3")
+        self.assertEqual(db.execute("SET x 1"), "OK")
+
+        # Memory is checked again at EXEC, a write queued while there was room is refused
+        db.execute("MULTI")
+        self.assertEqual(db.execute("SET y 1"), "QUEUED")
+        db.set_many((f"other:{i}", "1") for i in range(20))
+        self.assertEqual(db.execute("EXEC"), OOM_ERROR)
+        self.assertEqual(db.execute("GET y"), "Not Found")
+
+        db.execute("MULTI")
+        db.execute("GET x")
+        self.assertEqual(db.execute("EXEC"), "1) 1")
+
+        # A transaction aborted by WATCH returns nil without evicting or failing on memory
+        db = PyCacheDB(maxmemory=1000)
+        db.execute("WATCH x")
+        db.execute("MULTI")
+        self.assertEqual(db.execute("SET y 1"), "QUEUED")
+        db.set("x", "2")
+        db.set_many((f"other:{i}", "1") for i in range(20))
+        self.assertEqual(db.execute("EXEC"), "(nil)")
+
+        lru = PyCacheDB(maxmemory=1000, maxmemory_policy="allkeys-lru")
+        lru.execute("SET watched 1")
+        lru.execute("WATCH watched")
+        lru.execute("MULTI")
+        lru.execute("SET y 1")
+        lru.set("watched", "2")
+        lru.set_many((f"other:{i}", "1") for i in range(20))
+        keys = len(lru.data)
+        self.assertEqual(lru.execute("EXEC"), "(nil)")
+        self.assertEqual(len(lru.data), keys)
+
+        with self.assertRaises(ValueError):
+            PyCacheDB(maxmemory=10, maxmemory_policy="allkeys-random")
+        with self.assertRaises(ValueError):
+            PyCacheDB(eviction_policy="LFU", maxmemory=10, maxmemory_policy="allkeys-lru")
+
+    def test_active_expire_cycle(self):
+        """Test that expired keys nobody reads are reclaimed by the active cycle"""
+        db = PyCacheDB(active_expire_hz=0)
+        for i in range(1000):
+            db.set(f"temp:{i}", "x", ttl=100)
+        for i in range(100):
+            db.set(f"live:{i}", "x", ttl=100)
+        db.set("forever", "x")
+
+        # Expiring the temp keys without touching them
+        for i in range(1000):
+            db.expires[f"temp:{i}"] = 0
+
+        removed = db.active_expire_cycle(budget=10)
+        self.assertGreater(removed, 700)
+        self.assertEqual(len(db.data), 1101 - removed)
+
+        # A cycle may stop early on a sample without expired keys, so a few more run
+        for _ in range(100):
+            db.active_expire_cycle(budget=10)
+        self.assertLessEqual(len(db.data), 101 + 10)
+
+        info = db.info("stats")
+        self.assertEqual(info["expired_keys_active"], 1101 - len(db.data))
+        self.assertEqual(info["expired_keys"], info["expired_keys_active"])
+        self.assertEqual(db.execute("GET forever"), "x")
+
+    def test_active_expire_runs_between_commands(self):
+        """Test that commands trigger the cycle once its interval has passed"""
+        for i in range(50):
+            self.db.set(f"temp:{i}", "x", ttl=100)
+            self.db.expires[f"temp:{i}"] = 0
+
+        self.db.next_expire_cycle = 0
+        self.db.execute("PING")
+        self.assertGreater(self.db.expired_keys_active, 0)
+        self.assertGreater(self.db.next_expire_cycle, 0)
+
+        # The time cap stops a cycle that keeps finding expired keys
+        for i in range(5000):
+            self.db.set(f"more:{i}", "x", ttl=100)
+            self.db.expires[f"more:{i}"] = 0
+        self.db.active_expire_cycle(budget=0)
+        self.assertEqual(self.db.info("stats")["expire_cycle_time_cap_reached"], 1)
+
+    def test_multi_key_commands(self):
+        """Test MGET, MSET, MSETNX and multi-key DEL and EXISTS"""
+        self.assertEqual(self.db.execute("MSET a 1 b 2 a 3"), "OK")
+        self.assertEqual(self.db.execute("MSET a"), "ERROR: MSET command requires at least 2 argument(s)")
+        self.assertEqual(self.db.execute("MSET a 1 b"), "ERROR: MSET requires key value pairs")
+
+        self.db.execute("ZADD z 1 m")
+        self.assertEqual(self.db.execute("MGET a b missing z"), "1) 3\n2) 2\n3) Not Found\n4) Not Found")
+
+        # MSETNX writes nothing if any key exists
+        self.assertEqual(self.db.execute("MSETNX c 1 b 9"), "0")
+        self.assertEqual(self.db.execute("MGET b c"), "1) 2\n2) Not Found")
+        self.assertEqual(self.db.execute("MSETNX c 1 d 2"), "1")
+
+        self.db.execute("SET gone x EX 10")
+        self.db.expire("gone", -1)
+        self.assertEqual(self.db.execute("EXISTS a a gone missing"), "2")
+        self.assertEqual(self.db.execute("DEL a b b gone missing"), "2")
+        self.assertEqual(self.db.execute("EXISTS a b c d"), "2")
+
+    def test_prepared_commands(self):
+        """Test preparing parameterized queries and running them"""
+        set_session = self.db.prepare("SET session:? ? EX ?")
+        get_session = self.db.prepare("GET session:?")
+
+        self.assertEqual(set_session.run("a", "token", 100), "OK")
+        self.assertEqual(get_session.run("a"), "token")
+        self.assertEqual(self.db.ttl("session:a"), 100)
+        self.assertEqual(get_session.run("b"), "Not Found")
+        self.assertEqual(get_session.run(), "ERROR: Expected 1 parameter(s), got 0")
+        self.assertEqual(set_session.run("a", "v", "soon"), "ERROR: EX value must be an integer")
+
+        # A quoted ? is a literal, not a parameter
+        literal = self.db.prepare("SET '?' ?")
+        self.assertEqual(literal.run(42), "OK")
+        self.assertEqual(self.db.execute("GET '?'"), "42")
+
+        # Commands without a specialized runner fall back to execute
+        zadd = self.db.prepare("ZADD board ? ?")
+        self.assertEqual(zadd.run(1.5, "ann"), "1")
+        self.assertEqual(self.db.execute("ZSCORE board ann"), "1.5")
+
+        self.db.execute("MULTI")
+        self.assertEqual(get_session.run("a"), "QUEUED")
+        self.assertEqual(self.db.execute("EXEC"), "1) token")
+
+    def test_prepare_errors(self):
+        """Test that invalid prepared queries are rejected up front"""
+        for query in ["", "? key", "NOPE ?", "SET ? ? ? 10", "SET ? ? NX XX", "GET"]:
+            with self.assertRaises(ParseError):
+                self.db.prepare(query)
+
+
+if __name__ == "__main__":
+    unittest.main()
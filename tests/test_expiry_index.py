@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from pycachedb.data_structures.expiry_index import ExpiryIndex
+
+class TestExpiryIndex(unittest.TestCase):
+    """Test cases for the ExpiryIndex class"""
+
+    def setUp(self):
+        """Set up an empty index"""
+        self.index = ExpiryIndex()
+
+    def test_set_get_pop(self):
+        """Test storing, overwriting and removing deadlines"""
+        self.index["a"] = 1.5
+        self.index["b"] = 2.5
+        self.index["a"] = 3.5
+
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index["a"], 3.5)
+        self.assertEqual(self.index.get("b"), 2.5)
+        self.assertIsNone(self.index.get("c"))
+        self.assertIn("a", self.index)
+
+        self.assertEqual(self.index.pop("a"), 3.5)
+        self.assertIsNone(self.index.pop("a"))
+        with self.assertRaises(KeyError):
+            del self.index["a"]
+
+        self.index.clear()
+        self.assertFalse(self.index)
+
+    def test_slots_stay_dense(self):
+        """Test random removals against a dict, the slots must stay consistent"""
+        rng = random.Random(5)
+        expected = {}
+
+        for step in range(3000):
+            key = f"key:{rng.randrange(200)}"
+            if rng.random() < 0.6:
+                self.index[key] = float(step)
+                expected[key] = float(step)
+            else:
+                self.assertEqual(self.index.pop(key), expected.pop(key, None))
+
+        self.assertEqual(len(self.index), len(expected))
+        self.assertEqual(sorted(self.index), sorted(expected))
+        for key, deadline in expected.items():
+            self.assertEqual(self.index[key], deadline)
+            self.assertEqual(self.index.keys[self.index.positions[key]], key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from pycachedb.data_structures.hyperloglog import (
+    DENSE_SIZE,
+    REGISTERS,
+    HyperLogLog,
+    _max_registers,
+    _pack,
+    _unpack,
+)
+
+def make_hyperloglog(elements, sparse_max_bytes=3000):
+    """Builds a HyperLogLog from an iterable of elements"""
+    hyperloglog = HyperLogLog(sparse_max_bytes)
+    for element in elements:
+        hyperloglog.add(str(element))
+    return hyperloglog
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """Test cases for the HyperLogLog class"""
+
+    def assertEstimate(self, estimate, actual, tolerance=0.03):
+        """Checks an estimate is within a relative tolerance of the actual cardinality"""
+        self.assertLessEqual(abs(estimate - actual), actual * tolerance, (estimate, actual))
+
+    def test_packing(self):
+        """Test that the 6 bit dense layout round trips and the vectorized maximum is register wise"""
+        rng = random.Random(7)
+        left = bytes(rng.randrange(52) for _ in range(REGISTERS))
+        right = bytes(rng.randrange(52) for _ in range(REGISTERS))
+
+        dense = _pack(left)
+        self.assertEqual(len(dense), DENSE_SIZE)
+        self.assertEqual(bytes(_unpack(dense)), left)
+        self.assertEqual(_max_registers(left, right), bytes(map(max, left, right)))
+
+    def test_sparse(self):
+        """Test small cardinalities are exact enough and stay sparse"""
+        hyperloglog = make_hyperloglog(range(100))
+
+        self.assertEqual(hyperloglog.encoding, "sparse")
+        self.assertEqual(hyperloglog.count(), 100)
+        self.assertFalse(hyperloglog.add("5"))
+        self.assertEqual(HyperLogLog().count(), 0)
+
+    def test_conversion(self):
+        """Test the sparse encoding turns dense past its size limit, keeping the registers"""
+        hyperloglog = make_hyperloglog(range(200), sparse_max_bytes=400)
+        self.assertEqual(hyperloglog.encoding, "dense")
+
+        sparse = make_hyperloglog(range(200))
+        self.assertEqual(sparse.encoding, "sparse")
+        self.assertEqual(hyperloglog.registers(), sparse.registers())
+        self.assertEqual(hyperloglog.count(), sparse.count())
+
+        # A dense HyperLogLog costs about 12 KB whatever the cardinality
+        self.assertLess(hyperloglog.memory_usage(), 13000)
+
+    def test_accuracy(self):
+        """Test large cardinalities are estimated within a few standard errors"""
+        for size in (1000, 20000, 100000):
+            self.assertEstimate(make_hyperloglog(range(size)).count(), size)
+
+    def test_cached_count(self):
+        """Test the cached estimate is dropped when a register changes"""
+        hyperloglog = make_hyperloglog(range(2000))
+        estimate = hyperloglog.count()
+        self.assertEqual(hyperloglog.cached_count, estimate)
+
+        hyperloglog.add("1")
+        self.assertEqual(hyperloglog.cached_count, estimate)
+
+        for element in range(2000, 4000):
+            hyperloglog.add(str(element))
+        self.assertIsNone(hyperloglog.cached_count)
+        self.assertEstimate(hyperloglog.count(), 4000)
+
+    def test_merge(self):
+        """Test merging estimates the union and counting a union leaves the inputs unchanged"""
+        first = make_hyperloglog(range(0, 30000))
+        second = make_hyperloglog(range(20000, 50000))
+        small = make_hyperloglog(range(49990, 50010))
+        first_count = first.count()
+
+        self.assertEstimate(HyperLogLog.count_union([first, second, small]), 50010)
+        self.assertEqual(first.count(), first_count)
+
+        first.merge([second, small])
+        self.assertEqual(first.encoding, "dense")
+        self.assertEstimate(first.count(), 50010)
+        self.assertEqual(first.registers(), make_hyperloglog(range(50010)).registers())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+
+from pycachedb.query.lexer import TokenType, Token, Lexer, LexerError, StreamLexer
+
+class TestLexer(unittest.TestCase):
+    """Test cases for the Lexer class"""
+
+    def setUp(self):
+        """Set up a new Lexer for each test"""
+        self.lexer = Lexer()
+
+    def summary(self, tokens):
+        """Reduces tokens to (type, value) pairs"""
+        return [(token.type, token.value) for token in tokens]
+
+    def test_token_is_slotted(self):
+        """Test that tokens do not carry a per-instance dict"""
+        token = Token(TokenType.IDENTIFIER, "key", 0)
+        self.assertFalse(hasattr(token, "__dict__"))
+
+    def test_basic_query(self):
+        """Test command, identifiers, numbers and flags"""
+        tokens = self.lexer.tokenize("SET  user:1 42 ex 3600")
+
+        self.assertEqual(self.summary(tokens), [
+            (TokenType.COMMAND, "SET"),
+            (TokenType.IDENTIFIER, "user:1"),
+            (TokenType.NUMBER, "42"),
+            (TokenType.FLAG, "ex"),
+            (TokenType.NUMBER, "3600"),
+            (TokenType.END, ""),
+        ])
+        self.assertEqual([token.position for token in tokens], [0, 5, 12, 15, 18, 22])
+
+    def test_numbers(self):
+        """Test signed and decimal numbers"""
+        tokens = self.lexer.tokenize("ZADD k -1.5 a +3 b 1.2.3 c - d")
+        types = [token.type for token in tokens[1:-1]]
+
+        self.assertEqual(types, [
+            TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.IDENTIFIER, TokenType.NUMBER,
+            TokenType.IDENTIFIER, TokenType.IDENTIFIER, TokenType.IDENTIFIER,
+            TokenType.IDENTIFIER, TokenType.IDENTIFIER,
+        ])
+
+    def test_quoted_strings(self):
+        """Test both quote styles, embedded spaces and escapes"""
+        tokens = self.lexer.tokenize("""SET k 'John Doe' "say \\"hi\\"\\n" '' 'it\\'s'""")
+
+        self.assertEqual(self.summary(tokens[2:-1]), [
+            (TokenType.STRING, "John Doe"),
+            (TokenType.STRING, 'say "hi"\n'),
+            (TokenType.STRING, ""),
+            (TokenType.STRING, "it's"),
+        ])
+
+    def test_empty_query(self):
+        """Test that blank input only yields END"""
+        self.assertEqual(self.summary(self.lexer.tokenize("   ")), [(TokenType.END, "")])
+
+    def test_unterminated_string(self):
+        """Test that an unterminated string reports where it started"""
+        with self.assertRaises(LexerError) as context:
+            self.lexer.tokenize("SET k 'oops")
+        self.assertEqual(context.exception.position, 6)
+
+    def test_tokenize_buffer(self):
+        """Test that byte buffers tokenize like strings"""
+        query = "HSET user:1 name 'Zoë \\'Z\\'' age 30"
+        from_str = self.lexer.tokenize(query)
+        from_bytes = self.lexer.tokenize_buffer(memoryview(query.encode("utf-8")))
+
+        self.assertEqual(self.summary(from_str), self.summary(from_bytes))
+
+    def test_unknown_escape_of_multibyte_character(self):
+        """Test that an unknown escape keeps a whole UTF-8 character in byte buffers"""
+        self.assertEqual(self.lexer.tokenize_buffer('"\\é"'.encode())[0].value, "é")
+        self.assertEqual(self.lexer.tokenize_buffer('"a\\€b\\😀"'.encode())[0].value, "a€b😀")
+        self.assertEqual(self.lexer.tokenize('"\\é"')[0].value, "é")
+
+
+class TestStreamLexer(unittest.TestCase):
+    """Test cases for the StreamLexer class"""
+
+    def test_partial_lines(self):
+        """Test that queries split across reads are tokenized once complete"""
+        stream = StreamLexer()
+
+        values = lambda queries: [[token.value for token in tokens] for tokens in queries]
+
+        self.assertEqual(values(stream.feed(b"GET a\r\nSET b 'x y")), [["GET", "a", ""]])
+        self.assertEqual(values(stream.feed(b"'\n\nDEL")), [["SET", "b", "x y", ""]])
+        self.assertEqual(bytes(stream.buffer), b"DEL")
+        self.assertEqual(values(stream.feed(b" a b\n")), [["DEL", "a", "b", ""]])
+        self.assertEqual(len(stream.buffer), 0)
+
+    def test_malformed_line(self):
+        """Test that a malformed line is consumed and reported in place, without losing its neighbours"""
+        stream = StreamLexer()
+
+        queries = stream.feed(b'GET a\nSET "x\nGET b\n\xff\n')
+        self.assertEqual([token.value for token in queries[0]], ["GET", "a", ""])
+        self.assertIsInstance(queries[1], LexerError)
+        self.assertEqual(queries[1].position, 4)
+        self.assertEqual([token.value for token in queries[2]], ["GET", "b", ""])
+        self.assertIsInstance(queries[3], LexerError)
+        self.assertEqual(len(stream.buffer), 0)
+
+        self.assertEqual([[token.value for token in tokens] for tokens in stream.feed(b"GET c\n")], [["GET", "c", ""]])
+
+
+if __name__ == "__main__":
+    unittest.main()
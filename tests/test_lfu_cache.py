@@ -1,3 +1,4 @@
+import time
 import unittest
 from typing import Union, Any, Dict
 
@@ -152,6 +153,53 @@ class TestLFUCache(unittest.TestCase):
         self.assertEqual(negative_cache.current_size, 0)
         self.assertIsNone(negative_cache.get("key1"))
     
+    def test_evict(self):
+        """Test that evict removes and returns the least frequently used key"""
+        self.cache.put("key1", "value1")
+        self.cache.put("key2", "value2")
+        self.cache.get("key1")
+
+        self.assertEqual(self.cache.evict(), "key2")
+        self.assertEqual(self.cache.min_frequency, 2)
+        self.assertEqual(self.cache.evict(), "key1")
+        self.assertIsNone(self.cache.evict())
+        self.assertEqual(self.cache.min_frequency, 0)
+
+    def test_ttl(self):
+        """Test that items put with a TTL expire and that put without one clears it"""
+        now = time.monotonic()
+        self.cache.put("key1", "value1", ttl=10)
+        self.cache.put("key2", "value2", ttl=10)
+        self.cache.put("key2", "value2")
+
+        self.assertEqual(self.cache.tick(now + 5), 0)
+        self.assertEqual(self.cache.tick(now + 11), 1)
+        self.assertIsNone(self.cache.get("key1"))
+        self.assertEqual(self.cache.get("key2"), "value2")
+        self.assertEqual(self.cache.current_size, 1)
+
+        with self.assertRaises(ValueError):
+            self.cache.put("key3", "value3", ttl=0)
+        self.assertEqual(self.cache.current_size, 1)
+
+    def test_expired_items_reclaimed_before_eviction(self):
+        """Test that a full cache drops its expired items instead of evicting live ones"""
+        self.cache.put("key1", "value1")
+        self.cache.put("key2", "value2", ttl=0.01)
+        self.cache.put("key3", "value3")
+        self.cache.get("key2")
+        time.sleep(0.03)
+
+        self.assertIsNone(self.cache.get("key2"))
+        self.cache.put("key2", "value2", ttl=0.01)
+        time.sleep(0.03)
+        self.cache.put("key4", "value4")
+
+        self.assertEqual(self.cache.get("key1"), "value1")
+        self.assertEqual(self.cache.get("key3"), "value3")
+        self.assertEqual(self.cache.get("key4"), "value4")
+        self.assertEqual(len(self.cache.expiry), 0)
+
     def test_mixed_key_types(self):
         """Test that the cache works with different key types"""
         self.cache.put(1, "value1")
@@ -0,0 +1,58 @@
+import unittest
+
+from pycachedb.database import PyCacheDB
+from pycachedb.query.commands import GetCommand, SetCommand
+from pycachedb.query.parser import Parser, ParseError
+
+class TestParser(unittest.TestCase):
+    """Test cases for the Parser class"""
+
+    def setUp(self):
+        """Set up a database and a parser with a tiny cache"""
+        self.db = PyCacheDB()
+        self.parser = Parser(self.db.registry, cache_size=2)
+
+    def test_parse_dispatch(self):
+        """Test that queries resolve to the registered command instance"""
+        command, args = self.parser.parse("set user:1 'John Doe' EX 10")
+
+        self.assertIsInstance(command, SetCommand)
+        self.assertIs(command, self.db.registry.get_command("SET"))
+        self.assertEqual(args, ["user:1", "John Doe", "EX", "10"])
+
+    def test_parse_errors(self):
+        """Test empty, malformed and unknown queries"""
+        for query in ["", "   ", "NOPE a", "GET 'unterminated"]:
+            with self.assertRaises(ParseError):
+                self.parser.parse(query)
+
+        self.assertEqual(self.parser.execute("NOPE"), "ERROR: Unknown command 'NOPE'")
+
+    def test_parse_cache(self):
+        """Test that repeated queries skip lexing and the cache stays bounded"""
+        first = self.parser.parse("GET a")
+        self.assertIs(self.parser.parse("GET a"), first)
+
+        self.parser.parse("GET b")
+        self.parser.parse("GET a")
+        self.parser.parse("GET c")
+
+        self.assertEqual(list(self.parser.cache), ["GET a", "GET c"])
+        self.assertIsInstance(self.parser.cache["GET c"][0], GetCommand)
+
+    def test_cache_disabled(self):
+        """Test that a zero sized cache stores nothing"""
+        parser = Parser(self.db.registry, cache_size=0)
+        parser.parse("GET a")
+
+        self.assertEqual(len(parser.cache), 0)
+
+    def test_execute(self):
+        """Test that execute runs the command against the database"""
+        self.assertEqual(self.parser.execute("SET k v"), "OK")
+        self.assertEqual(self.parser.execute("GET k"), "v")
+        self.assertEqual(self.parser.execute("GET k extra"), "ERROR: GET command takes at most 1 argument(s)")
+
+
+if __name__ == "__main__":
+    unittest.main()
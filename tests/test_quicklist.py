@@ -0,0 +1,82 @@
+import random
+import unittest
+
+from pycachedb.data_structures.quicklist import QuickList
+
+class TestQuickList(unittest.TestCase):
+    """Test cases for the QuickList class"""
+
+    def setUp(self):
+        """Set up a list with small chunks so operations cross chunk boundaries"""
+        self.values = QuickList(chunk_size=4)
+
+    def test_push_pop(self):
+        """Test pushing and popping at both ends"""
+        for i in range(10):
+            self.values.push_right(str(i))
+        self.values.push_left("a")
+
+        self.assertEqual(len(self.values), 11)
+        self.assertEqual(self.values.node_count, 4)
+        self.assertEqual(self.values.pop_left(), "a")
+        self.assertEqual(self.values.pop_right(), "9")
+        self.assertEqual(list(self.values), [str(i) for i in range(9)])
+
+        while self.values:
+            self.values.pop_left()
+        self.assertIsNone(self.values.pop_right())
+        self.assertIsNone(self.values.head)
+        self.assertEqual(self.values.node_count, 0)
+
+    def test_index_and_range(self):
+        """Test index and range lookups against a plain list"""
+        expected = []
+        for i in range(50):
+            value = f"v{i}"
+            if i % 3:
+                self.values.push_right(value)
+                expected.append(value)
+            else:
+                self.values.push_left(value)
+                expected.insert(0, value)
+
+        for index in range(-55, 55):
+            in_range = -50 <= index < 50
+            self.assertEqual(self.values.index(index), expected[index] if in_range else None)
+
+        self.assertEqual(self.values.range(0, -1), expected)
+        self.assertEqual(self.values.range(5, 17), expected[5:18])
+        self.assertEqual(self.values.range(-10, -3), expected[-10:-2])
+        self.assertEqual(self.values.range(-100, 2), expected[:3])
+        self.assertEqual(self.values.range(30, 10), [])
+
+    def test_compression(self):
+        """Test that interior chunks are compressed and end chunks stay readable"""
+        values = QuickList(chunk_size=16, compress_depth=1)
+        expected = []
+        for i in range(2000):
+            value = f"job:{i}:" + "x" * 40
+            values.push_right(value)
+            expected.append(value)
+
+        plain = QuickList(chunk_size=16)
+        for value in expected:
+            plain.push_right(value)
+
+        self.assertIsNone(values.head.compressed)
+        self.assertIsNone(values.tail.compressed)
+        self.assertIsNotNone(values.head.next.compressed)
+        self.assertLess(values.memory_usage(), plain.memory_usage() // 2)
+        self.assertEqual(values.range(100, 130), expected[100:131])
+        self.assertEqual(values.index(1000), expected[1000])
+
+        # Draining the list from both ends decompresses the chunks reaching the ends
+        while values:
+            operation = random.choice((values.pop_left, values.pop_right))
+            value = operation()
+            self.assertEqual(value, expected.pop(0) if operation == values.pop_left else expected.pop())
+        self.assertEqual(values.element_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
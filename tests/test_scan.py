@@ -0,0 +1,206 @@
+import unittest
+
+from pycachedb import PyCacheDB
+from pycachedb.query.scan import ScanCursors, compile_glob
+
+class TestGlob(unittest.TestCase):
+    """Test cases for compiled glob patterns"""
+
+    def test_matching(self):
+        """Test wildcards, classes and escapes"""
+        cases = {
+            "*": (["", "anything"], []),
+            "user:*": (["user:", "user:42"], ["user", "xuser:1"]),
+            "user:?": (["user:1"], ["user:", "user:12"]),
+            "h[ae]llo": (["hello", "hallo"], ["hillo", "hllo"]),
+            "h[^e]llo": (["hallo", "hxllo"], ["hello"]),
+            "h[!e]llo": (["hallo"], ["hello"]),
+            "h[a-c]llo": (["hbllo"], ["hdllo"]),
+            "a\\*b": (["a*b"], ["axb"]),
+            "*:1?:*": (["u:12:x", ":10:"], ["u:1:x"]),
+            "exact": (["exact"], ["exactly"]),
+            "a[b": (["a[b"], ["ab"]),
+        }
+
+        for pattern, (matching, other) in cases.items():
+            glob = compile_glob(pattern)
+            for key in matching:
+                self.assertTrue(glob.match(key), (pattern, key))
+            for key in other:
+                self.assertFalse(glob.match(key), (pattern, key))
+
+    def test_prefix_and_cache(self):
+        """Test literal prefix extraction and reuse of compiled patterns"""
+        self.assertEqual(compile_glob("session:*:token").prefix, "session:")
+        self.assertEqual(compile_glob("a\\?b*").prefix, "a?b")
+        self.assertEqual(compile_glob("*x").prefix, "")
+        self.assertTrue(compile_glob("**").match_all)
+        self.assertIs(compile_glob("user:*"), compile_glob("user:*"))
+
+
+class TestScan(unittest.TestCase):
+    """Test cases for SCAN, ZSCAN and KEYS"""
+
+    def setUp(self):
+        """Set up a database with a hundred keys"""
+        self.db = PyCacheDB()
+        for i in range(100):
+            self.db.set(f"key:{i}", str(i))
+
+    def scan_all(self, pattern=None, count=7):
+        """Runs a full SCAN iteration and returns the keys and number of calls"""
+        cursor, keys = self.db.scan(0, pattern, count)
+        calls = 1
+        while cursor != 0:
+            cursor, batch = self.db.scan(cursor, pattern, count)
+            keys.extend(batch)
+            calls += 1
+        return keys, calls
+
+    def test_full_iteration(self):
+        """Test that an iteration returns every key once in bounded batches"""
+        keys, calls = self.scan_all()
+
+        self.assertEqual(sorted(keys), sorted(f"key:{i}" for i in range(100)))
+        self.assertEqual(calls, 15)
+
+        keys, _ = self.scan_all("key:1?")
+        self.assertEqual(sorted(keys), sorted(f"key:{i}" for i in range(10, 20)))
+
+    def test_concurrent_changes(self):
+        """Test that keys removed during an iteration are skipped and stable keys are kept"""
+        cursor, keys = self.db.scan(0, count=50)
+        for i in range(100):
+            if i % 2:
+                self.db.delete(f"key:{i}")
+        self.db.set("new", "1")
+
+        while cursor != 0:
+            cursor, batch = self.db.scan(cursor, count=50)
+            keys.extend(batch)
+
+        remaining = {f"key:{i}" for i in range(0, 100, 2)}
+        self.assertTrue(remaining <= set(keys))
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertFalse(any(key.endswith(("1", "3", "5", "7", "9")) for key in keys[50:]))
+
+    def test_stateless_cursors(self):
+        """Test that SCAN keeps no snapshot and any number of iterations stay valid"""
+        cursors = [self.db.scan(0, count=10)[0] for _ in range(100)]
+        self.assertFalse(self.db.scan_cursors.indexes)
+
+        for cursor in cursors:
+            keys = []
+            while cursor != 0:
+                cursor, batch = self.db.scan(cursor, count=10)
+                keys.extend(batch)
+            self.assertEqual(len(keys), 90)
+
+    def test_compaction_keeps_cursors(self):
+        """Test that compacting the key index neither skips nor repeats keys of a running iteration"""
+        cursor, keys = self.db.scan(0, count=30)
+
+        for _ in range(3):
+            for i in range(30, 100):
+                self.db.delete(f"key:{i}")
+                self.db.set(f"key:{i}", str(i))
+        self.assertLess(len(self.db.key_index), 200)
+
+        while cursor != 0:
+            cursor, batch = self.db.scan(cursor, count=30)
+            keys.extend(batch)
+
+        self.assertEqual(sorted(keys), sorted(f"key:{i}" for i in range(100)))
+
+        self.db.flushdb()
+        self.assertEqual(self.db.scan(0), (0, []))
+
+    def test_scan_command(self):
+        """Test the SCAN reply format, options and errors"""
+        self.db.execute("ZADD board 1 ann")
+
+        self.assertEqual(self.db.execute("SCAN 0 TYPE zset COUNT 1000"), "1) 0\n2) 1) board")
+        self.assertEqual(self.db.execute("SCAN 0 MATCH nope:* COUNT 1000"), "1) 0\n2) (empty list)")
+
+        reply = self.db.execute("SCAN 0 COUNT 10").split("\n")
+        self.assertNotEqual(reply[0], "1) 0")
+        self.assertEqual(len(reply), 11)
+        self.assertTrue(reply[2].startswith("   2) "))
+
+        self.assertEqual(self.db.execute("SCAN 12345"), "ERROR: Invalid cursor")
+        self.assertEqual(self.db.execute("SCAN x"), "ERROR: Invalid cursor")
+        self.assertEqual(self.db.execute("SCAN 0 COUNT 0"), "ERROR: COUNT must be positive")
+        self.assertEqual(self.db.execute("SCAN 0 MATCH"), "ERROR: Invalid option 'MATCH'")
+
+    def test_zscan(self):
+        """Test iterating a sorted set"""
+        for i in range(30):
+            self.db.execute(f"ZADD board {i} player:{i}")
+
+        members = {}
+        cursor = 0
+        while True:
+            reply = self.db.execute(f"ZSCAN board {cursor} COUNT 8").split("\n")
+            cursor = int(reply[0][3:])
+            items = [line.rsplit(") ", 1)[1] for line in reply[1:]]
+            members.update(zip(items[0::2], items[1::2]))
+            if cursor == 0:
+                break
+
+        self.assertEqual(members, {f"player:{i}": str(i) for i in range(30)})
+        self.assertEqual(self.db.execute("ZSCAN board 0 MATCH player:2? COUNT 100").count("player:"), 10)
+        self.assertEqual(self.db.execute("ZSCAN missing 0"), "1) 0\n2) (empty list)")
+        self.assertTrue(self.db.execute("ZSCAN key:1 0").startswith("ERROR: WRONGTYPE"))
+
+    def test_cursor_bound_to_source(self):
+        """Test that a cursor is rejected for another source and restarts once its index is dropped"""
+        cursors = ScanCursors(max_indexes=1)
+        first, other = list(range(10)), list(range(10))
+
+        cursor, batch = cursors.scan(first, 0, 4, lambda: first)
+        self.assertEqual(batch, [0, 1, 2, 3])
+        with self.assertRaises(ValueError):
+            cursors.scan(other, cursor, 4, lambda: other)
+        with self.assertRaises(ValueError):
+            cursors.scan(first, 1 << 40, 4, lambda: first)
+
+        cursors.scan(other, 0, 4, lambda: other)
+        self.assertEqual(cursors.scan(first, cursor, 4, lambda: first)[1], [0, 1, 2, 3])
+
+    def test_concurrent_collection_scans(self):
+        """Test that more iterations than indexed collections all finish, across changes"""
+        for i in range(30):
+            self.db.execute(f"SADD tags member:{i}")
+        for i in range(3):
+            self.db.execute(f"HSET other:{i} " + " ".join(f"f{j} v" for j in range(20)))
+
+        def sscan(cursor):
+            reply = self.db.execute(f"SSCAN tags {cursor} COUNT 5").split("\n")
+            return int(reply[0][3:]), [line.rsplit(") ", 1)[1] for line in reply[1:] if "member:" in line]
+
+        iterations = [sscan(0) for _ in range(100)]
+        self.db.execute("SREM tags member:29")
+        self.db.execute("SADD tags member:30")
+        for i in range(3):
+            self.db.execute(f"HSCAN other:{i} 0 COUNT 5")
+
+        for cursor, members in iterations:
+            while cursor != 0:
+                cursor, batch = sscan(cursor)
+                members.extend(batch)
+            self.assertEqual(len(members), len(set(members)))
+            self.assertTrue({f"member:{i}" for i in range(29)} <= set(members))
+            self.assertNotIn("member:29", members[5:])
+
+        self.assertEqual(len(self.db.scan_cursors.indexes), 4)
+
+    def test_keys(self):
+        """Test KEYS with a compiled pattern and expired keys"""
+        self.db.expire("key:5", -1)
+
+        self.assertEqual(sorted(self.db.keys("key:?")), sorted(f"key:{i}" for i in range(10) if i != 5))
+        self.assertEqual(self.db.execute("KEYS key:42"), "1) key:42")
+
+
+if __name__ == "__main__":
+    unittest.main()
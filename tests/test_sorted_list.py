@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from pycachedb.data_structures.sorted_list import SortedList
+
+class TestSortedList(unittest.TestCase):
+    """Test cases for the SortedList class"""
+
+    def setUp(self):
+        """Set up a SortedList with small chunks so splits and merges happen"""
+        self.index = SortedList(load=4)
+
+    def test_initialization(self):
+        """Test that a SortedList is properly initialized"""
+        self.assertEqual(self.index.size, 0)
+        self.assertEqual(list(self.index), [])
+        self.assertIsNone(self.index.min())
+
+    def test_insert_search_update(self):
+        """Test insert, lookup and overwrite"""
+        self.index.insert("b", 2)
+        self.index.insert("a", 1)
+        self.index.insert("b", 3)
+
+        self.assertEqual(self.index.size, 2)
+        self.assertEqual(self.index.search("a"), 1)
+        self.assertEqual(self.index.search("b"), 3)
+        self.assertIsNone(self.index.search("c"))
+
+    def test_random_operations(self):
+        """Test a random mix of inserts and deletes against a dict"""
+        rng = random.Random(11)
+        expected = {}
+
+        for _ in range(5000):
+            key = rng.randrange(400)
+            if rng.random() < 0.6:
+                self.index.insert(key, -key)
+                expected[key] = -key
+            else:
+                self.assertEqual(self.index.delete(key), key in expected)
+                expected.pop(key, None)
+
+        self.assertEqual(self.index.size, len(expected))
+        self.assertEqual(list(self.index), sorted(expected))
+        for chunk in self.index._keys:
+            self.assertLessEqual(len(chunk), 8)
+        for key in range(400):
+            self.assertEqual(self.index.search(key), expected.get(key))
+
+    def test_range_and_bulk_range(self):
+        """Test inclusive range scans and their bulk equivalent"""
+        for key in range(0, 100, 2):
+            self.index.insert(key, str(key))
+
+        for lo, hi in [(11, 20), (None, 4), (95, None), (50, 40), (200, 300), (-5, -1), (10, 10), (11, 11)]:
+            expected = [k for k in range(0, 100, 2) if (lo is None or k >= lo) and (hi is None or k <= hi)]
+            self.assertEqual([k for k, _ in self.index.range(lo, hi)], expected)
+            self.assertEqual([k for k, _ in self.index.range(lo, hi, reverse=True)], expected[::-1])
+            keys, values = self.index.bulk_range(lo, hi)
+            self.assertEqual(keys, expected)
+            self.assertEqual(values, [str(k) for k in expected])
+
+    def test_nearest_and_order_statistics(self):
+        """Test floor, ceiling, rank and select"""
+        keys = list(range(0, 60, 3))
+        for key in keys:
+            self.index.insert(key, key)
+
+        self.assertEqual(self.index.floor(10), (9, 9))
+        self.assertEqual(self.index.floor(9), (9, 9))
+        self.assertIsNone(self.index.floor(-1))
+        self.assertEqual(self.index.ceiling(10), (12, 12))
+        self.assertIsNone(self.index.ceiling(58))
+        self.assertEqual(self.index.max(), (57, 57))
+
+        for index, key in enumerate(keys):
+            self.assertEqual(self.index.rank(key), index)
+            self.assertEqual(self.index.select(index), (key, key))
+
+        self.index.delete(0)
+        self.assertEqual(self.index.rank(3), 0)
+        self.assertEqual(self.index.select(-1), (57, 57))
+        with self.assertRaises(IndexError):
+            self.index.select(len(keys))
+
+    def test_from_sorted_and_merge(self):
+        """Test bulk loading and linear merging"""
+        index = SortedList.from_sorted(((i, i) for i in range(0, 50, 2)), load=4)
+        self.assertEqual(index.size, 25)
+        self.assertEqual(index.select(10), (20, 20))
+        self.assertEqual([len(chunk) for chunk in index._keys][:3], [4, 4, 4])
+
+        other = SortedList.from_sorted((i, -i) for i in range(0, 50, 5))
+        index.merge(other)
+
+        expected = {i: i for i in range(0, 50, 2)}
+        expected.update({i: -i for i in range(0, 50, 5)})
+        self.assertEqual(list(index.items()), sorted(expected.items()))
+        index.insert(1, 1)
+        self.assertEqual(index.rank(2), 2)
+
+    def test_clear(self):
+        """Test clearing the list"""
+        self.index.insert(1, "one")
+        self.index.clear()
+
+        self.assertEqual(self.index.size, 0)
+        self.assertNotIn(1, self.index)
+
+
+if __name__ == "__main__":
+    unittest.main()
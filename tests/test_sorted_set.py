@@ -0,0 +1,114 @@
+import random
+import unittest
+
+from pycachedb.data_structures.skip_list import SkipList
+from pycachedb.data_structures.sorted_set import SortedSet
+
+class TestSkipList(unittest.TestCase):
+    """Test cases for the SkipList class"""
+
+    def setUp(self):
+        """Set up a new SkipList for each test"""
+        random.seed(5)
+        self.skip_list = SkipList()
+
+    def assert_spans(self):
+        """Checks that every link's span matches the number of elements it skips"""
+        positions = {}
+        node = self.skip_list.head.forward[0]
+        position = 1
+        while node is not None:
+            positions[id(node)] = position
+            node = node.forward[0]
+            position += 1
+
+        node = self.skip_list.head
+        while node is not None:
+            start = positions.get(id(node), 0)
+            for level in range(len(node.forward) if node is not self.skip_list.head else self.skip_list.level):
+                forward = node.forward[level]
+                end = positions[id(forward)] if forward is not None else position
+                if forward is not None:
+                    self.assertEqual(node.span[level], end - start)
+            node = node.forward[0]
+
+    def test_insert_rank_and_delete(self):
+        """Test ordering by score then member with random inserts and deletes"""
+        entries = [(random.randrange(50), f"m{i}") for i in range(300)]
+        for score, member in entries:
+            self.skip_list.insert(score, member)
+        for score, member in entries[::3]:
+            self.assertTrue(self.skip_list.delete(score, member))
+        self.assertFalse(self.skip_list.delete(1000, "missing"))
+
+        expected = sorted(set(entries) - set(entries[::3]))
+        self.assertEqual(len(self.skip_list), len(expected))
+        self.assert_spans()
+
+        nodes = list(self.skip_list.iterate_from(self.skip_list.head.forward[0]))
+        self.assertEqual([(node.score, node.member) for node in nodes], expected)
+        for rank, (score, member) in enumerate(expected):
+            self.assertEqual(self.skip_list.get_rank(score, member), rank)
+            self.assertEqual(self.skip_list.get_by_rank(rank).member, member)
+        self.assertIsNone(self.skip_list.get_by_rank(len(expected)))
+
+        backwards = list(self.skip_list.iterate_from(self.skip_list.tail, reverse=True))
+        self.assertEqual([node.member for node in backwards], [member for _, member in reversed(expected)])
+
+
+class TestSortedSet(unittest.TestCase):
+    """Test cases for the SortedSet class"""
+
+    def setUp(self):
+        """Set up a small leaderboard for each test"""
+        self.zset = SortedSet()
+        for member, score in [("alice", 30), ("bob", 10), ("carol", 20), ("dave", 20), ("erin", 50)]:
+            self.zset.add(member, score)
+
+    def test_add_update_remove(self):
+        """Test adding, rescoring and removing members"""
+        self.assertFalse(self.zset.add("bob", 60))
+        self.assertTrue(self.zset.add("frank", 1))
+        self.assertEqual(self.zset.score("bob"), 60)
+        self.assertEqual(self.zset.increment("frank", 2.5), 3.5)
+        self.assertTrue(self.zset.remove("alice"))
+        self.assertFalse(self.zset.remove("alice"))
+
+        self.assertEqual(len(self.zset), 5)
+        self.assertNotIn("alice", self.zset)
+        self.assertEqual(self.zset.range(0, -1)[0], ("frank", 3.5))
+
+    def test_rank(self):
+        """Test ranks in both directions"""
+        self.assertEqual(self.zset.rank("bob"), 0)
+        self.assertEqual(self.zset.rank("dave"), 2)
+        self.assertEqual(self.zset.rank("erin", reverse=True), 0)
+        self.assertIsNone(self.zset.rank("nobody"))
+
+    def test_range(self):
+        """Test ranges by rank with negative indexes"""
+        self.assertEqual([m for m, _ in self.zset.range(0, -1)], ["bob", "carol", "dave", "alice", "erin"])
+        self.assertEqual([m for m, _ in self.zset.range(1, 2)], ["carol", "dave"])
+        self.assertEqual([m for m, _ in self.zset.range(-2, 100)], ["alice", "erin"])
+        self.assertEqual([m for m, _ in self.zset.range(0, 1, reverse=True)], ["erin", "alice"])
+        self.assertEqual(self.zset.range(3, 1), [])
+
+    def test_range_by_score(self):
+        """Test score ranges with exclusive bounds and limits"""
+        self.assertEqual([m for m, _ in self.zset.range_by_score(20, 30)], ["carol", "dave", "alice"])
+        self.assertEqual([m for m, _ in self.zset.range_by_score(20, 30, min_exclusive=True)], ["alice"])
+        self.assertEqual([m for m, _ in self.zset.range_by_score(float("-inf"), 20, max_exclusive=True)], ["bob"])
+        self.assertEqual([m for m, _ in self.zset.range_by_score(0, 100, offset=1, count=2)], ["carol", "dave"])
+        self.assertEqual([m for m, _ in self.zset.range_by_score(15, 35, reverse=True)], ["alice", "dave", "carol"])
+        self.assertEqual(self.zset.range_by_score(31, 49), [])
+
+    def test_count(self):
+        """Test counting members in a score range"""
+        self.assertEqual(self.zset.count(20, 30), 3)
+        self.assertEqual(self.zset.count(float("-inf"), float("inf")), 5)
+        self.assertEqual(self.zset.count(20, 20, min_exclusive=True), 0)
+        self.assertEqual(self.zset.count(100, 200), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
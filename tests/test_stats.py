@@ -0,0 +1,97 @@
+import unittest
+
+from pycachedb import PyCacheDB
+from pycachedb.query.stats import CommandStat, SlowLog, _bucket, _bucket_upper_bound
+
+class TestCommandStats(unittest.TestCase):
+    """Test cases for command statistics and the slow log"""
+
+    def setUp(self):
+        """Set up a database that times every command and logs all of them"""
+        self.db = PyCacheDB(stats_enabled=True, slowlog_threshold=0, slowlog_max_len=3)
+
+    def test_histogram_buckets(self):
+        """Test that every latency falls into a bucket whose bound is at most 1/8 above it"""
+        previous = -1
+        for usec in range(0, 100000, 7):
+            bucket = _bucket(usec)
+            bound = _bucket_upper_bound(bucket)
+            self.assertGreaterEqual(bucket, previous)
+            self.assertGreaterEqual(bound, usec)
+            self.assertLessEqual(bound, usec + max(usec // 8, 1))
+            previous = bucket
+
+    def test_percentiles(self):
+        """Test percentiles estimated from the histogram"""
+        stat = CommandStat()
+        for usec in range(1, 101):
+            stat.record(usec)
+        stat.record(5000)
+
+        self.assertEqual(stat.calls, 101)
+        self.assertEqual(stat.usec, 5050 + 5000)
+        self.assertIn(stat.percentile(50), range(50, 57))
+        self.assertIn(stat.percentile(99.9), range(5000, 5120))
+        self.assertEqual(CommandStat().percentile(99), 0)
+
+    def test_commandstats(self):
+        """Test that executed, batched and prepared commands are all counted"""
+        self.db.execute("SET a 1")
+        self.db.execute_many(["GET a", "GET a", "GET b"])
+        self.db.prepare("GET ?").run("a")
+
+        info = self.db.info("commandstats")
+        self.assertTrue(info["cmdstat_set"].startswith("calls=1,usec="))
+        self.assertTrue(info["cmdstat_get"].startswith("calls=4,usec="))
+        self.assertIn("p99.9=", info["cmdstat_get"])
+        self.assertIn("cmdstat_get: calls=4", self.db.execute("INFO commandstats"))
+
+    def test_stats_switch(self):
+        """Test that nothing is recorded while stats are disabled"""
+        self.db.set_stats_enabled(False)
+        self.db.execute("SET a 1")
+        self.db.execute_many(["GET a"])
+        self.assertEqual(self.db.info("commandstats"), {})
+
+        self.db.set_stats_enabled(True)
+        self.db.execute("GET a")
+        self.assertEqual(list(self.db.info("commandstats")), ["cmdstat_get"])
+
+    def test_slowlog_command(self):
+        """Test SLOWLOG GET, LEN and RESET"""
+        for i in range(5):
+            self.db.execute(f"SET key:{i} {i}")
+
+        # The log keeps the newest three entries, SLOWLOG LEN itself is logged after it runs
+        self.assertEqual(self.db.execute("SLOWLOG LEN"), "3")
+        entries = self.db.execute("SLOWLOG GET 2").split("\n")
+        self.assertEqual(len(entries), 2)
+        self.assertTrue(entries[0].startswith("1) id=5 "))
+        self.assertTrue(entries[0].endswith("command=SLOWLOG LEN"))
+        self.assertTrue(entries[1].endswith("command=SET key:4 4"))
+
+        self.assertEqual(self.db.execute("SLOWLOG RESET"), "OK")
+        reply = self.db.execute("SLOWLOG GET")
+        self.assertTrue(reply.startswith("1) id=7 "))
+        self.assertTrue(reply.endswith("command=SLOWLOG RESET"))
+        self.assertTrue(self.db.execute("SLOWLOG NOPE").startswith("ERROR"))
+
+    def test_slowlog_threshold_and_truncation(self):
+        """Test the threshold and the truncation of long arguments"""
+        slowlog = SlowLog(threshold=100, max_len=10)
+        slowlog.add("GET", ["fast"], 99)
+        self.assertEqual(len(slowlog), 0)
+
+        slowlog.add("MSET", ["x" * 200] + ["v"] * 40, 100)
+        entry = slowlog.get(1)[0]
+        self.assertEqual(entry.args[0], "x" * 128 + "... (72 more characters)")
+        self.assertEqual(len(entry.args), 33)
+        self.assertEqual(entry.args[-1], "... (9 more arguments)")
+
+        disabled = SlowLog(threshold=-1)
+        disabled.add("GET", [], 10 ** 9)
+        self.assertEqual(len(disabled), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
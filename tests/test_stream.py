@@ -0,0 +1,84 @@
+import unittest
+
+from pycachedb.data_structures.stream import Stream, format_id, next_id, parse_id
+
+def make_stream(count, chunk_size=4):
+    """Builds a stream with entries 1-0 to count-0, every fifth one with other fields"""
+    stream = Stream(chunk_size)
+    for i in range(1, count + 1):
+        pairs = ["user", str(i), "page", "home"] if i % 5 else ["error", str(i)]
+        stream.add((i, 0), pairs)
+    return stream
+
+
+class TestStream(unittest.TestCase):
+    """Test cases for the Stream class"""
+
+    def test_ids(self):
+        """Test parsing, formatting and incrementing IDs"""
+        self.assertEqual(parse_id("5-3"), (5, 3))
+        self.assertEqual(parse_id("5"), (5, 0))
+        self.assertEqual(parse_id("5", 9), (5, 9))
+        self.assertEqual(format_id((5, 3)), "5-3")
+        self.assertEqual(next_id((5, 3)), (5, 4))
+        self.assertEqual(next_id((5, (1 << 64) - 1)), (6, 0))
+
+        for text in ("", "-1", "a-1", "1-", "1-2-3", str(1 << 64)):
+            self.assertIsNone(parse_id(text), text)
+
+    def test_add_and_range(self):
+        """Test entries are chunked, keep their fields and come back by ID range"""
+        stream = make_stream(20)
+
+        self.assertEqual(len(stream), 20)
+        self.assertEqual(len(stream.index), 5)
+        self.assertEqual(stream.range((3, 0), (3, 0)), [((3, 0), ["user", "3", "page", "home"])])
+        self.assertEqual(stream.range((5, 0), (5, 0)), [((5, 0), ["error", "5"])])
+
+        ids = [entry_id for entry_id, _ in stream.range((6, 1), (14, 0))]
+        self.assertEqual(ids, [(i, 0) for i in range(7, 15)])
+        self.assertEqual(len(stream.range()), 20)
+        self.assertEqual([entry_id for entry_id, _ in stream.range(count=2)], [(1, 0), (2, 0)])
+        self.assertEqual(stream.range((21, 0)), [])
+        self.assertEqual(stream.range(count=0), [])
+
+        # Entries with the shared fields only store their values
+        chunk = stream.index.min()[1]
+        self.assertEqual(chunk.entries[0], ("1", "home"))
+
+    def test_ids_must_increase(self):
+        """Test IDs are refused unless greater than the last one, even after trimming"""
+        stream = make_stream(3)
+
+        with self.assertRaises(ValueError):
+            stream.add((3, 0), ["a", "b"])
+
+        self.assertEqual(stream.next_id(3), (3, 1))
+        self.assertIsNone(stream.next_id(2))
+        self.assertGreater(stream.next_id(), (3, 0))
+
+        stream.trim(0)
+        self.assertEqual(len(stream), 0)
+        with self.assertRaises(ValueError):
+            stream.add((2, 0), ["a", "b"])
+        stream.add((4, 0), ["a", "b"])
+        self.assertEqual(stream.range(), [((4, 0), ["a", "b"])])
+
+    def test_trim(self):
+        """Test approximate trimming drops whole chunks and exact trimming cuts into the oldest"""
+        stream = make_stream(20)
+        before = stream.memory_usage()
+
+        self.assertEqual(stream.trim(10, approximate=True), 8)
+        self.assertEqual(len(stream), 12)
+        self.assertEqual(len(stream.index), 3)
+        self.assertLess(stream.memory_usage(), before)
+
+        self.assertEqual(stream.trim(10), 2)
+        self.assertEqual(len(stream), 10)
+        self.assertEqual([entry_id for entry_id, _ in stream.range()], [(i, 0) for i in range(11, 21)])
+        self.assertEqual(stream.range((1, 0), (11, 0)), [((11, 0), ["user", "11", "page", "home"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from pycachedb.data_structures.timing_wheel import TimingWheel, LEVELS, SLOT_BITS
+
+class TestTimingWheel(unittest.TestCase):
+    """Test cases for the TimingWheel class"""
+
+    def setUp(self):
+        """Set up a wheel with one second ticks starting at zero"""
+        self.wheel = TimingWheel(resolution=1, start=0)
+
+    def test_schedule_and_cancel(self):
+        """Test scheduling, rescheduling and cancelling keys"""
+        self.wheel.schedule("a", 5)
+        self.wheel.schedule("b", 10)
+        self.wheel.schedule("a", 20)
+
+        self.assertEqual(len(self.wheel), 2)
+        self.assertEqual(self.wheel.get("a"), 20)
+        self.assertIn("b", self.wheel)
+
+        self.assertTrue(self.wheel.cancel("b"))
+        self.assertFalse(self.wheel.cancel("b"))
+        self.assertEqual(self.wheel.advance(19), [])
+        self.assertEqual(self.wheel.advance(20), ["a"])
+        self.assertEqual(len(self.wheel), 0)
+        self.assertEqual(sum(self.wheel.level_sizes), 0)
+
+    def test_keys_fire_at_their_deadline(self):
+        """Test that keys spread over every level fire on time and not before"""
+        horizon = 1 << (SLOT_BITS * LEVELS + 2)
+        deadlines = {i: random.randrange(1, horizon) for i in range(2000)}
+        deadlines["fraction"] = 2.5
+        for key, deadline in deadlines.items():
+            self.wheel.schedule(key, deadline)
+
+        now = 0
+        while self.wheel:
+            now += random.randrange(1, horizon // 500)
+            for key in self.wheel.advance(now):
+                # A key fires on the first advance that reaches its deadline
+                self.assertLessEqual(deadlines.pop(key), now)
+            self.assertTrue(all(deadline > now for deadline in deadlines.values()))
+
+        self.assertEqual(deadlines, {})
+
+    def test_level_boundaries(self):
+        """Test that deadlines exactly on a level boundary fire on their tick, not the next one"""
+        for boundary in (1 << SLOT_BITS, 1 << (SLOT_BITS * 2), 3 << SLOT_BITS):
+            wheel = TimingWheel(resolution=1.0, start=0)
+            wheel.schedule("k", float(boundary))
+
+            self.assertEqual(wheel.advance(boundary - 1), [])
+            self.assertEqual(wheel.advance(boundary), ["k"])
+            self.assertEqual(sum(wheel.level_sizes), 0)
+
+    def test_overdue_and_clear(self):
+        """Test that a deadline in the past fires on the next advance and clear"""
+        self.wheel.advance(100)
+        self.wheel.schedule("late", 50)
+        self.wheel.schedule("later", 500)
+
+        self.assertEqual(self.wheel.advance(101), ["late"])
+
+        self.wheel.clear()
+        self.assertEqual(self.wheel.advance(1000), [])
+        self.assertEqual(self.wheel.level_sizes, [0] * LEVELS)
+
+
+if __name__ == "__main__":
+    unittest.main()